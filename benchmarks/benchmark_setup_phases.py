@@ -0,0 +1,319 @@
+"""
+Per-phase timing and memory of Problem.setup for models of growing size.
+
+Run as a script to profile the wide, deep and multipoint model generators
+over a range of sizes and write the results as JSON, e.g.::
+
+    python benchmark_setup_phases.py --sizes 100 1000 10000 --out setup.json
+    python benchmark_setup_phases.py --sizes 100 1000 --compare setup.json
+
+The BM class below runs small sizes as part of the regular benchmarks.
+"""
+from __future__ import print_function
+
+import sys
+import json
+import time
+import argparse
+import platform
+import unittest
+from functools import wraps
+from collections import OrderedDict
+
+from six import iteritems
+from six.moves import cStringIO, range
+
+import numpy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import openmdao
+from openmdao.api import Problem, Group, IndepVarComp
+from openmdao.core.relevance import Relevance
+from openmdao.devtools.debug import num_systems, max_mem_usage
+from openmdao.test.build4test import create_dyncomps, make_subtree
+
+# Phases of Problem.setup that get timed, as (name, class, method).
+# _setup_data_transfer is called from within _setup_vectors, so its time
+# is also included in the _setup_vectors time.
+PHASES = [
+    ('_setup_variables', Group, '_setup_variables'),
+    ('_setup_connections', Problem, '_setup_connections'),
+    ('Relevance', Relevance, '__init__'),
+    ('_setup_vectors', Group, '_setup_vectors'),
+    ('_setup_data_transfer', Group, '_setup_data_transfer'),
+    ('check_setup', Problem, 'check_setup'),
+]
+
+# Variables per component used by all of the model generators.
+NPARAMS = 10
+NOUTPUTS = 10
+NCONNS = 5
+
+# Components per leaf group in the deep and multipoint models.
+LEAF_COMPS = 10
+
+
+def build_wide(ncomps):
+    """ A single group containing a chain of ncomps components."""
+    prob = Problem(root=Group())
+    create_dyncomps(prob.root, ncomps, NPARAMS, NOUTPUTS, NCONNS)
+    return prob
+
+
+def build_deep(ncomps):
+    """ A binary tree of groups with LEAF_COMPS components in each leaf,
+    deep enough to hold at least ncomps components."""
+    levels = 1
+    while LEAF_COMPS * 2**(levels-1) < ncomps:
+        levels += 1
+
+    prob = Problem(root=Group())
+    make_subtree(prob.root, nsubgroups=2, levels=levels, ncomps=LEAF_COMPS,
+                 nparams=NPARAMS, noutputs=NOUTPUTS, nconns=NCONNS)
+    return prob
+
+
+def build_multipoint(ncomps):
+    """ ncomps/LEAF_COMPS point groups, each a chain of LEAF_COMPS
+    components, all fed from one IndepVarComp."""
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('P', IndepVarComp('x', 1.0))
+
+    for i in range(max(1, ncomps // LEAF_COMPS)):
+        name = 'pt%d' % i
+        create_dyncomps(root.add(name, Group()), LEAF_COMPS, NPARAMS,
+                        NOUTPUTS, NCONNS)
+        root.connect('P.x', '%s.C0.p0' % name)
+
+    return prob
+
+
+MODELS = OrderedDict([
+    ('wide', build_wide),
+    ('deep', build_deep),
+    ('multipoint', build_multipoint),
+])
+
+
+class PhaseTimer(object):
+    """ Wraps the methods in PHASES to accumulate their time, number of
+    calls and, if trace_mem is True, the peak memory allocated while they
+    run. Recursive and nested calls are only timed at the outermost level,
+    and memory is only traced for phases that aren't nested in another.
+
+    Use as a context manager around Problem.setup.
+    """
+
+    def __init__(self, trace_mem=False):
+        self.trace_mem = trace_mem and tracemalloc is not None
+        self.phases = OrderedDict()
+        self._saved = []
+        self._depth = {}
+        self._active = 0
+
+    def __enter__(self):
+        for name, cls, meth in PHASES:
+            self.phases[name] = OrderedDict([('time', 0.0), ('calls', 0),
+                                             ('peak_mb', None)])
+            self._depth[name] = 0
+            orig = cls.__dict__[meth]
+            self._saved.append((cls, meth, orig))
+            setattr(cls, meth, self._wrap(name, orig))
+        return self
+
+    def __exit__(self, *args):
+        for cls, meth, orig in self._saved:
+            setattr(cls, meth, orig)
+        self._saved = []
+
+    def _wrap(self, name, func):
+        timer = self
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if timer._depth[name] > 0:
+                return func(*args, **kwargs)
+
+            trace = timer.trace_mem and timer._active == 0
+            if trace:
+                tracemalloc.start()
+
+            timer._depth[name] += 1
+            timer._active += 1
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                data = timer.phases[name]
+                data['time'] += time.time() - start
+                data['calls'] += 1
+                timer._depth[name] -= 1
+                timer._active -= 1
+
+                if trace:
+                    peak = tracemalloc.get_traced_memory()[1] / 1024. / 1024.
+                    tracemalloc.stop()
+                    data['peak_mb'] = max(peak, data['peak_mb'] or 0.0)
+
+        return wrapper
+
+
+def profile_setup(model, ncomps, check=True, trace_mem=False):
+    """
+    Builds a model and profiles its setup.
+
+    Args
+    ----
+    model : str
+        Name of the model generator in MODELS.
+
+    ncomps : int
+        Approximate number of components in the model.
+
+    check : bool(True)
+        If True, check_setup is run and timed.
+
+    trace_mem : bool(False)
+        If True, the peak memory allocated in each phase is traced. This
+        slows setup down considerably.
+
+    Returns
+    -------
+    dict
+        Results for this model and size.
+    """
+    prob = MODELS[model](ncomps)
+
+    with PhaseTimer(trace_mem=trace_mem) as timer:
+        start = time.time()
+        prob.setup(check=check, out_stream=cStringIO())
+        total = time.time() - start
+
+    root = prob.root
+    return OrderedDict([
+        ('model', model),
+        ('ncomps', ncomps),
+        ('nsystems', num_systems(root)),
+        ('nvars', len(root._params_dict) + len(root._unknowns_dict)),
+        ('nconns', len(prob._probdata.connections)),
+        ('total', total),
+        ('max_rss_mb', max_mem_usage()),
+        ('phases', timer.phases),
+    ])
+
+
+def run(models, sizes, check=True, trace_mem=False, out_stream=sys.stdout):
+    """ Profiles every model at every size and returns the JSON-ready
+    report."""
+    results = []
+    for model in models:
+        for ncomps in sizes:
+            res = profile_setup(model, ncomps, check=check, trace_mem=trace_mem)
+            results.append(res)
+            if out_stream is not None:
+                print("%-10s %7d comps: %8.3f s" % (model, ncomps, res['total']),
+                      file=out_stream)
+
+    return OrderedDict([
+        ('openmdao', openmdao.__version__),
+        ('python', platform.python_version()),
+        ('numpy', numpy.__version__),
+        ('platform', platform.platform()),
+        ('date', time.strftime('%Y-%m-%dT%H:%M:%S')),
+        ('results', results),
+    ])
+
+
+def compare(report, baseline, tol=0.2, out_stream=sys.stdout):
+    """
+    Compares the phase times of two reports.
+
+    Args
+    ----
+    report : dict
+        The new report.
+
+    baseline : dict
+        The report to compare against.
+
+    tol : float(0.2)
+        Relative slowdown above which a phase is flagged.
+
+    Returns
+    -------
+    list
+        (model, ncomps, phase, old time, new time) for every flagged phase.
+    """
+    old = dict(((r['model'], r['ncomps']), r) for r in baseline['results'])
+    slower = []
+    for res in report['results']:
+        key = (res['model'], res['ncomps'])
+        if key not in old:
+            continue
+        times = [('total', old[key]['total'], res['total'])]
+        for name, data in iteritems(res['phases']):
+            if name in old[key]['phases']:
+                times.append((name, old[key]['phases'][name]['time'],
+                              data['time']))
+
+        for name, t_old, t_new in times:
+            ratio = t_new / t_old if t_old > 0.0 else 1.0
+            if out_stream is not None:
+                print("%-10s %7d %-22s %9.4f -> %9.4f (x%.2f)" %
+                      (key + (name, t_old, t_new, ratio)), file=out_stream)
+            if ratio > 1.0 + tol:
+                slower.append(key + (name, t_old, t_new))
+
+    return slower
+
+
+class BM(unittest.TestCase):
+    """Per-phase profiling of setup for wide, deep and multipoint models"""
+
+    def benchmark_wide_1K(self):
+        profile_setup('wide', 1000)
+
+    def benchmark_deep_1K(self):
+        profile_setup('deep', 1000)
+
+    def benchmark_multipoint_1K(self):
+        profile_setup('multipoint', 1000)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--models', nargs='+', choices=list(MODELS),
+                        default=list(MODELS))
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=[100, 1000, 10000],
+                        help='Number of components, e.g. 100 up to 100000.')
+    parser.add_argument('--no-check', action='store_true',
+                        help="Don't run check_setup.")
+    parser.add_argument('--mem', action='store_true',
+                        help='Trace the peak memory of each phase (slow).')
+    parser.add_argument('--out', help='File to write the JSON report to.')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON report to compare phase times against.')
+    parser.add_argument('--tol', type=float, default=0.2,
+                        help='Relative slowdown that counts as a regression.')
+    options = parser.parse_args()
+
+    report = run(options.models, options.sizes, check=not options.no_check,
+                 trace_mem=options.mem)
+
+    if options.out:
+        with open(options.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not options.compare:
+        print(json.dumps(report, indent=2))
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, tol=options.tol):
+            sys.exit(1)
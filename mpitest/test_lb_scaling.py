@@ -0,0 +1,87 @@
+""" Scaling benchmark for the load balancing modes of concurrent_eval_lb.
+
+Run under mpirun to time the modes on real MPI processes, e.g.,
+
+    mpirun -n 8 python test_lb_scaling.py
+
+Without MPI, each rank is run in a thread using a local stand-in for the
+MPI communicator. The cases only sleep, so the threads run concurrently and
+the timings show the cost of the scheduling itself.
+"""
+
+from __future__ import print_function
+
+import time
+import unittest
+
+from openmdao.test.mpi_util import MPITestCase
+from openmdao.test.local_comm import run_ranks
+from openmdao.util.concurrent import concurrent_eval_lb
+
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+# (label, kwargs for concurrent_eval_lb)
+MODES = [
+    ('flat', {}),
+    ('prefetch 2', {'prefetch': 2}),
+    ('master runs', {'master_runs': True, 'prefetch': 2}),
+    ('groups of 3', {'group_size': 3, 'prefetch': 2}),
+    ('groups of 3, masters run', {'group_size': 3, 'master_runs': True,
+                                  'prefetch': 2}),
+    ('chunked, groups of 3', {'group_size': 3, 'chunk_size': 0,
+                              'prefetch': 2}),
+]
+
+CASE_TIME = 0.005
+
+
+def funct(job):
+    time.sleep(CASE_TIME)
+    return job
+
+
+def _time_mode(comm, cases, kwargs):
+    start = time.time()
+    results = concurrent_eval_lb(funct, cases, comm, **kwargs)
+    return time.time() - start, results
+
+
+class LBScalingTestCase(MPITestCase):
+
+    N_PROCS = 7
+
+    def _run_mode(self, cases, kwargs):
+        if MPI:
+            self.comm.barrier()
+            return _time_mode(self.comm, cases, kwargs)
+        return run_ranks(_time_mode, self.N_PROCS, cases, kwargs)[0]
+
+    def test_scaling(self):
+        ncases = 200
+        cases = [([i], None) for i in range(ncases)]
+
+        # time it would take with every rank running cases all of the time
+        ideal = ncases * CASE_TIME / self.N_PROCS
+
+        report = []
+        for label, kwargs in MODES:
+            elapsed, results = self._run_mode(cases, kwargs)
+
+            if MPI is None or self.comm.rank == 0:
+                self.assertEqual(sorted(r[0] for r in results),
+                                 list(range(ncases)))
+                report.append("%-26s %8.3f s  %6.1f%% of ideal" %
+                              (label, elapsed, 100. * ideal / elapsed))
+
+        if report:
+            print("\n%d cases of %g s on %d ranks" % (ncases, CASE_TIME,
+                                                      self.N_PROCS))
+            print("\n".join(report))
+
+
+if __name__ == '__main__':
+    from openmdao.test.mpi_util import mpirun_tests
+    mpirun_tests()
@@ -395,6 +395,47 @@ class LBParallelDOETestCase6(MPITestCase):
         else:
             self.assertEqual(num_cases, num_levels)
 
+class LBMasterRunsDOETestCase(MPITestCase):
+
+    N_PROCS = 4
+
+    def test_load_balanced_doe_master_runs(self):
+
+        problem = Problem(impl=impl)
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=1.0))
+        root.add('const', IndepVarComp('c', val=2.0))
+        root.add('mult', ExecComp4Test("y=c*x"))
+
+        root.connect('indep_var.x', 'mult.x')
+        root.connect('const.c', 'mult.c')
+
+        # each case runs on 2 procs, and the master's doe runs cases too
+        num_levels = 25
+        problem.driver = FullFactorialDriver(num_levels=num_levels,
+                                       num_par_doe=self.N_PROCS//2,
+                                       load_balance=True)
+        problem.driver.options['auto_add_response'] = True
+        problem.driver.options['master_runs'] = True
+        problem.driver.add_desvar('indep_var.x',
+                                  lower=1.0, upper=float(num_levels))
+        problem.driver.add_objective('mult.y')
+
+        problem.setup(check=False)
+        problem.run()
+
+        xs = []
+        for responses, success, msg in problem.driver.get_responses():
+            responses = dict(responses)
+            xs.append(responses['indep_var.x'])
+            self.assertEqual(responses['indep_var.x']*2.0,
+                             responses['mult.y'])
+
+        if MPI:
+            xs = sum(problem.comm.allgather(xs), [])
+
+        self.assertEqual(sorted(xs), [float(i) for i in range(1, num_levels+1)])
+
 if __name__ == '__main__':
     from openmdao.test.mpi_util import mpirun_tests
     mpirun_tests()
@@ -25,6 +25,7 @@ except ImportError:
     pass
 from openmdao.core.relevance import Relevance
 from openmdao.core.fileref import FileRef
+from openmdao.core.eval_cache import EvalCache
 
 #drivers
 from openmdao.drivers.scipy_optimizer import ScipyOptimizer
@@ -47,6 +47,15 @@ class MetaModel(Component):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['coloring'] : bool(False)
+        Set to True to finite difference structurally orthogonal columns
+        together. The sparsity comes from declare_partials when available,
+        and is otherwise probed by the first full finite difference.
+    deriv_options['num_fd_procs'] : int(1)
+        Number of processes that finite difference the columns of the
+        jacobian in parallel when not running under MPI. The extra
+        processes are workers forked from the Problem, which keeps them
+        for later finite differences.
     """
 
     def __init__(self):
@@ -8,9 +8,10 @@ import warnings
 
 from collections import OrderedDict
 from itertools import chain
-from six import iteritems, itervalues
+from six import iteritems, itervalues, string_types
 
 import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, issparse
 
 from openmdao.core.basic_impl import BasicImpl
 from openmdao.core.system import System
@@ -72,6 +73,15 @@ class Component(System):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['coloring'] : bool(False)
+        Set to True to finite difference structurally orthogonal columns
+        together. The sparsity comes from declare_partials when available,
+        and is otherwise probed by the first full finite difference.
+    deriv_options['num_fd_procs'] : int(1)
+        Number of processes that finite difference the columns of the
+        jacobian in parallel when not running under MPI. The extra
+        processes are workers forked from the Problem, which keeps them
+        for later finite differences.
     """
 
     def __init__(self):
@@ -87,6 +97,12 @@ class Component(System):
         self._pbo_warns = []
         self._run_apply = False
 
+        # declared sparsity of subjacobians, keyed on (unknown, param)
+        self._subjac_info = OrderedDict()
+
+        # optional EvalCache of results, keyed on the param values
+        self.eval_cache = None
+
     def _get_initial_val(self, val, shape):
         """ Determines initial value based on starting val and shape."""
         if val is _NotSet:
@@ -309,6 +325,122 @@ class Component(System):
             raise NameError("%s: '%s' is not a valid variable name." %
                             (self.pathname, name))
 
+    def declare_partials(self, of, wrt, rows, cols):
+        """ Declares the sparsity structure of the partial derivative of one
+        or more unknowns with respect to one or more params or states. For a
+        declared pair, `linearize` returns only the nonzero values, in the
+        same order as `rows` and `cols`, instead of the full dense array.
+
+        Args
+        ----
+        of : str or list of str
+            Name of the unknown(s) (the derivative of).
+
+        wrt : str or list of str
+            Name of the param(s) or state(s) (the derivative with respect to).
+
+        rows : iterable of int
+            Row index of each nonzero entry in the subjacobian.
+
+        cols : iterable of int
+            Column index of each nonzero entry in the subjacobian.
+        """
+        rows = np.array(rows, dtype=int).ravel()
+        cols = np.array(cols, dtype=int).ravel()
+
+        if rows.size != cols.size:
+            msg = "{}: rows and cols must be the same length, but rows has " \
+                  "length {} and cols has length {}."
+            raise ValueError(msg.format(self.pathname, rows.size, cols.size))
+
+        ofs = [of] if isinstance(of, string_types) else of
+        wrts = [wrt] if isinstance(wrt, string_types) else wrt
+
+        for o in ofs:
+            for w in wrts:
+                self._subjac_info[o, w] = { 'rows': rows, 'cols': cols }
+
+    def _sparse_subjac(self, key, J):
+        """ Converts the nonzero values returned from `linearize` for a
+        declared subjacobian into a csr_matrix. The csr structure is
+        computed once and shared by every subsequent call."""
+        if issparse(J):
+            return J
+
+        info = self._subjac_info[key]
+        vals = np.asarray(J).ravel()
+
+        if 'indptr' not in info:
+            o_var, i_var = key
+            vec = self.unknowns if i_var in self.states else self.params
+            shape = (self.unknowns.metadata(o_var)['size'],
+                     vec.metadata(i_var)['size'])
+            rows, cols = info['rows'], info['cols']
+            nnz = rows.size
+
+            if nnz and (rows.max() >= shape[0] or cols.max() >= shape[1] or
+                        rows.min() < 0 or cols.min() < 0):
+                msg = "In component '{}', the declared sparsity of '{}' wrt " \
+                      "'{}' has indices outside of its shape '{}'."
+                raise ValueError(msg.format(self.pathname, o_var, i_var, shape))
+
+            # Store the position of each nonzero so that csr data can be
+            # filled with a single gather.
+            pattern = coo_matrix((np.arange(1, nnz + 1), (rows, cols)),
+                                 shape=shape).tocsr()
+            if pattern.nnz != nnz:
+                msg = "In component '{}', the declared sparsity of '{}' wrt " \
+                      "'{}' contains duplicate entries."
+                raise ValueError(msg.format(self.pathname, o_var, i_var))
+
+            info['shape'] = shape
+            info['indices'] = pattern.indices
+            info['indptr'] = pattern.indptr
+            info['perm'] = pattern.data.astype(int) - 1
+
+        if vals.size != info['perm'].size:
+            msg = "In component '{}', the derivative of '{}' wrt '{}' is " \
+                  "declared sparse with {} nonzeros, but {} values were given."
+            msg = msg.format(self.pathname, key[0], key[1], info['perm'].size,
+                             vals.size)
+            raise ValueError(msg)
+
+        return csr_matrix((vals[info['perm']], info['indices'], info['indptr']),
+                          shape=info['shape'])
+
+    def _get_fd_sparsity(self, fd_unknowns, fd_params, states, total_derivs):
+        """ Returns the sparsity of the finite difference jacobian built from
+        `declare_partials`, or None if nothing was declared. Undeclared
+        subjacobians are treated as dense."""
+        if total_derivs or not self._subjac_info:
+            return None
+
+        rows, cols = [], []
+        r_start = 0
+        for u_name in fd_unknowns:
+            u_size = self.unknowns.metadata(u_name)['size']
+            c_start = 0
+            for p_name in chain(fd_params, states):
+                vec = self.unknowns if p_name in states else self.params
+                p_size = vec.metadata(p_name)['size']
+
+                info = self._subjac_info.get((u_name, p_name))
+                if info is None:
+                    r, c = np.unravel_index(np.arange(u_size * p_size),
+                                            (u_size, p_size))
+                else:
+                    r, c = info['rows'], info['cols']
+
+                rows.append(r + r_start)
+                cols.append(c + c_start)
+                c_start += p_size
+            r_start += u_size
+
+        if not rows:
+            return None
+
+        return np.concatenate(rows), np.concatenate(cols)
+
     def setup_distrib(self):
         """
         Override this in your Component to set specific indices that will be
@@ -516,12 +648,13 @@ class Component(System):
         # so force their creation here
         self._create_views(top_unknowns, parent, [], None)
 
-        all_vois = set([None])
-        if self._probdata.top_lin_gs: # only need voi vecs for lings
+        # only need voi vecs for lings. They are created on first use by
+        # calc_gradient, except under MPI.
+        self._voi_vec_args = (parent, top_unknowns)
+        if self._probdata.top_lin_gs and MPI:
             # create storage for the relevant vecwrappers, keyed by
             # variable_of_interest
             for vois in relevance.groups:
-                all_vois.update(vois)
                 for voi in vois:
                     self._create_views(top_unknowns, parent, [], voi)
 
@@ -532,6 +665,37 @@ class Component(System):
             if name not in self.params:
                 self.params._add_unconnected_var(pathname, meta)
 
+    def _setup_voi_vecs(self, vois):
+        """
+        Create the derivative vecwrappers for the given variables of
+        interest, if they don't exist yet.
+
+        Args
+        ----
+        vois : list of str
+            Names of the variables of interest.
+        """
+        if not self.is_active():
+            return
+
+        parent, top_unknowns = self._voi_vec_args
+        for voi in vois:
+            if voi not in self.dumat:
+                self._create_views(top_unknowns, parent, [], voi)
+
+    def _remove_voi_vecs(self, vois):
+        """
+        Free the derivative vecwrappers for the given variables of interest.
+
+        Args
+        ----
+        vois : list of str
+            Names of the variables of interest.
+        """
+        for voi in vois:
+            for dct in (self.dumat, self.drmat, self.dpmat):
+                dct.pop(voi, None)
+
     def _sys_apply_nonlinear(self, params, unknowns, resids):
         """
         Evaluates the residuals for this component. This wraps
@@ -590,10 +754,44 @@ class Component(System):
         resids.vec[:] += unknowns.vec
         unknowns.vec[:] -= resids.vec
 
+    def _sys_linearize(self, params, unknowns, resids, total_derivs=None):
+        """
+        Entry point for all callers to cause linearization of this
+        `Component`. Subjacobians with declared sparsity are converted to
+        sparse matrices.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        total_derivs: bool
+            flag indicating if total or partial derivatives are being forced.
+            None allows the system to choose whats appropriate for itself
+        """
+        jc = super(Component, self)._sys_linearize(params, unknowns, resids,
+                                                   total_derivs=total_derivs)
+
+        if jc is not None and self._subjac_info and \
+           self.deriv_options['type'] == 'user':
+            for key in self._subjac_info:
+                if key in jc:
+                    jc[key] = self._sparse_subjac(key, jc[key])
+
+        return jc
+
     def _sys_solve_nonlinear(self, params, unknowns, resids):
         """
         Runs the component. This wraps solve_nonlinear and performs any
-        necessary pre/post operations.
+        necessary pre/post operations. If an `EvalCache` is assigned to
+        eval_cache, the unknowns are restored from it when the params have
+        been seen before.
 
         Args
         ----
@@ -606,9 +804,28 @@ class Component(System):
         resids : `VecWrapper`, optional
             `VecWrapper` containing residuals. (r)
         """
+        cache = self.eval_cache
+
+        # Complex step perturbations live in the imaginary part, which
+        # isn't part of the key.
+        if cache is None or isinstance(unknowns, ComplexStepSrcVecWrapper) or \
+           unknowns._probdata.in_complex_step:
+            key = None
+        else:
+            key = cache.key(params, unknowns)
+
+        if key is not None:
+            entry = cache.get(key)
+            if entry is not None:
+                cache.restore(entry, unknowns)
+                return
+
         self.solve_nonlinear(params, unknowns, resids)
         unknowns._scale_values()
 
+        if key is not None:
+            cache.put(key, unknowns)
+
     def solve_nonlinear(self, params, unknowns, resids):
         """
         Runs the component. The user is required to define this function in
@@ -633,7 +850,9 @@ class Component(System):
         """
         Returns Jacobian. Returns None unless component overides this method
         and returns something. J should be a dictionary whose keys are tuples
-        of the form ('unknown', 'param') and whose values are ndarrays.
+        of the form ('unknown', 'param') and whose values are ndarrays. For
+        pairs declared with `declare_partials`, the value is a flat array of
+        the nonzero entries.
 
         Args
         ----
@@ -961,7 +1180,17 @@ class Component(System):
         """
 
         if self._jacobian_cache is not None and len(self._jacobian_cache) > 0:
-            return self._jacobian_cache
+            jac = self._jacobian_cache
+
+            # Declared subjacobians were converted to sparse matrices after
+            # the last linearize, so hand back their nonzero values.
+            for key, info in iteritems(self._subjac_info):
+                if key in jac and issparse(jac[key]) and 'perm' in info:
+                    vals = np.empty(info['perm'].size)
+                    vals[info['perm']] = jac[key].data
+                    jac[key] = vals
+
+            return jac
 
         self._jacobian_cache = jac = {}
 
@@ -982,11 +1211,14 @@ class Component(System):
                 s_size_storage.append((n, meta['size']))
             u_size_storage.append((n, meta['size']))
 
-        for u_var, u_size in u_size_storage:
-            for p_var, p_size in p_size_storage:
-                jac[u_var, p_var] = np.zeros((u_size, p_size))
+        sparsity = self._subjac_info
 
-            for s_var, s_size in s_size_storage:
-                jac[u_var, s_var] = np.zeros((u_size, s_size))
+        for u_var, u_size in u_size_storage:
+            for p_var, p_size in chain(p_size_storage, s_size_storage):
+                if (u_var, p_var) in sparsity:
+                    nnz = sparsity[u_var, p_var]['rows'].size
+                    jac[u_var, p_var] = np.zeros(nnz)
+                else:
+                    jac[u_var, p_var] = np.zeros((u_size, p_size))
 
         return jac
@@ -8,6 +8,9 @@ from openmdao.util.array_util import to_slice
 from openmdao.core.mpi_wrap import MPI
 from openmdao.core.fileref import FileRef
 
+# Contiguous runs of at least this many entries are transferred as slices.
+MIN_SLICE_SIZE = 32
+
 class DataTransfer(object):
     """
     An object that performs data transfer between a source vector and a
@@ -43,48 +46,87 @@ class DataTransfer(object):
         self.byobj_conns = byobj_conns
         self.sysdata = sysdata
 
-        fwd = mode == 'fwd'
+        # unit conversions of our targets, collected on the first transfer
+        self._unit_conv = None
 
-        # sort subarrays wrt each other in ascending order (not internally)
-        # this assumes that subarrays are already sorted internally. The
-        # only time this won't be true is if an unknown is connected to
-        # a param with src_indices that are not sorted or have non unique
-        # entries.  In this case we'll just use the array index we were
-        # given and won't convert to a slice.
-        if fwd:
-            keyfunc = lambda l: l[0][0]
-        else:
-            keyfunc = lambda l: l[1][0]
+        fwd = mode == 'fwd'
 
         scatters = []
-        for isrcs, itgts in sorted(zip(src_idxs, tgt_idxs), key=keyfunc):
-            srcs = to_slice(isrcs)
-            tgts = to_slice(itgts)
-
-            if not fwd and not isinstance(srcs, slice):
-                # check uniqueness of src_idxs to see if we can avoid
-                # calling np.add.at, which is slower than +=
-                src_unique = np.unique(srcs).size == srcs.size
-            else:
-                src_unique = True
-
-            if scatters: # after the first iteration...
-                # try to combine smaller slices into a larger one
-                olds, oldt, sunique = scatters[-1]
-                if isinstance(olds, slice) and isinstance(oldt, slice) and \
-                     isinstance(srcs, slice) and isinstance(tgts, slice) and \
-                     olds.stop == srcs.start and oldt.stop == tgts.start and \
-                     olds.step == srcs.step and oldt.step == tgts.step:
-                    news = slice(olds.start, srcs.stop, srcs.step)
-                    newt = slice(oldt.start, tgts.stop, tgts.step)
-                    scatters[-1] = (news, newt, src_unique)
+
+        # Connections whose indices are evenly strided in both vectors (e.g.
+        # from src_indices) are transferred as strided slices. Everything
+        # else is merged below.
+        merge_srcs = []
+        merge_tgts = []
+        for isrcs, itgts in zip(src_idxs, tgt_idxs):
+            if len(isrcs) >= MIN_SLICE_SIZE:
+                srcs = to_slice(isrcs)
+                tgts = to_slice(itgts)
+                if isinstance(srcs, slice) and isinstance(tgts, slice) and \
+                        (srcs.step != 1 or tgts.step != 1):
+                    scatters.append((srcs, tgts, True))
+                    continue
+            merge_srcs.append(isrcs)
+            merge_tgts.append(itgts)
+
+        if merge_srcs:
+            srcs = np.concatenate(merge_srcs)
+            tgts = np.concatenate(merge_tgts)
+        else:
+            srcs = tgts = np.zeros(0, dtype=int)
+
+        if srcs.size > 0:
+            # Every target index is written by exactly one source index, so
+            # sorting on the targets gives runs that are contiguous in both
+            # vectors wherever the variables are laid out in the same order.
+            order = np.argsort(tgts, kind='mergesort')
+            srcs = srcs[order]
+            tgts = tgts[order]
+
+            breaks = np.nonzero((srcs[1:] - srcs[:-1] != 1) |
+                                (tgts[1:] - tgts[:-1] != 1))[0] + 1
+            starts = np.concatenate(([0], breaks))
+            ends = np.concatenate((breaks, [srcs.size]))
+
+            # Long runs become slices. The many short runs typical of
+            # scalar connections are gathered into a single index array
+            # scatter, which is cheaper than looping over tiny slices.
+            is_slice = ends - starts >= MIN_SLICE_SIZE
+            if np.count_nonzero(~is_slice) == 1:
+                is_slice[:] = True
+
+            for start, end in zip(starts[is_slice], ends[is_slice]):
+                scatters.append((slice(int(srcs[start]), int(srcs[end-1])+1),
+                                 slice(int(tgts[start]), int(tgts[end-1])+1),
+                                 True))
+
+            if not is_slice.all():
+                gathered = np.repeat(~is_slice, ends - starts)
+                isrcs = srcs[gathered]
+                itgts = tgts[gathered]
+
+                if fwd:
+                    src_unique = True
                 else:
-                    scatters.append((srcs, tgts, src_unique))
-            else:
-                scatters.append((srcs, tgts, src_unique))
+                    # check uniqueness of src_idxs to see if we can avoid
+                    # calling np.add.at, which is slower than +=
+                    src_unique = np.unique(isrcs).size == isrcs.size
+
+                scatters.append((isrcs, itgts, src_unique))
 
         self.scatters = scatters
 
+        # Preallocated buffers for the index array scatters, so that a
+        # transfer doesn't allocate temporaries when gathering values.
+        self._bufs = []
+        for isrcs, itgts, src_unique in scatters:
+            if isinstance(isrcs, slice):
+                self._bufs.append(None)
+            elif fwd or not src_unique:
+                self._bufs.append((np.empty(len(isrcs)), None))
+            else:
+                self._bufs.append((np.empty(len(isrcs)), np.empty(len(isrcs))))
+
     def transfer(self, srcvec, tgtvec, mode='fwd', deriv=False):
         """
         Performs data transfer between a source vector and a target vector.
@@ -107,23 +149,57 @@ class DataTransfer(object):
             If True, this is a derivative data transfer, so no pass_by_obj
             variables will be transferred.
         """
+        conv = self._unit_conv
+        if conv is None:
+            if self.vec_conns:
+                conv = tgtvec._get_unit_conv(t for t, s in self.vec_conns)
+            else:
+                conv = ()
+            self._unit_conv = conv
+
         if mode == 'rev':
             # in reverse mode, srcvec and tgtvec are switched. Note, we only
             # run in reverse for derivatives, and derivatives accumulate from
             # all targets. byobjs are never scattered in reverse
-            for isrcs, itgts, src_unique in self.scatters:
-                if src_unique:
+            if conv:
+                tgtvec._apply_unit_derivatives(conv)
+
+            for (isrcs, itgts, src_unique), bufs in zip(self.scatters,
+                                                        self._bufs):
+                if bufs is None:
                     srcvec.vec[isrcs] += tgtvec.vec[itgts]
                 else:
-                    np.add.at(srcvec.vec, isrcs, tgtvec.vec[itgts])
+                    tbuf, sbuf = bufs
+                    np.take(tgtvec.vec, itgts, out=tbuf)
+                    if src_unique:
+                        np.take(srcvec.vec, isrcs, out=sbuf)
+                        sbuf += tbuf
+                        np.put(srcvec.vec, isrcs, sbuf)
+                    else:
+                        np.add.at(srcvec.vec, isrcs, tbuf)
         else:
-            if tgtvec._probdata.in_complex_step:
-                for isrcs, itgts, _ in self.scatters:
-                    tgtvec.vec[itgts] = srcvec.vec[isrcs]
-                    tgtvec.imag_vec[itgts] = srcvec.imag_vec[isrcs]
-            else:
-                for isrcs, itgts, _ in self.scatters:
+            for (isrcs, itgts, _), bufs in zip(self.scatters, self._bufs):
+                if bufs is None:
                     tgtvec.vec[itgts] = srcvec.vec[isrcs]
+                else:
+                    buf = bufs[0]
+                    np.take(srcvec.vec, isrcs, out=buf)
+                    np.put(tgtvec.vec, itgts, buf)
+
+            if tgtvec._probdata.in_complex_step:
+                for (isrcs, itgts, _), bufs in zip(self.scatters, self._bufs):
+                    if bufs is None:
+                        tgtvec.imag_vec[itgts] = srcvec.imag_vec[isrcs]
+                    else:
+                        buf = bufs[0]
+                        np.take(srcvec.imag_vec, isrcs, out=buf)
+                        np.put(tgtvec.imag_vec, itgts, buf)
+
+            if conv:
+                if deriv:
+                    tgtvec._apply_unit_derivatives(conv)
+                else:
+                    tgtvec._apply_unit_conv(conv)
 
             # forward, include byobjs if not a deriv scatter
             if not deriv:
@@ -788,7 +788,8 @@ class Driver(object):
         self.recorders.record_iteration(system, metadata)
 
     def calc_gradient(self, indep_list, unknown_list, mode='auto',
-                      return_format='array', sparsity=None, inactives=None):
+                      return_format='array', sparsity=None, inactives=None,
+                      coloring=None):
         """ Returns the scaled gradient for the system that is contained in
         self.root, scaled by all scalers that were specified when the desvars
         and constraints were added.
@@ -821,6 +822,9 @@ class Driver(object):
             skipped for these in adjoine mode. Key is the constraint name, and
             value is the indices that are inactive.
 
+        coloring : dict, optional
+            Total derivative coloring from `Problem.compute_total_coloring`.
+
         Returns
         -------
         ndarray or dict
@@ -831,7 +835,8 @@ class Driver(object):
                                         return_format=return_format,
                                         dv_scale=self.dv_conversions,
                                         cn_scale=self.fn_conversions,
-                                        sparsity=sparsity, inactives=inactives)
+                                        sparsity=sparsity, inactives=inactives,
+                                        coloring=coloring)
 
         self.recorders.record_derivatives(J, self.metadata)
         return J
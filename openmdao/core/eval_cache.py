@@ -0,0 +1,215 @@
+""" Memoizing cache for the results of expensive Component evaluations."""
+
+import copy
+import hashlib
+import pickle
+import shelve
+
+from collections import OrderedDict
+from six import iteritems
+
+import numpy as np
+
+
+class EvalCache(object):
+    """ A least recently used cache of Component results, keyed on a hash
+    of the values of the params (and of the states, whose values are the
+    initial guess for an implicit component). Assign one to the
+    `eval_cache` attribute of a Component, and on a hit the unknowns are
+    restored from the cache instead of calling solve_nonlinear.
+
+    Entries can optionally be persisted to disk so that they survive
+    between runs. Each Component should get its own cache and file.
+
+    Args
+    ----
+    size : int(128)
+        Maximum number of entries held in memory. The least recently
+        used entry is evicted when the cache is full.
+
+    filename : str, optional
+        Name of a `shelve` database where entries are also stored. Entries
+        found on disk are loaded on a miss of the in-memory cache.
+
+    Attributes
+    ----------
+    hits : int
+        Number of evaluations that were restored from the cache.
+
+    misses : int
+        Number of evaluations that had to be computed.
+    """
+
+    def __init__(self, size=128, filename=None):
+        if size < 1:
+            raise ValueError("EvalCache size must be at least 1, not %s." % size)
+
+        self.size = size
+        self.filename = filename
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._shelf = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # The open database can't be pickled.
+        state = self.__dict__.copy()
+        state['_shelf'] = None
+        return state
+
+    def key(self, params, unknowns):
+        """
+        Computes the key for the current params and states.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        Returns
+        -------
+        str or None
+            Hex digest of the hashed values, or None if some value can't
+            be hashed, in which case the evaluation isn't cached.
+        """
+        sha = hashlib.sha1()
+
+        for vec, states_only in ((params, False), (unknowns, True)):
+            for name, acc in iteritems(vec._dat):
+                if states_only and not acc.meta.get('state'):
+                    continue
+
+                val = acc.val.val if acc.pbo else acc.val
+
+                if isinstance(val, (np.ndarray, float, int, complex)):
+                    val = np.asarray(val)
+                    data = np.ascontiguousarray(val).tobytes()
+                    sha.update(str(val.shape).encode('utf-8'))
+                else:
+                    try:
+                        data = pickle.dumps(val, 2)
+                    except Exception:
+                        return None
+
+                sha.update(name.encode('utf-8'))
+                sha.update(data)
+
+        return sha.hexdigest()
+
+    def get(self, key):
+        """
+        Looks up an entry and updates the hit/miss counters.
+
+        Args
+        ----
+        key : str
+            Key returned by `key`.
+
+        Returns
+        -------
+        list or None
+            The cached values of the unknowns, or None on a miss.
+        """
+        entries = self._entries
+
+        if key in entries:
+            # Move to the most recently used end.
+            entry = entries.pop(key)
+            entries[key] = entry
+            self.hits += 1
+            return entry
+
+        if self.filename is not None:
+            shelf = self._get_shelf()
+            if key in shelf:
+                entry = shelf[key]
+                self._add(key, entry)
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, key, unknowns):
+        """
+        Stores the current values of the unknowns.
+
+        Args
+        ----
+        key : str
+            Key returned by `key`.
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+        """
+        entry = []
+        for name, acc in iteritems(unknowns._dat):
+            if acc.pbo:
+                entry.append((name, copy.deepcopy(acc.val.val)))
+            else:
+                entry.append((name, acc.val.copy()))
+
+        self._add(key, entry)
+
+        if self.filename is not None:
+            shelf = self._get_shelf()
+            try:
+                shelf[key] = entry
+            except Exception:
+                # Unpicklable pass_by_obj outputs only live in memory.
+                return
+            shelf.sync()
+
+    def restore(self, entry, unknowns):
+        """
+        Copies a cached entry into the unknowns.
+
+        Args
+        ----
+        entry : list
+            Entry returned by `get`.
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+        """
+        dat = unknowns._dat
+        for name, val in entry:
+            acc = dat[name]
+            if acc.pbo:
+                acc.val.val = copy.deepcopy(val)
+            else:
+                acc.val[:] = val
+
+    def clear(self):
+        """ Removes all in-memory entries and resets the counters. Entries
+        on disk are kept."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """ Closes the disk database, if open."""
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+
+    def _add(self, key, entry):
+        """ Adds an entry to memory, evicting the least recently used one
+        if the cache is full."""
+        entries = self._entries
+        entries[key] = entry
+        while len(entries) > self.size:
+            entries.popitem(last=False)
+
+    def _get_shelf(self):
+        """ Opens the disk database on first use."""
+        if self._shelf is None:
+            self._shelf = shelve.open(self.filename, protocol=2)
+        return self._shelf
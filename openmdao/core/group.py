@@ -13,14 +13,17 @@ from collections import Iterable
 
 import numpy as np
 import networkx as nx
+from scipy.sparse import coo_matrix, issparse
 
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.core.component import Component
 from openmdao.core.mpi_wrap import MPI, debug
-from openmdao.core.system import System
+from openmdao.core.system import System, _DummyContext
 from openmdao.core.fileref import FileRef
+from openmdao.util.array_util import offsets_from_sizes, idx_ranges
 from openmdao.util.string_util import nearest_child, name_relative_to
 from openmdao.util.graph import collapse_nodes, break_strongly_connected
+from openmdao.util.record_util import create_local_meta, update_local_meta
 
 #from openmdao.devtools.debug import diff_mem, mem_usage
 
@@ -29,6 +32,15 @@ trace = os.environ.get('OPENMDAO_TRACE')
 # regex to check for valid variable names.
 namecheck_rgx = re.compile('[_a-zA-Z][_a-zA-Z0-9]*')
 
+# operations of a flattened children_solve_nonlinear
+_NL_XFER, _NL_COMP, _NL_DIR_COMP, _NL_ENTER, _NL_GROUP = range(5)
+
+def _same_method(group, name):
+    """ Returns True if the given Group doesn't override the named method,
+    either in its class or on the instance itself."""
+    return name not in group.__dict__ and \
+           getattr(type(group), name) == getattr(Group, name)
+
 class Group(System):
     """A system that contains other systems.
 
@@ -63,6 +75,15 @@ class Group(System):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['coloring'] : bool(False)
+        Set to True to finite difference structurally orthogonal columns
+        together. The sparsity comes from declare_partials when available,
+        and is otherwise probed by the first full finite difference.
+    deriv_options['num_fd_procs'] : int(1)
+        Number of processes that finite difference the columns of the
+        jacobian in parallel when not running under MPI. The extra
+        processes are workers forked from the Problem, which keeps them
+        for later finite differences.
     """
 
     def __init__(self):
@@ -71,6 +92,10 @@ class Group(System):
         self._src = OrderedDict()
         self._data_xfer = OrderedDict()
 
+        # transfers for the nonlinear vectors when some params are aliased
+        self._nl_data_xfer = OrderedDict()
+        self._nl_p_size_lists = None
+
         self._local_unknown_sizes = OrderedDict()
         self._local_param_sizes = OrderedDict()
 
@@ -89,6 +114,15 @@ class Group(System):
         self._run_apply = True
         self._icache = {}
 
+        # flattened solve_nonlinear and apply_linear recursion, if enabled
+        self._nl_plan = None
+        self._lin_plan = None
+
+        # Copies of the params and unknowns of each subsystem from the end of
+        # its last run, used to skip subsystems that are clean.
+        self._clean_snapshots = {}
+        self._clean_dangling = {}
+
     def find_subsystem(self, name):
         """
         Returns a reference to a named subsystem that is a direct or an indirect
@@ -273,6 +307,8 @@ class Group(System):
         super(Group, self)._init_sys_data(parent_path, probdata)
         self._sys_graph = None
         self._gs_outputs = None
+        self._nl_plan = None
+        self._lin_plan = None
         self.ln_solver.pathname = self.pathname + '.' + self.ln_solver.__class__.__name__
         self.nl_solver.pathname = self.pathname + '.' + self.nl_solver.__class__.__name__
         self.ln_solver.recorders.pathname = self.ln_solver.pathname+'.'+'recorders'
@@ -429,6 +465,8 @@ class Group(System):
         self._local_unknown_sizes = OrderedDict()
         self._local_param_sizes = OrderedDict()
         self._owning_ranks = None
+        self._clean_snapshots = {}
+        self._clean_dangling = {}
         self.connections = self._probdata.connections
         relevance = self._probdata.relevance
 
@@ -476,25 +514,31 @@ class Group(System):
         self._u_size_lists = self.unknowns._get_flattened_sizes()
         self._p_size_lists = self.params._get_flattened_sizes()
 
+        # aliased params have no storage in params, but they keep their place
+        # in the derivative vectors, so those get their own size lists
+        self._nl_data_xfer = OrderedDict()
+        self._nl_p_size_lists = None
+        for acc in itervalues(self.params._dat):
+            if acc.aliased and acc.owned:
+                self._nl_p_size_lists = self._p_size_lists
+                self._p_size_lists = self.dpmat[None]._get_flattened_sizes()
+                break
+
         self._owning_ranks = self._get_owning_ranks()
         self._sysdata.owning_ranks = self._owning_ranks
 
         self._setup_data_transfer(my_params, None, alloc_derivs)
 
-        all_vois = set([None])
-        if self._probdata.top_lin_gs:
-            # create storage for the relevant vecwrappers,
-            # keyed by variable_of_interest
+        # the relevant vecwrappers for each variable_of_interest are created
+        # on first use by calc_gradient, except under MPI where all
+        # processes have to create them together.
+        self._voi_vec_args = (parent, top_unknowns, my_params, alloc_derivs)
+        self._voi_xfers = {}
+        self._voi_rel_keys = {}
+        if self._probdata.top_lin_gs and MPI:
             for vois in relevance.groups:
-                all_vois.update(vois)
                 for voi in vois:
-                    if parent is None:
-                        self._create_vecs(my_params, voi, impl)
-                    else:
-                        self._create_views(top_unknowns, parent, my_params,
-                                           voi)
-
-                    self._setup_data_transfer(my_params, voi, alloc_derivs)
+                    self._create_voi_vecs(voi)
 
         for sub in itervalues(self._subsystems):
             sub._setup_vectors(param_owners, parent=self,
@@ -506,9 +550,24 @@ class Group(System):
         # given voi and a given child system.
 
         self._do_apply = {} # dict of (child_pathname, voi) keyed to bool
+        self._update_do_apply()
+
+        self._relname_map = None  # reclaim some memory
+
+    def _update_do_apply(self, vois=None):
+        """
+        Set the flags telling us whether to run apply_linear for each
+        child system and variable of interest.
 
+        Args
+        ----
+        vois : iter of str or None, optional
+            Variables of interest to update. By default all of them are.
+        """
         for s in self.subsystems(recurse=True, include_self=True):
             for voi, vec in iteritems(s.dpmat):
+                if vois is not None and voi not in vois:
+                    continue
                 for acc in itervalues(vec._dat):
                     if not acc.pbo:
                         self._do_apply[(s.pathname, voi)] = True
@@ -516,7 +575,90 @@ class Group(System):
                 else:
                     self._do_apply[(s.pathname, voi)] = False
 
-        self._relname_map = None  # reclaim some memory
+    def _create_voi_vecs(self, voi):
+        """
+        Create the derivative vecwrappers and data transfers of this
+        `Group` for a variable of interest.
+
+        Args
+        ----
+        voi : str
+            The name of the variable of interest.
+        """
+        parent, top_unknowns, my_params, alloc_derivs = self._voi_vec_args
+        if parent is None:
+            self._create_vecs(my_params, voi, self._impl)
+        else:
+            self._create_views(top_unknowns, parent, my_params, voi)
+
+        self._setup_data_transfer(my_params, voi, alloc_derivs)
+
+    def _setup_voi_vecs(self, vois):
+        """
+        Create the derivative vecwrappers and data transfers for the given
+        variables of interest in this `Group` and all of its subsystems,
+        if they don't exist yet.
+
+        Args
+        ----
+        vois : list of str
+            Names of the variables of interest.
+        """
+        if not self.is_active():
+            return
+
+        parent = self._voi_vec_args[0]
+        if parent is not None:
+            self._relname_map = self._get_relname_map(parent._sysdata.to_prom_name)
+
+        for voi in vois:
+            if voi not in self.dumat:
+                self._create_voi_vecs(voi)
+                self._gs_outputs = None
+
+        self._relname_map = None
+
+        for sub in itervalues(self._subsystems):
+            sub._setup_voi_vecs(vois)
+
+        self._update_do_apply(vois)
+
+    def _remove_voi_vecs(self, vois):
+        """
+        Free the derivative vecwrappers and data transfers for the given
+        variables of interest in this `Group` and all of its subsystems.
+
+        Args
+        ----
+        vois : list of str
+            Names of the variables of interest.
+        """
+        if not self.is_active():
+            return
+
+        vois = set(vois)
+        for voi in vois:
+            for dct in (self.dumat, self.drmat, self.dpmat,
+                        self._local_unknown_sizes, self._local_param_sizes):
+                dct.pop(voi, None)
+
+            rel_key = self._voi_rel_keys.pop(voi, None)
+            if rel_key is not None:
+                users = self._voi_xfers[rel_key][1]
+                users.discard(voi)
+                if not users:
+                    del self._voi_xfers[rel_key]
+
+        for key in [k for k in self._data_xfer if k[2] in vois]:
+            del self._data_xfer[key]
+
+        for key in [k for k in self._do_apply if k[1] in vois]:
+            del self._do_apply[key]
+
+        self._gs_outputs = None
+
+        for sub in itervalues(self._subsystems):
+            sub._remove_voi_vecs(vois)
 
     def _create_vecs(self, my_params, voi, impl):
         """ This creates our vecs and mats. This is only called on
@@ -738,7 +880,7 @@ class Group(System):
 
             self.nl_solver.solve(params, unknowns, resids, self, metadata)
 
-    def children_solve_nonlinear(self, metadata):
+    def children_solve_nonlinear(self, metadata, skip_clean=False):
         """
         Loops over our children systems and asks them to solve.
 
@@ -746,18 +888,113 @@ class Group(System):
         ----
         metadata : dict
             Dictionary containing execution metadata (e.g. iteration coordinate).
+
+        skip_clean : bool(False)
+            If True, skip any subsystem whose params and unknowns have not
+            changed since the end of its last run. Ignored when running on
+            more than one process or during complex step.
         """
+        # The clean check only compares real values, so it can't see a
+        # complex step perturbation.
+        if (MPI and self.comm.size > 1) or self._probdata.in_complex_step:
+            skip_clean = False
+
+        if self._nl_plan is not None and not skip_clean:
+            self._run_nl_plan(metadata)
+            return
 
         # transfer data to each subsystem and then solve_nonlinear it
         for sub in itervalues(self._subsystems):
             self._transfer_data(sub.name)
             if sub.is_active():
+                if skip_clean and self._is_clean(sub):
+                    continue
+
                 with sub._dircontext:
                     if isinstance(sub, Component):
                         sub._sys_solve_nonlinear(sub.params, sub.unknowns, sub.resids)
                     else:
                         sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
 
+                if skip_clean:
+                    self._save_clean(sub)
+
+    def _is_clean(self, sub):
+        """
+        Returns True if the params and unknowns of the given subsystem are
+        the same as at the end of its last run.
+
+        Args
+        ----
+        sub : `System`
+            Subsystem to check.
+        """
+        snapshot = self._clean_snapshots.get(sub.name)
+        if snapshot is None:
+            return False
+
+        for old, val in zip(snapshot, self._clean_vals(sub)):
+            if not np.array_equal(old, val):
+                return False
+
+        return True
+
+    def _save_clean(self, sub):
+        """
+        Saves the params and unknowns of the given subsystem after it runs.
+        Subsystems with pass_by_obj variables are never considered clean,
+        because their values can't be compared cheaply.
+
+        Args
+        ----
+        sub : `System`
+            Subsystem that just ran.
+        """
+        if sub.name not in self._clean_dangling:
+            if isinstance(sub, Component):
+                systems = [sub]
+            else:
+                systems = sub.components(recurse=True)
+
+            # Unconnected params live outside of the vectors, but can still
+            # be compared when they are numeric.
+            dangling = []
+            for system in systems:
+                for vec in (system.params, system.unknowns):
+                    for acc in itervalues(vec._dat):
+                        if acc.meta.get('pass_by_obj'):
+                            dangling = None
+                            break
+                        elif acc.pbo:
+                            dangling.append(acc)
+                    if dangling is None:
+                        break
+                if dangling is None:
+                    break
+
+            self._clean_dangling[sub.name] = dangling
+
+        if self._clean_dangling[sub.name] is not None:
+            self._clean_snapshots[sub.name] = [np.array(val) for val in
+                                               self._clean_vals(sub)]
+
+    def _clean_vals(self, sub):
+        """
+        Iterates over the current values of the params and unknowns of the
+        given subsystem, including its unconnected params.
+
+        Args
+        ----
+        sub : `System`
+            Subsystem to iterate over.
+        """
+        for vec in (sub.params, sub.unknowns):
+            for name, val in vec.vec_val_iter():
+                yield val
+
+        for acc in self._clean_dangling[sub.name]:
+            yield acc.val.val
+
     def _sys_apply_nonlinear(self, params, unknowns, resids, metadata=None):
         """
         Evaluates the residuals of our children systems. This wrapper
@@ -866,6 +1103,16 @@ class Group(System):
         if not self.is_active():
             return
 
+        if self._lin_plan is not None:
+            for func, xfer in self._lin_plan[mode]:
+                if xfer:
+                    for voi in vois:
+                        func(mode=mode, deriv=True, var_of_interest=voi)
+                else:
+                    func(mode, do_apply, vois=vois, gs_outputs=gs_outputs,
+                         rel_inputs=rel_inputs)
+            return
+
         if mode == 'fwd':
             for voi in vois:
                 self._transfer_data(deriv=True, var_of_interest=voi)  # Full Scatter
@@ -884,6 +1131,146 @@ class Group(System):
             for voi in vois:
                 self._transfer_data(mode='rev', deriv=True, var_of_interest=voi)  # Full Scatter
 
+    def _setup_exec_plan(self):
+        """
+        Flatten the recursion over our subsystems in children_solve_nonlinear
+        and _sys_apply_linear into lists of operations that are executed
+        directly. Subgroups that would just pass the call down to their
+        own children are replaced by the operations of those children.
+        """
+        self._nl_plan = self._lin_plan = None
+        if not self.is_active():
+            return
+
+        if _same_method(self, 'children_solve_nonlinear'):
+            self._nl_plan = []
+            self._nl_depth = self._add_nl_ops(self._nl_plan, 0)
+
+        if _same_method(self, '_sys_apply_linear') and \
+           self.deriv_options['type'] == 'user':
+            self._lin_plan = {'fwd': [], 'rev': []}
+            self._add_lin_ops(self._lin_plan['fwd'], self._lin_plan['rev'])
+
+    def _add_nl_ops(self, ops, depth):
+        """
+        Add the operations of children_solve_nonlinear to ops.
+
+        Args
+        ----
+        ops : list
+            Operations of the plan, as (op, system, arg) tuples.
+
+        depth : int
+            Number of RunOnce solvers flattened above us.
+
+        Returns
+        -------
+        int
+            The deepest level of flattened RunOnce solvers.
+        """
+        from openmdao.solvers.run_once import RunOnce
+
+        maxdepth = depth
+        for sub in itervalues(self._subsystems):
+            ops.append((_NL_XFER, self, sub.name))
+            if not sub.is_active():
+                continue
+
+            if isinstance(sub, Component):
+                if isinstance(sub._dircontext, _DummyContext):
+                    ops.append((_NL_COMP, sub, None))
+                else:
+                    ops.append((_NL_DIR_COMP, sub, None))
+
+            # a RunOnce with nothing to record just runs the children once
+            elif type(sub.nl_solver) is RunOnce and \
+                 not sub.nl_solver.options['skip_clean'] and \
+                 not sub.nl_solver.recorders._recorders and \
+                 isinstance(sub._dircontext, _DummyContext) and \
+                 _same_method(sub, 'solve_nonlinear') and \
+                 _same_method(sub, 'children_solve_nonlinear'):
+                ops.append((_NL_ENTER, sub, depth))
+                maxdepth = max(maxdepth, sub._add_nl_ops(ops, depth + 1))
+
+            else:
+                ops.append((_NL_GROUP, sub, depth))
+
+        return maxdepth
+
+    def _run_nl_plan(self, metadata):
+        """
+        Execute the flattened children_solve_nonlinear.
+
+        Args
+        ----
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        # execution metadata of each level of flattened RunOnce solvers
+        metas = [metadata] + [None] * self._nl_depth
+
+        # group whose children are running. Each child starts with a
+        # transfer from its parent.
+        parent = self
+
+        try:
+            for op, system, arg in self._nl_plan:
+                if op == _NL_XFER:
+                    parent = system
+                    system._transfer_data(arg)
+                elif op == _NL_COMP:
+                    system._sys_solve_nonlinear(system.params, system.unknowns,
+                                                system.resids)
+                elif op == _NL_ENTER:
+                    solver = system.nl_solver
+                    solver.iter_count += 1
+                    local_meta = create_local_meta(metas[arg], system.name)
+                    system.ln_solver.local_meta = local_meta
+                    update_local_meta(local_meta, (solver.iter_count,))
+                    metas[arg + 1] = local_meta
+                elif op == _NL_GROUP:
+                    with system._dircontext:
+                        system.solve_nonlinear(system.params, system.unknowns,
+                                               system.resids, metas[arg])
+                else:
+                    with system._dircontext:
+                        system._sys_solve_nonlinear(system.params,
+                                                    system.unknowns,
+                                                    system.resids)
+        except FloatingPointError:
+            # report the nonfinite variables of the innermost flattened
+            # RunOnce, as its solve would have. Our own solver reports ours.
+            if parent is self:
+                raise
+
+            from openmdao.solvers.solver_base import _reraise_fp_error
+            _reraise_fp_error(parent.params, parent.unknowns, parent.resids)
+
+    def _add_lin_ops(self, fwd_ops, rev_ops):
+        """
+        Add the operations of _sys_apply_linear to fwd_ops and rev_ops.
+
+        Args
+        ----
+        fwd_ops : list
+            Operations for 'fwd' mode, as (function, is_transfer) tuples.
+
+        rev_ops : list
+            Operations for 'rev' mode, as (function, is_transfer) tuples.
+        """
+        fwd_ops.append((self._transfer_data, True))
+
+        for sub in self._local_subsystems:
+            if isinstance(sub, Group) and sub.is_active() and \
+               sub.deriv_options['type'] == 'user' and \
+               _same_method(sub, '_sys_apply_linear'):
+                sub._add_lin_ops(fwd_ops, rev_ops)
+            else:
+                fwd_ops.append((sub._sys_apply_linear, False))
+                rev_ops.append((sub._sys_apply_linear, False))
+
+        rev_ops.append((self._transfer_data, True))
+
     def solve_linear(self, dumat, drmat, vois, mode=None, solver=None, rel_inputs=None):
         """
         Single linear solution applied to whatever input is sitting in
@@ -977,7 +1364,8 @@ class Group(System):
             if isinstance(system, Group):
                 system.clear_dparams()  # only call on Groups
 
-    def assemble_jacobian(self, mode='fwd', method='assemble', mult=None):
+    def assemble_jacobian(self, mode='fwd', method='assemble', mult=None,
+                          sparse=False):
         """ Assemble and return an ndarray containing the Jacobian for this
         Group.
 
@@ -998,10 +1386,15 @@ class Group(System):
         mult : function(None)
             Solver mult function to coordinate the matrix vector product
 
+        sparse : bool(False)
+            If True and method is 'assemble', the Jacobian is built as a
+            scipy.sparse CSC matrix directly from the component Jacobian
+            blocks, without allocating a dense matrix.
+
         Returns
         -------
-        ndarray : Jacobian Matrix. Note: if mode is 'rev', then the transpose
-        Jacobian is returned.
+        ndarray or csc_matrix : Jacobian Matrix. Note: if mode is 'rev', then
+        the transpose Jacobian is returned.
 
         dict of tuples : Contains the location of each derivative in the Jacobian. The
         key is a tuple containing the component name string, and a tuple with the output
@@ -1027,7 +1420,13 @@ class Group(System):
         # Assemble the Jacobian
         else:
 
-            partials = -np.eye(n_edge)
+            if sparse:
+                # Blocks are collected in coordinate form. The diagonal holds
+                # the -I of the unknowns, except where a block overwrites it.
+                diag = -np.ones(n_edge)
+                data, rows, cols = [], [], []
+            else:
+                partials = -np.eye(n_edge)
             icache = self._icache
             conn = self.connections
             sys_prom_name = self._sysdata.to_prom_name
@@ -1080,10 +1479,44 @@ class Group(System):
                     else:
                         (o_start, o_end, i_start, i_end) = icache[key2]
 
-                    if mode=='fwd':
-                        partials[o_start:o_end, i_start:i_end] = jac[o_var, i_var]
+                    if sparse:
+                        block = coo_matrix(jac[o_var, i_var])
+                        if o_start == i_start:
+                            diag[o_start:o_end] = 0.0
+
+                        # Columns of a param connected with src_indices map
+                        # onto a subset of its source.
+                        b_col = block.col
+                        if i_var in sub.params:
+                            src_idxs = sub.params._dat[i_var].meta.get('src_indices')
+                            if src_idxs is not None:
+                                b_col = sub.params.to_idx_array(src_idxs)[b_col]
+
+                        data.append(block.data)
+                        if mode=='fwd':
+                            rows.append(block.row + o_start)
+                            cols.append(b_col + i_start)
+                        else:
+                            rows.append(b_col + i_start)
+                            cols.append(block.row + o_start)
                     else:
-                        partials[i_start:i_end, o_start:o_end] = jac[o_var, i_var].T
+                        J = jac[o_var, i_var]
+                        if issparse(J):
+                            J = J.toarray()
+
+                        if mode=='fwd':
+                            partials[o_start:o_end, i_start:i_end] = J
+                        else:
+                            partials[i_start:i_end, o_start:o_end] = J.T
+
+            if sparse:
+                idx = np.arange(n_edge)
+                data.append(diag)
+                rows.append(idx)
+                cols.append(idx)
+                partials = coo_matrix((np.concatenate(data),
+                                       (np.concatenate(rows), np.concatenate(cols))),
+                                      shape=(n_edge, n_edge)).tocsc()
 
         return partials, icache
 
@@ -1362,7 +1795,8 @@ class Group(System):
         return (min_procs, max_procs)
 
     def _get_global_idxs(self, uname, pname, u_var_idxs,
-                         u_sizes, p_var_idxs, p_sizes, mode):
+                         u_sizes, p_var_idxs, p_sizes, mode,
+                         u_offsets, p_offsets):
         """
         Return the global indices into the distributed unknowns and params vectors
         for the given unknown and param.  The given unknown and param have already
@@ -1393,6 +1827,12 @@ class Group(System):
         mode : str
             Solution mode, either 'fwd' or 'rev'
 
+        u_offsets : ndarray
+            (rank x var) array of unknown offsets into the global vector.
+
+        p_offsets : ndarray
+            (rank x var) array of parameter offsets into the global vector.
+
         Returns
         -------
         tuple of (idx_array, idx_array)
@@ -1431,9 +1871,12 @@ class Group(System):
 
             new_indices = np.empty(arg_idxs.shape, dtype=arg_idxs.dtype)
 
+            var_sizes = u_sizes[:, ivar]
+            var_starts = np.cumsum(var_sizes) - var_sizes
+
             for irank in range(self.comm.size):
-                start = np.sum(u_sizes[:irank, ivar])
-                end = start + u_sizes[irank, ivar]
+                start = var_starts[irank]
+                end = start + var_sizes[irank]
                 on_irank = np.logical_and(start <= arg_idxs, arg_idxs < end)
 
                 # Compute conversion to new ordering
@@ -1442,10 +1885,7 @@ class Group(System):
                 # so we subtract off the start of the var in the current rank
                 # in order to make the overall offset relative to the
                 # beginning of the full distributed variable.
-                offset = -start
-
-                offset += np.sum(u_sizes[:irank, :])
-                offset += np.sum(u_sizes[irank, :ivar])
+                offset = u_offsets[irank, ivar] - start
 
                 # Apply conversion only to relevant parts of input
                 new_indices[on_irank] = arg_idxs[on_irank] + offset
@@ -1456,15 +1896,136 @@ class Group(System):
             u_rank = self._owning_ranks[uname] if fwd else iproc
             p_rank = self._owning_ranks[pname] if rev else iproc
 
-            offset = np.sum(u_sizes[:u_rank]) + np.sum(u_sizes[u_rank, :ivar])
-            src_idxs = arg_idxs + offset
+            src_idxs = arg_idxs + u_offsets[u_rank, ivar]
 
-        tgt_start = (np.sum(p_sizes[:p_rank]) +
-                     np.sum(p_sizes[p_rank, :p_var_idxs[pname]]))
+        tgt_start = p_offsets[p_rank, p_var_idxs[pname]]
         tgt_idxs = tgt_start + self.params.make_idx_array(0, len(arg_idxs))
 
         return src_idxs, tgt_idxs
 
+    def _get_xfer_dict(self, my_params, relevant, vec_unames, unknown_sizes,
+                       vec_pnames, param_sizes, skip_aliased=False):
+        """
+        Collects the source and target indices of the connections that
+        this `Group` is responsible for, for each subsystem and direction.
+
+        Args
+        ----
+        my_params : set
+            Set of pathnames for parameters that the `Group` is
+            responsible for propagating.
+
+        relevant : set
+            Top promoted names of the variables relevant to the current
+            variable of interest.
+
+        vec_unames : dict
+            Map of relevant unknowns to their index into unknown_sizes.
+
+        unknown_sizes : ndarray
+            Sizes of the relevant unknowns in each process.
+
+        vec_pnames : dict
+            Map of relevant params to their index into param_sizes.
+
+        param_sizes : ndarray
+            Sizes of the relevant params in each process.
+
+        skip_aliased : bool, optional
+            If True, leave out the params that are views of their source.
+
+        Returns
+        -------
+        OrderedDict
+            Lists of source indices, target indices, vector connections and
+            pass_by_obj connections, keyed on (subsystem name, mode).
+        """
+        to_prom_name = self._sysdata.to_prom_name
+        iproc = 0 if self.comm is None else self.comm.rank
+        uacc = self.unknowns._dat
+        pacc = self.params._dat
+
+        # offset of every var in the global vectors, so the indices of a
+        # connection don't need a sum over all of the vars before it
+        u_offsets = offsets_from_sizes(unknown_sizes)
+        p_offsets = offsets_from_sizes(param_sizes)
+
+        fwd = 0
+        rev = 1
+        modename = ['fwd', 'rev']
+        xfer_dict = OrderedDict()
+
+        # columns of (source offset, target offset, size) for the
+        # connections without src_indices, keyed like xfer_dict. Their
+        # indices are built in bulk once all connections are known.
+        ranges = OrderedDict()
+
+        for param in self.connections:
+            if param not in my_params:
+                continue
+
+            unknown, idxs = self.connections[param]
+            if self._unknowns_dict[unknown]['top_promoted_name'] not in relevant:
+                continue
+
+            if self._params_dict[param]['top_promoted_name'] not in relevant:
+                continue
+
+            urelname = to_prom_name[unknown]
+            prelname = name_relative_to(self.pathname, param)
+
+            u = uacc[urelname]
+            p = pacc[prelname]
+            if skip_aliased and p.aliased:
+                continue
+
+            simple = 'src_indices' not in u.meta and 'src_indices' not in p.meta
+
+            # remove our system pathname from the abs pathname of the param
+            # and get the subsystem name from that
+
+            tgt_sys = nearest_child(self.pathname, param)
+            src_sys = nearest_child(self.pathname, unknown)
+            for sname, mode in ((tgt_sys, fwd), (src_sys, rev)):
+                src_idx_list, dest_idx_list, vec_conns, byobj_conns = \
+                    xfer_dict.setdefault((sname, mode), ([], [], [], []))
+
+                if 'pass_by_obj' in u.meta and u.meta['pass_by_obj']:
+                    # rev is for derivs only, so no by_obj passing needed
+                    if mode == fwd:
+                        byobj_conns.append((prelname, urelname))
+                    continue
+
+                vec_conns.append((prelname, urelname))
+
+                if not simple:
+                    sidxs, didxs = self._get_global_idxs(urelname, prelname,
+                                                         vec_unames, unknown_sizes,
+                                                         vec_pnames, param_sizes,
+                                                         modename[mode],
+                                                         u_offsets, p_offsets)
+                    src_idx_list.append(sidxs)
+                    dest_idx_list.append(didxs)
+
+                # remote vars have nothing to transfer
+                elif not (p.remote if mode == fwd else u.remote):
+                    u_rank = self._owning_ranks[urelname] if mode == fwd else iproc
+                    p_rank = self._owning_ranks[prelname] if mode == rev else iproc
+
+                    u_starts, p_starts, sizes = \
+                        ranges.setdefault((sname, mode), ([], [], []))
+                    u_starts.append(u_offsets[u_rank, vec_unames[urelname]])
+                    p_starts.append(p_offsets[p_rank, vec_pnames[prelname]])
+                    sizes.append(p.meta['size'])
+
+        idx_type = self._impl.idx_arr_type
+        for key, (u_starts, p_starts, sizes) in iteritems(ranges):
+            src_idx_list, dest_idx_list = xfer_dict[key][:2]
+            src_idx_list.append(idx_ranges(u_starts, sizes, idx_type))
+            dest_idx_list.append(idx_ranges(p_starts, sizes, idx_type))
+
+        return xfer_dict
+
     def _setup_data_transfer(self, my_params, var_of_interest, alloc_derivs):
         """
         Create `DataTransfer` objects to handle data transfer for all of the
@@ -1486,7 +2047,6 @@ class Group(System):
         """
 
         relevant = self._probdata.relevance.relevant.get(var_of_interest, ())
-        to_prom_name = self._sysdata.to_prom_name
         uacc = self.unknowns._dat
         pacc = self.params._dat
 
@@ -1524,46 +2084,34 @@ class Group(System):
 
         fwd = 0
         rev = 1
-        modename = ['fwd', 'rev']
-        xfer_dict = OrderedDict()
 
-        for param in self.connections:
-            if param not in my_params:
-                continue
-
-            unknown, idxs = self.connections[param]
-            if self._unknowns_dict[unknown]['top_promoted_name'] not in relevant:
-                continue
-
-            if self._params_dict[param]['top_promoted_name'] not in relevant:
-                continue
-
-            urelname = to_prom_name[unknown]
-            prelname = name_relative_to(self.pathname, param)
-
-            umeta = self.unknowns.metadata(urelname)
-
-            # remove our system pathname from the abs pathname of the param
-            # and get the subsystem name from that
-
-            tgt_sys = nearest_child(self.pathname, param)
-            src_sys = nearest_child(self.pathname, unknown)
-            for sname, mode in ((tgt_sys, fwd), (src_sys, rev)):
-                src_idx_list, dest_idx_list, vec_conns, byobj_conns = \
-                    xfer_dict.setdefault((sname, mode), ([], [], [], []))
+        # the transfers only depend on which of our variables are relevant,
+        # so variables of interest that agree on that can share them.
+        share = var_of_interest is not None and not MPI
+        if share:
+            rel_byobjs = [n for n, acc in chain(iteritems(uacc), iteritems(pacc))
+                          if acc.pbo and acc.meta['top_promoted_name'] in relevant]
+            rel_key = (frozenset(vec_unames), frozenset(vec_pnames),
+                       frozenset(rel_byobjs))
+            self._voi_rel_keys[var_of_interest] = rel_key
+            if rel_key in self._voi_xfers:
+                xfers, users = self._voi_xfers[rel_key]
+                users.add(var_of_interest)
+                for (tgt_sys, mode), x in iteritems(xfers):
+                    self._data_xfer[(tgt_sys, mode, var_of_interest)] = x
+                return
 
-                if 'pass_by_obj' in umeta and umeta['pass_by_obj']:
-                    # rev is for derivs only, so no by_obj passing needed
-                    if mode == fwd:
-                        byobj_conns.append((prelname, urelname))
-                else:  # pass by vector
-                    sidxs, didxs = self._get_global_idxs(urelname, prelname,
-                                                         vec_unames, unknown_sizes,
-                                                         vec_pnames, param_sizes,
-                                                         modename[mode])
-                    vec_conns.append((prelname, urelname))
-                    src_idx_list.append(sidxs)
-                    dest_idx_list.append(didxs)
+        # the indices only depend on the structure of the model, so they
+        # can come from a previous setup
+        cache = self._probdata.setup_cache
+        if cache is not None and cache.hit:
+            xfer_dict = cache.xfers[(self.pathname, var_of_interest)]
+        else:
+            xfer_dict = self._get_xfer_dict(my_params, relevant, vec_unames,
+                                            unknown_sizes, vec_pnames,
+                                            param_sizes)
+            if cache is not None:
+                cache.xfers[(self.pathname, var_of_interest)] = xfer_dict
 
         if alloc_derivs:
             uvec = self.dumat[var_of_interest]
@@ -1572,11 +2120,64 @@ class Group(System):
             uvec = self.unknowns
             pvec = self.params
 
+        self._create_data_xfers(xfer_dict, uvec, pvec, (fwd, rev),
+                                var_of_interest, self._data_xfer)
+
+        if share:
+            xfers = OrderedDict(((tgt_sys, mode), x) for (tgt_sys, mode, voi), x
+                                in iteritems(self._data_xfer)
+                                if voi == var_of_interest)
+            self._voi_xfers[rel_key] = (xfers, set([var_of_interest]))
+
+        if var_of_interest is None and self._nl_p_size_lists is not None:
+            # the nonlinear vectors skip the aliased params entirely
+            vec_pnames = {}
+            for i, (n, sz) in enumerate(self._nl_p_size_lists[0]):
+                vec_pnames[n] = i
+            param_sizes = np.array([[sz for n, sz in lst]
+                                    for lst in self._nl_p_size_lists],
+                                   dtype=self._impl.idx_arr_type)
+
+            xfer_dict = self._get_xfer_dict(my_params, relevant, vec_unames,
+                                            unknown_sizes, vec_pnames,
+                                            param_sizes, skip_aliased=True)
+            self._create_data_xfers(xfer_dict, self.unknowns, self.params,
+                                    (fwd,), None, self._nl_data_xfer)
+
+    def _create_data_xfers(self, xfer_dict, uvec, pvec, modes,
+                           var_of_interest, data_xfer):
+        """
+        Create the `DataTransfer` objects for the given indices.
+
+        Args
+        ----
+        xfer_dict : OrderedDict
+            Lists of source indices, target indices, vector connections and
+            pass_by_obj connections, keyed on (subsystem name, mode).
+
+        uvec : `VecWrapper`
+            Source vector of the transfers.
+
+        pvec : `VecWrapper`
+            Target vector of the transfers.
+
+        modes : tuple of int
+            Directions to create transfers for, 0 for 'fwd' and 1 for 'rev'.
+
+        var_of_interest : str or None
+            The name of a variable of interest.
+
+        data_xfer : OrderedDict
+            Where the transfers are stored, keyed on (subsystem name, mode,
+            var_of_interest).
+        """
+        modename = ['fwd', 'rev']
+
         # create a DataTransfer object that combines all of the
         # individual subsystem src_idxs, tgt_idxs, and byobj_conns, so that a 'full'
         # scatter to all subsystems can be done at the same time.  Store that DataTransfer
         # object under the name ''.
-        for mode in (fwd, rev):
+        for mode in modes:
             start = 0
             full_srcs = []
             full_tgts = []
@@ -1592,13 +2193,13 @@ class Group(System):
 
                     if flats or byobjs:
                         # create a 'partial' scatter to each subsystem
-                        self._data_xfer[(tgt_sys, modename[mode], var_of_interest)] = \
+                        data_xfer[(tgt_sys, modename[mode], var_of_interest)] = \
                             self._impl.create_data_xfer(uvec, pvec,
                                                         srcs, tgts, flats, byobjs,
                                                         modename[mode], self._sysdata)
 
             # add a full scatter for the current direction
-            self._data_xfer[('', modename[mode], var_of_interest)] = \
+            data_xfer[('', modename[mode], var_of_interest)] = \
                 self._impl.create_data_xfer(uvec, pvec,
                                             full_srcs, full_tgts,
                                             full_flats, full_byobjs,
@@ -1626,7 +2227,10 @@ class Group(System):
             Specifies the variable of interest to determine relevance.
 
         """
-        x = self._data_xfer.get((target_sys, mode, var_of_interest))
+        if self._nl_p_size_lists is not None and not deriv:
+            x = self._nl_data_xfer.get((target_sys, mode, var_of_interest))
+        else:
+            x = self._data_xfer.get((target_sys, mode, var_of_interest))
         if x is not None:
             if deriv:
                 x.transfer(self.dumat[var_of_interest], self.dpmat[var_of_interest],
@@ -45,6 +45,15 @@ class ParallelGroup(Group):
         in check_partial_derivatives"
     deriv_options['linearize'] : bool(False)
         Set to True if you want linearize to be called even though you are using FD.
+    deriv_options['coloring'] : bool(False)
+        Set to True to finite difference structurally orthogonal columns
+        together. The sparsity comes from declare_partials when available,
+        and is otherwise probed by the first full finite difference.
+    deriv_options['num_fd_procs'] : int(1)
+        Number of processes that finite difference the columns of the
+        jacobian in parallel when not running under MPI. The extra
+        processes are workers forked from the Problem, which keeps them
+        for later finite differences.
     """
 
     def apply_nonlinear(self, params, unknowns, resids, metadata=None):
@@ -76,13 +85,19 @@ class ParallelGroup(Group):
                 sub.apply_nonlinear(sub.params, sub.unknowns, sub.resids,
                                     metadata)
 
-    def children_solve_nonlinear(self, metadata):
+    def children_solve_nonlinear(self, metadata, skip_clean=False):
         """Loops over our children systems and asks them to solve."""
 
+        if (MPI and self.comm.size > 1) or self._probdata.in_complex_step:
+            skip_clean = False
+
         # full scatter
         self._transfer_data()
 
         for sub in self._local_subsystems:
+            if skip_clean and self._is_clean(sub):
+                continue
+
             with sub._dircontext:
                 if isinstance(sub, Component):
                     sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids)
@@ -90,6 +105,9 @@ class ParallelGroup(Group):
                     sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids,
                                         metadata)
 
+            if skip_clean:
+                self._save_clean(sub)
+
     def get_req_procs(self):
         """
         Returns
@@ -355,10 +355,15 @@ class PetscDataTransfer(object):
         src_idxs = src_vec.merge_idxs(src_idxs)
         tgt_idxs = tgt_vec.merge_idxs(tgt_idxs)
 
+        self.vec_conns = vec_conns
         self.byobj_conns = byobj_conns
         self.comm = comm = src_vec.comm
         self.sysdata = sysdata
 
+        # unit conversions of our local targets, collected on the first
+        # transfer
+        self._unit_conv = None
+
         uvec = src_vec.petsc_vec
         pvec = tgt_vec.petsc_vec
         name = src_vec._sysdata.pathname
@@ -376,7 +381,6 @@ class PetscDataTransfer(object):
             if trace:  # pragma: no cover
                 self.src_idxs = src_idxs
                 self.tgt_idxs = tgt_idxs
-                self.vec_conns = vec_conns
                 arrow = '-->' if mode == 'fwd' else '<--'
                 debug("'%s': new %s scatter (sizes: %d, %d)\n   %s %s %s %s %s %s" %
                       (name, mode, len(src_idx_set.indices), len(tgt_idx_set.indices),
@@ -413,10 +417,21 @@ class PetscDataTransfer(object):
             If True, this is a derivative data transfer, so no pass_by_obj
             variables will be transferred.
         """
+        conv = self._unit_conv
+        if conv is None:
+            if self.vec_conns:
+                conv = tgtvec._get_unit_conv(t for t, s in self.vec_conns)
+            else:
+                conv = ()
+            self._unit_conv = conv
+
         if mode == 'rev':
             # in reverse mode, srcvec and tgtvec are switched. Note, we only
             # run in reverse for derivatives, and derivatives accumulate from
             # all targets. This does not involve pass_by_object.
+            if conv:
+                tgtvec._apply_unit_derivatives(conv)
+
             if trace:  # pragma: no cover
                 conns = ['%s <-- %s' % (u, v) for v, u in self.vec_conns]
                 debug("%s rev scatter %s  %s <-- %s" %
@@ -440,6 +455,12 @@ class PetscDataTransfer(object):
                 self.scatter.scatter(srcvec.imag_petsc_vec, tgtvec.imag_petsc_vec,
                                      False, False)
 
+            if conv:
+                if deriv:
+                    tgtvec._apply_unit_derivatives(conv)
+                else:
+                    tgtvec._apply_unit_conv(conv)
+
             if trace:  # pragma: no cover
                 debug("%s:    tgtvec = %s (DONE)" % (tgtvec._sysdata.pathname,
                                                      tgtvec.petsc_vec.array))
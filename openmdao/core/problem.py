@@ -25,6 +25,7 @@ from openmdao.core._checks import check_connections, _both_names
 from openmdao.core.driver import Driver
 from openmdao.core.mpi_wrap import MPI, under_mpirun, debug
 from openmdao.core.relevance import Relevance
+from openmdao.core.setup_cache import SetupCache
 
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.solvers.scipy_gmres import ScipyGMRES
@@ -32,6 +33,7 @@ from openmdao.solvers.ln_direct import DirectSolver
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
 
 from openmdao.units.units import get_conversion_tuple
+from openmdao.util.array_util import color_columns
 from openmdao.util.string_util import get_common_ancestor, nearest_child, name_relative_to
 from openmdao.util.graph import plain_bfs, OrderedDigraph
 from openmdao.util.options import OptionsDictionary
@@ -50,6 +52,10 @@ class _ProbData(object):
         self.in_complex_step = False
         self.precon_level = 0
         self.pathname = ''
+        self.setup_cache = None
+        self.aliased_params = ()
+        self.voi_vecs = OrderedDict()  # allocated vois, least recent first
+        self.problem = None  # the Problem, for systems that need its workers
 
 def _get_root_var(root, name):
     """
@@ -69,6 +75,24 @@ def _get_root_var(root, name):
         except KeyError:
             raise KeyError("Variable '%s' not found." % name)
 
+def _get_root_var_meta(root, name):
+    """
+    Get the metadata of a variable given its top level promoted name.
+    """
+    if name in root.unknowns:
+        return root.unknowns._dat[name].meta
+    elif name in root.params:
+        return root.params._dat[name].meta
+    elif name in root._sysdata.to_abs_pnames:
+        p = root._sysdata.to_abs_pnames[name][0]
+        return root._rec_get_param_meta(p)
+    else:
+        try:
+            p = root._probdata.dangling[name][0]
+            return root._rec_get_param_meta(p)
+        except KeyError:
+            raise KeyError("Variable '%s' not found." % name)
+
 def _set_root_var(root, name, val):
     """
     Set the value of a variable given its top level promoted name.
@@ -140,6 +164,7 @@ class Problem(object):
 
         self.pathname = ''
         self._parent_dir = None
+        self._worker_pool = None
 
         # Default numpy error behavior: we want to raise whenever we can, except for
         # underflow.
@@ -436,7 +461,8 @@ class Problem(object):
 
         return ubcs, tgts
 
-    def setup(self, check=True, out_stream=sys.stdout):
+    def setup(self, check=True, out_stream=sys.stdout, setup_cache=None,
+              alias_params=False, exec_plan=False):
         """Performs all setup of vector storage, data transfer, etc.,
         necessary to perform calculations.
 
@@ -448,7 +474,34 @@ class Problem(object):
 
         out_stream : a file-like object, optional
             Stream where report will be written if check is performed.
+
+        setup_cache : str, optional
+            Name of a file where the connections, relevance, execution order
+            and data transfer indices are cached. If the file was written
+            for a model with the same structure, that state is reused
+            instead of recomputed. Otherwise it is written at the end of
+            setup. Under MPI, each rank uses its own file.
+
+        alias_params : bool, optional
+            If True, params that are the only target of their source and
+            need no src_indices or unit conversion are views into the
+            unknowns vector instead of copies, so they are never transferred.
+            Setting such a param raises an error. Not supported under MPI.
+
+        exec_plan : bool, optional
+            If True, each Group flattens the recursion over its subsystems
+            in solve_nonlinear and apply_linear into a list of operations
+            that is built here and executed directly. Subgroups are only
+            flattened into the nonlinear plan if their solver is a RunOnce
+            without recorders. Not supported under MPI.
         """
+        if alias_params and MPI:
+            raise ValueError("alias_params is not supported under MPI.")
+        if exec_plan and MPI:
+            raise ValueError("exec_plan is not supported under MPI.")
+
+        # workers have a copy of the old model, so they can't be reused
+        self.close_worker_pool()
 
         # Recursively call pre_setup on all subsystems
         for s in self.root.subsystems(recurse=True, include_self=True):
@@ -461,6 +514,7 @@ class Problem(object):
         tree_changed = False
 
         self._probdata = _ProbData()
+        self._probdata.problem = self
 
         if isinstance(self.root.ln_solver, LinearGaussSeidel):
             self._probdata.top_lin_gs = True
@@ -491,11 +545,27 @@ class Problem(object):
         self._probdata.unknowns_dict = unknowns_dict
         self._probdata.to_prom_name = self.root._sysdata.to_prom_name
 
+        pois = self.driver.desvars_of_interest()
+        oois = self.driver.outputs_of_interest()
+
+        # reuse the structural state of a previous setup of the same model
+        cache = None
+        if setup_cache is not None:
+            cache = SetupCache(setup_cache, self.comm)
+            cache.load(cache.structural_hash(self, params_dict, unknowns_dict,
+                                             pois, oois))
+        self._probdata.setup_cache = cache
+
         # collect all connections, both implicit and explicit from
         # anywhere in the tree, and put them in a dict where each key
         # is an absolute param name that maps to the absolute name of
         # a single source.
-        connections = self._setup_connections(params_dict, unknowns_dict)
+        if cache is not None and cache.hit:
+            connections = cache.connections
+            self._dangling = cache.dangling
+            self._input_inputs = cache.input_inputs
+        else:
+            connections = self._setup_connections(params_dict, unknowns_dict)
         self._probdata.connections = connections
         self._probdata.dangling = self._dangling
 
@@ -539,7 +609,9 @@ class Problem(object):
 
         # if the system tree has changed, we have to redo the entire setup
         if tree_changed:
-            return self.setup(check=check, out_stream=out_stream)
+            return self.setup(check=check, out_stream=out_stream,
+                              setup_cache=setup_cache,
+                              alias_params=alias_params, exec_plan=exec_plan)
 
         # perform additional checks on connections
         # (e.g. for compatible types and shapes)
@@ -573,9 +645,6 @@ class Problem(object):
         # to the parameters that system must transfer data to
         param_owners = _assign_parameters(connections)
 
-        pois = self.driver.desvars_of_interest()
-        oois = self.driver.outputs_of_interest()
-
         self._driver_vois = set()
         for tup in chain(pois, oois):
             self._driver_vois.update(tup)
@@ -603,14 +672,22 @@ class Problem(object):
 
         mode = self._check_for_parallel_derivs(pois, oois, parallel_u, parallel_p)
 
-        self._probdata.relevance = Relevance(self.root, params_dict,
-                                             unknowns_dict, connections,
-                                             pois, oois, mode)
+        if cache is not None and cache.hit:
+            self._probdata.relevance = cache.get_relevance(self.root,
+                                                           params_dict,
+                                                           unknowns_dict)
+        else:
+            self._probdata.relevance = Relevance(self.root, params_dict,
+                                                 unknowns_dict, connections,
+                                                 pois, oois, mode)
 
         # perform auto ordering
         for s in self.root.subgroups(recurse=True, include_self=True):
             # set auto order if order not already set
             if not s._order_set:
+                if cache is not None and cache.hit:
+                    s.set_order(cache.orders[s.pathname])
+                    continue
                 order = None
                 broken_edges = None
                 if self.comm.rank == 0:
@@ -622,6 +699,8 @@ class Problem(object):
                     if trace:
                         debug("problem setup order bcast DONE")
                 s.set_order(order)
+                if cache is not None:
+                    cache.orders[s.pathname] = order
 
         # Mark every comp that is executed out-of-order so that we
         # rerun them during apply_nonlinear (explicit comps)
@@ -640,6 +719,11 @@ class Problem(object):
         for sub in self.root.subgroups(recurse=True, include_self=True):
             alloc_derivs = alloc_derivs or sub.nl_solver.supports['uses_derivatives']
 
+        if alias_params:
+            self._probdata.aliased_params = _get_aliased_params(connections,
+                                                                params_dict,
+                                                                unknowns_dict)
+
         # create VecWrappers for all systems in the tree.
         self.root._setup_vectors(param_owners, impl=self._impl, alloc_derivs=alloc_derivs)
 
@@ -659,6 +743,10 @@ class Problem(object):
         # Prep for case recording and record metadata
         self._start_recorders()
 
+        if exec_plan:
+            for sub in self.root.subgroups(recurse=True, include_self=True):
+                sub._setup_exec_plan()
+
         if self._setup_errors:
             stream = cStringIO()
             stream.write("\nThe following errors occurred during setup:\n")
@@ -666,6 +754,10 @@ class Problem(object):
                 stream.write("%s\n" % err)
             raise RuntimeError(stream.getvalue())
 
+        if cache is not None and not cache.hit:
+            cache.save(self)
+        self._probdata.setup_cache = None
+
         # Lock any restricted options in the options dictionaries.
         OptionsDictionary.locked = True
 
@@ -681,9 +773,45 @@ class Problem(object):
 
     def cleanup(self):
         """ Clean up resources prior to exit. """
+        self.close_worker_pool()
         self.driver.cleanup()
         self.root.cleanup()
 
+    def get_worker_pool(self, num_workers):
+        """
+        Returns a `WorkerPool` of processes that each hold a copy of this
+        `Problem`. The pool is kept running and reused by later calls with
+        the same number of workers, until `setup`, `cleanup` or
+        `close_worker_pool` is called. The values of the variables in the
+        workers are synced with this process whenever the pool is returned.
+
+        Args
+        ----
+        num_workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        `WorkerPool`
+        """
+        from openmdao.core.worker_pool import WorkerPool
+
+        pool = self._worker_pool
+        if pool is not None and pool.owned() and pool.num_workers == num_workers:
+            pool.sync()
+            return pool
+
+        self.close_worker_pool()
+        pool = self._worker_pool = WorkerPool(self, num_workers)
+        pool.start()
+        return pool
+
+    def close_worker_pool(self):
+        """ Stop the worker processes started by `get_worker_pool`, if any."""
+        if self._worker_pool is not None:
+            self._worker_pool.stop()
+            self._worker_pool = None
+
     def _check_solvers(self):
         """ Search over all solvers and raise errors for unsupported
         configurations. These include:
@@ -1237,7 +1365,8 @@ class Problem(object):
 
     def calc_gradient(self, indep_list, unknown_list, mode='auto',
                       return_format='array', dv_scale=None, cn_scale=None,
-                      sparsity=None, use_check=False, inactives=None):
+                      sparsity=None, use_check=False, inactives=None,
+                      coloring=None):
         """ Returns the gradient for the system that is specified in
         self.root. This function is used by the optimizer but also can be
         used for testing derivatives on your model.
@@ -1281,6 +1410,11 @@ class Problem(object):
             skipped for these in adjoine mode. Key is the constraint name, and
             value is the indices that are inactive.
 
+        coloring : dict, optional
+            Total derivative coloring from `compute_total_coloring`. When it
+            matches the requested derivatives, each linear solve covers all
+            the columns (or rows in 'rev' mode) of one color.
+
         Returns
         -------
         ndarray or dict
@@ -1307,7 +1441,88 @@ class Problem(object):
                                                      dv_scale=dv_scale,
                                                      cn_scale=cn_scale,
                                                      sparsity=sparsity,
-                                                     inactives=inactives)
+                                                     inactives=inactives,
+                                                     coloring=coloring)
+
+    def compute_total_coloring(self, indep_list, unknown_list, mode='auto',
+                               num_points=2):
+        """ Computes the sparsity of the total derivative jacobian and
+        colors its columns (fwd) or rows (rev) so that structurally
+        orthogonal ones can share a single linear solve. The sparsity is
+        the union of the nonzeros of full gradient calculations at the
+        current point and at randomly perturbed values of the independent
+        variables, so entries that happen to be zero at one point aren't
+        treated as always zero. The model is returned to its current state
+        afterwards.
+
+        Args
+        ----
+        indep_list : iter of strings
+            Iterator of independent variable names that derivatives are to
+            be calculated with respect to.
+
+        unknown_list : iter of strings
+            Iterator of output or state names that derivatives are to
+            be calculated for.
+
+        mode : string, optional
+            Deriviative direction, can be 'fwd', 'rev', or 'auto'.
+
+        num_points : int, optional
+            Number of points the gradient is calculated at, including the
+            current one.
+
+        Returns
+        -------
+        dict
+            Coloring to pass to `calc_gradient`. The 'rows' and 'cols' entries
+            hold the nonzeros of the total jacobian in 'array' format, and
+            'colors' holds the column (or row) indices of each color.
+        """
+        mode = self._mode(mode, indep_list, unknown_list)
+        root = self.root
+
+        J = np.abs(self.calc_gradient(indep_list, unknown_list, mode=mode,
+                                      return_format='array'))
+
+        if num_points > 1:
+            saved = [vec.vec.copy() for vec in (root.unknowns, root.params,
+                                                root.resids)]
+            indeps = [(name, np.array(self[name], dtype=float))
+                      for name in indep_list]
+            rng = np.random.RandomState(0)
+            try:
+                for i in range(num_points - 1):
+                    for name, val in indeps:
+                        new = val + (np.abs(val) + 1.0) * \
+                              rng.uniform(1e-4, 1e-3, val.shape)
+                        self[name] = new if new.shape else float(new)
+                    with root._dircontext:
+                        root.solve_nonlinear()
+                    J += np.abs(self.calc_gradient(indep_list, unknown_list,
+                                                   mode=mode,
+                                                   return_format='array'))
+            finally:
+                for vec, val in zip((root.unknowns, root.params, root.resids),
+                                    saved):
+                    vec.vec[:] = val
+
+        rows, cols = np.nonzero(J)
+
+        coloring = OrderedDict()
+        coloring['mode'] = mode
+        coloring['indep_list'] = list(indep_list)
+        coloring['unknown_list'] = list(unknown_list)
+        coloring['shape'] = J.shape
+        coloring['rows'] = rows
+        coloring['cols'] = cols
+
+        if mode == 'fwd':
+            coloring['colors'] = color_columns(rows, cols, J.shape)
+        else:
+            coloring['colors'] = color_columns(cols, rows, J.shape[::-1])
+
+        return coloring
 
     def _calc_gradient_fd(self, indep_list, unknown_list, return_format,
                           dv_scale=None, cn_scale=None, sparsity=None,
@@ -1481,7 +1696,7 @@ class Problem(object):
 
     def _calc_gradient_ln_solver(self, indep_list, unknown_list, return_format, mode,
                                  dv_scale=None, cn_scale=None, sparsity=None,
-                                 inactives=None):
+                                 inactives=None, coloring=None):
         """ Returns the gradient for the system that is specified in
         self.root. The gradient is calculated using root.ln_solver.
 
@@ -1519,6 +1734,9 @@ class Problem(object):
             skipped for these in adjoine mode. Key is the constraint name, and
             value is the indices that are inactive.
 
+        coloring : dict, optional
+            Total derivative coloring from `compute_total_coloring`.
+
         Returns
         -------
         ndarray or dict
@@ -1642,6 +1860,42 @@ class Problem(object):
                     # Put them in serial groups
                     voi_sets.append((item,))
 
+        # Combined seeds only work when every solve uses the same vector.
+        if coloring is not None and nproc == 1 and coloring['mode'] == mode and \
+           all(isinstance(name, string_types)
+               for name in chain(indep_list, unknown_list)) and \
+           coloring['indep_list'] == list(indep_list) and \
+           coloring['unknown_list'] == list(unknown_list) and \
+           all(self._get_voi_key(voi, params) is None
+               for params in voi_sets for voi in params):
+
+            Jcolor, slices = self._calc_gradient_colored(coloring, indep_list,
+                                                         unknown_list, mode,
+                                                         inactives)
+
+            for item in unknown_list:
+                for param in indep_list:
+                    if return_format == 'dict' and sparsity is not None and \
+                       param not in sparsity[item]:
+                        continue
+
+                    block = Jcolor[slices[item], slices[param]]
+
+                    # Driver scaling
+                    if param in dv_scale:
+                        block *= np.reshape(dv_scale[param], (1, -1))
+                    if item in cn_scale:
+                        block *= np.reshape(cn_scale[item], (-1, 1))
+
+                    if return_format == 'dict':
+                        J[item][param] = block
+
+            if return_format == 'array':
+                J = Jcolor
+
+            root.clear_dparams()
+            return J
+
         voi_srcs = {}
 
         # If Forward mode, solve linear system for each param
@@ -1650,6 +1904,9 @@ class Problem(object):
             rhs = OrderedDict()
             voi_idxs = {}
 
+            self._alloc_voi_vecs([self._get_voi_key(voi, params)
+                                  for voi in params])
+
             old_size = None
 
             # Allocate all of our Right Hand Sides for this parallel set.
@@ -1679,6 +1936,20 @@ class Problem(object):
                                        " in the group %s, %d != %d" % (params, old_size, len(in_idxs)))
                 voi_idxs[vkey] = in_idxs
 
+            # Solvers that take a block of right-hand sides solve for every
+            # index of a lone variable of interest at once.
+            dx_block = None
+            if len(params) == 1 and nproc == 1 and \
+               root.ln_solver.supports['multiple_rhs']:
+                block = np.zeros((len(duvec.vec), len(in_idxs)))
+                cols = np.arange(len(in_idxs))
+                if inactives and not fwd and voi in inactives:
+                    cols = np.array([i for i in cols if i not in inactives[voi]],
+                                    dtype=int)
+                block[voi_idxs[vkey][cols], cols] = -1.0
+                rhs[vkey] = block
+                dx_block = root.ln_solver.solve(rhs, root, mode)[vkey]
+
             # at this point, we know that for all vars in the current
             # group of interest, the number of indices is the same. We loop
             # over the *size* of the indices and use the loop index to look
@@ -1696,6 +1967,10 @@ class Problem(object):
                         vkey = self._get_voi_key(voi, params)
                         dx_mat[vkey] = np.zeros((len(duvec.vec), ))
 
+                elif dx_block is not None:
+                    dx_mat = OrderedDict()
+                    dx_mat[vkey] = dx_block[:, i]
+
                 else:
                     for voi in params:
                         vkey = self._get_voi_key(voi, params)
@@ -1798,6 +2073,137 @@ class Problem(object):
 
         return J
 
+    def _calc_gradient_colored(self, coloring, indep_list, unknown_list, mode,
+                               inactives=None):
+        """ Calculates the total jacobian with one linear solve per color.
+        In rev mode, the rows of inactive constraints are left out of the
+        seeds and are zero, and colors with only inactive rows are skipped.
+
+        Returns
+        -------
+        ndarray
+            Jacobian in 'array' format.
+
+        dict
+            Slice of the rows (unknowns) or columns (params) of each variable.
+        """
+        root = self.root
+        duvec = root.dumat[None]
+        fwd = mode == 'fwd'
+
+        # Positions of the jacobian rows and columns in the vector.
+        slices = OrderedDict()
+        maps = []
+        for names, idx_dict in ((unknown_list, self._qoi_indices),
+                                (indep_list, self._poi_indices)):
+            start = 0
+            idxs = []
+            for name in names:
+                var_idxs = duvec._get_local_idxs(name, idx_dict)
+                slices[name] = slice(start, start + len(var_idxs))
+                start += len(var_idxs)
+                idxs.append(var_idxs)
+            maps.append(np.concatenate(idxs) if idxs else np.zeros(0, dtype=int))
+
+        row_map, col_map = maps
+        seed_map, sol_map = (col_map, row_map) if fwd else (row_map, col_map)
+
+        # Nonzeros of each color, found once and kept with the coloring.
+        if 'color_nz' not in coloring:
+            rows, cols = coloring['rows'], coloring['cols']
+            seeds = cols if fwd else rows
+            color_of = np.empty(coloring['shape'][1 if fwd else 0], dtype=int)
+            for i, color in enumerate(coloring['colors']):
+                color_of[color] = i
+            nz_color = color_of[seeds]
+            coloring['color_nz'] = [np.nonzero(nz_color == i)[0]
+                                    for i in range(len(coloring['colors']))]
+
+        J = np.zeros(coloring['shape'])
+        rhs = OrderedDict()
+        colors = coloring['colors']
+        color_nz = coloring['color_nz']
+
+        if inactives and not fwd:
+            active = np.ones(coloring['shape'][0], dtype=bool)
+            for name, idxs in iteritems(inactives):
+                if name in slices:
+                    active[np.asarray(idxs, dtype=int) + slices[name].start] = False
+            colors = [color[active[color]] for color in colors]
+            color_nz = [nz[active[coloring['rows'][nz]]] for nz in color_nz]
+            keep = [i for i, color in enumerate(colors) if len(color) > 0]
+            colors = [colors[i] for i in keep]
+            color_nz = [color_nz[i] for i in keep]
+
+        # Solvers that take a block of right-hand sides do all colors at once.
+        if root.ln_solver.supports['multiple_rhs']:
+            rhs[None] = np.zeros((len(duvec.vec), len(colors)))
+            for i, color in enumerate(colors):
+                rhs[None][seed_map[color], i] = -1.0
+            dx_block = root.ln_solver.solve(rhs, root, mode)[None]
+        else:
+            rhs[None] = np.zeros(len(duvec.vec))
+
+        for i, (color, nz) in enumerate(zip(colors, color_nz)):
+            if root.ln_solver.supports['multiple_rhs']:
+                dx = dx_block[:, i]
+            else:
+                rhs[None][:] = 0.0
+
+                # Note, we solve a slightly modified version of the unified
+                # derivatives equations in OpenMDAO.
+                # (dR/du) * (du/dr) = -I
+                rhs[None][seed_map[color]] = -1.0
+
+                dx = root.ln_solver.solve(rhs, root, mode)[None]
+
+            nz_rows = coloring['rows'][nz]
+            nz_cols = coloring['cols'][nz]
+            if fwd:
+                J[nz_rows, nz_cols] = dx[sol_map[nz_rows]]
+            else:
+                J[nz_rows, nz_cols] = dx[sol_map[nz_cols]]
+
+        return J, slices
+
+    def _alloc_voi_vecs(self, vois):
+        """
+        Make sure the derivative vectors and data transfers for the given
+        variables of interest exist. If the 'voi_cache_size' option of the
+        top LinearGaussSeidel solver is set, the least recently used ones
+        are freed to stay within it.
+
+        Args
+        ----
+        vois : list of str or None
+            Keys of the variables of interest about to be solved for.
+        """
+        probdata = self._probdata
+        if not probdata.top_lin_gs or MPI:
+            return
+
+        root = self.root
+        lru = probdata.voi_vecs
+        vois = [voi for voi in vois if voi is not None]
+        if not vois:
+            return
+
+        for voi in vois:
+            lru.pop(voi, None)
+
+        limit = root.ln_solver.options['voi_cache_size']
+        nfree = len(lru) + len(vois) - limit
+        if limit > 0 and nfree > 0:
+            old = list(lru)[:nfree]
+            root._remove_voi_vecs(old)
+            for voi in old:
+                del lru[voi]
+
+        root._setup_voi_vecs(vois)
+
+        for voi in vois:
+            lru[voi] = True
+
     def _get_voi_key(self, voi, grp):
         """Return the voi name, which allows for parallel derivative calculations
         (currently only works with LinearGaussSeidel), or None for those
@@ -2048,7 +2454,6 @@ class Problem(object):
                             comp.apply_linear(params, unknowns, dparams,
                                               dunknowns, dresids, 'rev')
                         finally:
-                            dparams._apply_unit_derivatives()
                             dunknowns._scale_derivatives()
 
                         for p_name in param_list:
@@ -2070,7 +2475,6 @@ class Problem(object):
                         dunknowns.vec[:] = 0.0
 
                         dinputs._dat[p_name].val[idx] = 1.0
-                        dparams._apply_unit_derivatives()
                         dunknowns._scale_derivatives()
                         comp.apply_linear(params, unknowns, dparams,
                                           dunknowns, dresids, 'fwd')
@@ -2470,6 +2874,28 @@ def _assign_parameters(connections):
     return param_owners
 
 
+def _get_aliased_params(connections, params_dict, unknowns_dict):
+    """
+    Return the set of params that can be views into the storage of their
+    source: those that are the only target of a source in another component,
+    connected without src_indices or unit conversion and passed by vector.
+    """
+    ntargets = {}
+    for src, idxs in itervalues(connections):
+        ntargets[src] = ntargets.get(src, 0) + 1
+
+    aliased = set()
+    for tgt, (src, idxs) in iteritems(connections):
+        tmeta = params_dict[tgt]
+        smeta = unknowns_dict[src]
+        if ntargets[src] == 1 and idxs is None and \
+                'unit_conv' not in tmeta and 'src_indices' not in smeta and \
+                not tmeta.get('pass_by_obj') and not smeta.get('pass_by_obj') and \
+                tgt.rsplit('.', 1)[0] != src.rsplit('.', 1)[0]:
+            aliased.add(tgt)
+
+    return aliased
+
 def _pad_name(name, pad_num=13, quotes=True):
     """ Pads a string so that they all line up when stacked."""
     l_name = len(name)
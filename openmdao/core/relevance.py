@@ -3,9 +3,11 @@
 from __future__ import print_function
 
 from collections import OrderedDict
+from itertools import chain
 import json
 from six import string_types, itervalues, iteritems
 
+import numpy as np
 import networkx as nx
 from openmdao.util.graph import OrderedDigraph
 
@@ -42,12 +44,6 @@ class Relevance(object):
         self._sgraph = self._setup_sys_graph(group, connections)
         self._compute_relevant_vars(group, connections)
 
-        # when voi is None, everything is relevant
-        self.relevant[None] = set(m['top_promoted_name']
-                                    for m in itervalues(unknowns_dict))
-        self.relevant[None].update(m['top_promoted_name']
-                                    for m in itervalues(params_dict))
-
         if mode == 'fwd':
             self.groups = param_groups
         else:
@@ -77,9 +73,10 @@ class Relevance(object):
         bool: True if varname is in the relevant path of var_of_interest
         """
         try:
-            return varname in self.relevant[var_of_interest]
+            rel = self.relevant[var_of_interest]
         except KeyError:
             return True
+        return varname in rel
 
     def vars_of_interest(self, mode=None):
         """ Determines our list of var_of_interest depending on mode.
@@ -153,6 +150,11 @@ class Relevance(object):
         Calculate the relevant variables and relevant systems for the
         current variables of interest.
 
+        Reachability is computed once over the DAG of strongly connected
+        components of the system graph, as packed bitsets, and the relevant
+        variables and systems of each variable of interest are stored as
+        bitsets over fixed orderings of all variables and systems.
+
         Args
         ----
         group : Group
@@ -162,71 +164,187 @@ class Relevance(object):
             Dict of targets mapped to (src, idxs)
 
         """
-
-        relevant = {}
-        succs = {}
-
         sgraph = self._sgraph      # system graph
 
         to_prom_name = group._sysdata.to_prom_name
         to_abs_uname = group._sysdata.to_abs_uname
 
-        for nodes in self.inputs:
-            for node in nodes:
-                relevant[node] = set()
-                pnode = to_abs_uname[node]
-                comp = pnode.rsplit('.', 1)[0]
-                succs[node] = []
-                if comp in sgraph:
-                    succs[node].append(comp)
-                    succs[node].extend(v for u,v in nx.dfs_edges(sgraph, comp))
-
-        grev = sgraph.reverse()
-        for nodes in self.outputs:
-            for node in nodes:
-                unode = to_abs_uname[node]
-                comp = unode.rsplit('.', 1)[0]
-                relevant[node] = set()
-                if comp in sgraph:
-                    preds = set((comp,))
-                    preds.update(v for u, v in nx.dfs_edges(grev, comp))
-                    for inps in self.inputs:
-                        for inp in inps:
-                            common = preds.intersection(succs[inp])
-                            relevant[node].update(common)
-                            relevant[inp].update(common)
-
-        # at this point, relevant contains the relevent *systems*, so now
+        sys_names = list(sgraph.nodes())
+        sys_idx = dict((n, i) for i, n in enumerate(sys_names))
+        nsys = len(sys_names)
+
+        # reachability between strongly connected components. Row c of
+        # desc (anc) has the bits of all components reachable from
+        # (reaching) component c, including c itself.
+        cgraph = nx.condensation(sgraph)
+        mapping = cgraph.graph['mapping']
+        sys_scc = np.array([mapping[n] for n in sys_names], dtype=int)
+        nscc = cgraph.number_of_nodes()
+
+        desc = np.zeros((nscc, (nscc + 7) // 8), dtype=np.uint8)
+        arange = np.arange(nscc)
+        desc[arange, arange >> 3] = 128 >> (arange & 7)
+        anc = desc.copy()
+
+        order = list(nx.topological_sort(cgraph))
+        for c in reversed(order):
+            for succ in cgraph.successors(c):
+                desc[c] |= desc[succ]
+        for c in order:
+            for pred in cgraph.predecessors(c):
+                anc[c] |= anc[pred]
+
+        def sys_bits(rows, voi):
+            """ Unpacks the reachable systems of the voi's component."""
+            comp = to_abs_uname[voi].rsplit('.', 1)[0]
+            if comp not in sys_idx:
+                return None
+            scc_bits = np.unpackbits(rows[mapping[comp]])[:nscc].astype(bool)
+            return scc_bits[sys_scc]
+
+        succs = dict((n, sys_bits(desc, n)) for nodes in self.inputs
+                                             for n in nodes)
+        preds = dict((n, sys_bits(anc, n)) for nodes in self.outputs
+                                            for n in nodes)
+
+        all_succs = np.zeros(nsys, dtype=bool)
+        for bits in itervalues(succs):
+            if bits is not None:
+                all_succs |= bits
+
+        all_preds = np.zeros(nsys, dtype=bool)
+        for bits in itervalues(preds):
+            if bits is not None:
+                all_preds |= bits
+
+        # a system is relevant to an input if it is downstream of the input
+        # and upstream of any output, and vice versa
+        relsys = OrderedDict()
+        for name, bits in iteritems(succs):
+            relsys[name] = np.zeros(nsys, dtype=bool) if bits is None \
+                                                     else bits & all_preds
+        for name, bits in iteritems(preds):
+            if bits is not None:
+                bits = bits & all_succs
+                if name in relsys:
+                    bits |= relsys[name]
+                relsys[name] = bits
+            elif name not in relsys:
+                relsys[name] = np.zeros(nsys, dtype=bool)
+
+        # at this point, relsys contains the relevant *systems*, so now
         # we have to determine the relevant variables based on those systems
         # and our connections
-        relvars = {}
-        rcomps = [to_abs_uname[n].rsplit('.', 1)[0] for n in relevant]
+        var_names = []
+        var_idx = {}
+        for meta in chain(itervalues(self.unknowns_dict),
+                          itervalues(self.params_dict), ({'top_promoted_name': n}
+                                                         for n in relsys)):
+            name = meta['top_promoted_name']
+            if name not in var_idx:
+                var_idx[name] = len(var_names)
+                var_names.append(name)
+        nvars = len(var_names)
+
+        ntgts = len(connections)
+        conn_vars = np.empty((2, ntgts), dtype=int)
+        conn_comps = np.empty((2, ntgts), dtype=int)
+        for i, (tgt, (src, idxs)) in enumerate(iteritems(connections)):
+            conn_vars[0, i] = var_idx[to_prom_name[tgt]]
+            conn_vars[1, i] = var_idx[to_prom_name[src]]
+            conn_comps[0, i] = sys_idx[tgt.rsplit('.', 1)[0]]
+            conn_comps[1, i] = sys_idx[src.rsplit('.', 1)[0]]
 
         # make sure we don't miss any other VOIs that are relevant but are not
         # part of a connection
-        for name, relcomps in iteritems(relevant):
-            relvars[name] = set()
-            for i, n in enumerate(relevant):
-                if rcomps[i] in relcomps:
-                    relvars[name].add(n)
-
-        for tgt, (src, idxs) in iteritems(connections):
-            prom_tgt = to_prom_name[tgt]
-            prom_src = to_prom_name[src]
-            tcomp = tgt.rsplit('.', 1)[0]
-            scomp = src.rsplit('.', 1)[0]
-            for n, relcomps in iteritems(relevant):
-                if tcomp in relcomps and scomp in relcomps:
-                    relvars[n].update((prom_tgt, prom_src))
-
-        # finally, add ancestors of relevant systems to the relevant set
-        for voi, relsystems in iteritems(relevant):
-            to_add = set()
-            for system in relsystems:
-                parts = system.split('.')[:-1]
-                for i in range(0, len(parts)):
-                    to_add.add('.'.join(parts[:i+1]))
-            relsystems.update(to_add)
-
-        self._relevant_systems = relevant
+        voi_vars = np.array([var_idx[n] for n in relsys], dtype=int)
+        voi_comps = np.array([sys_idx.get(to_abs_uname[n].rsplit('.', 1)[0], -1)
+                              for n in relsys], dtype=int)
+        voi_in_graph = voi_comps >= 0
+        voi_vars = voi_vars[voi_in_graph]
+        voi_comps = voi_comps[voi_in_graph]
+
+        # parent of each system, for adding ancestors of relevant systems
+        sys_parent = np.array([sys_idx.get(n.rsplit('.', 1)[0], -1)
+                               if '.' in n else -1 for n in sys_names],
+                              dtype=int)
+        depth = max([n.count('.') for n in sys_names] or [0])
+
+        relvars = {}
+        relsystems = {}
+        for name, bits in iteritems(relsys):
+            vbits = np.zeros(nvars, dtype=bool)
+            vbits[voi_vars[bits[voi_comps]]] = True
+            both = bits[conn_comps[0]] & bits[conn_comps[1]]
+            vbits[conn_vars[:, both].ravel()] = True
+            relvars[name] = _RelevantSet(vbits, var_idx, var_names)
+
+            # finally, add ancestors of relevant systems to the relevant set
+            for i in range(depth):
+                parents = sys_parent[bits]
+                bits[parents[parents >= 0]] = True
+            relsystems[name] = _RelevantSet(bits, sys_idx, sys_names)
+
+        # when voi is None, everything is relevant
+        relvars[None] = _RelevantSet(np.ones(nvars, dtype=bool), var_idx,
+                                     var_names)
+
+        self._relevant_systems = relsystems
         self.relevant = relvars
+
+
+class _RelevantSet(object):
+    """
+    A read-only set of names, stored as a packed bitset over a fixed
+    ordering of all of the names.
+
+    Args
+    ----
+    bits : ndarray of bool
+        True for each name in the set.
+
+    index : dict
+        Mapping of each name to its position in the ordering. Shared
+        between all sets over the same names.
+
+    names : list of str
+        All of the names, in order.
+    """
+
+    __slots__ = ['_bits', '_index', '_names']
+
+    def __init__(self, bits, index, names):
+        self._bits = np.packbits(bits)
+        self._index = index
+        self._names = names
+
+    def __contains__(self, name):
+        i = self._index.get(name)
+        if i is None:
+            return False
+        return bool(self._bits[i >> 3] & (128 >> (i & 7)))
+
+    def __iter__(self):
+        names = self._names
+        for i in np.flatnonzero(np.unpackbits(self._bits)[:len(names)]):
+            yield names[i]
+
+    def __len__(self):
+        return int(np.unpackbits(self._bits)[:len(self._names)].sum())
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, list(self))
+
+    def intersection(self, other):
+        """
+        Args
+        ----
+        other : iter of str
+            Names to intersect with.
+
+        Returns
+        -------
+        set
+            The names in other that are also in this set.
+        """
+        return set(n for n in other if n in self)
@@ -0,0 +1,222 @@
+""" Cache of the structural state computed in Problem.setup, so that repeated
+runs of an unchanged model can skip recomputing it."""
+
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+
+from six import iteritems
+
+import numpy as np
+
+import openmdao
+from openmdao.core.group import Group
+from openmdao.core.relevance import Relevance
+
+# Bump this whenever the contents of the cache change.
+CACHE_VERSION = 1
+
+# Variable metadata that affects the structural state.
+_STRUCTURAL_META = ('pathname', 'promoted_name', 'shape', 'size',
+                    'pass_by_obj', 'state', 'src_indices', 'units', 'remote')
+
+
+def _plain(obj):
+    """ Returns the object with ndarrays replaced by their full contents, so
+    that its repr can be hashed."""
+    if isinstance(obj, np.ndarray):
+        return (obj.dtype.str, obj.shape, obj.tobytes())
+    elif isinstance(obj, (list, tuple)):
+        return [_plain(item) for item in obj]
+    return obj
+
+
+def _replace_file(src, dst):
+    """ Renames src to dst, replacing dst if it exists. os.rename can't
+    replace an existing file on Windows, and python 2 has no os.replace."""
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if sys.platform == 'win32' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+class SetupCache(object):
+    """
+    Stores the connections, relevance, execution order and data transfer
+    indices computed by `Problem.setup` in a file, together with a hash of
+    the structure of the model that they were computed for. When the hash
+    of a later setup matches, the stored state is reused. Under MPI, each
+    rank keeps its own file with the rank appended to the filename.
+
+    Args
+    ----
+    filename : str
+        Name of the cache file.
+
+    comm : an MPI communicator (real or fake)
+        Communicator of the `Problem`.
+    """
+
+    def __init__(self, filename, comm):
+        if comm.size > 1:
+            filename = '%s.%d' % (filename, comm.rank)
+
+        self.filename = filename
+        self.comm = comm
+        self.key = None
+        self.hit = False
+
+        self.connections = None
+        self.dangling = None
+        self.input_inputs = None
+        self.relevance = None
+        self.orders = {}
+        self.xfers = {}
+
+    def structural_hash(self, problem, params_dict, unknowns_dict, pois, oois):
+        """
+        Computes a hash of everything the cached state depends on: the
+        system tree, the structural variable metadata, the connections
+        stated in each group, the variables of interest and the layout of
+        the processes.
+
+        Args
+        ----
+        problem : `Problem`
+            The `Problem` being set up.
+
+        params_dict : OrderedDict
+            A dict of parameter metadata for the whole `Problem`.
+
+        unknowns_dict : OrderedDict
+            A dict of unknowns metadata for the whole `Problem`.
+
+        pois : list of tuples of str
+            Design variables of interest.
+
+        oois : list of tuples of str
+            Objectives and constraints of interest.
+
+        Returns
+        -------
+        str
+            Hex digest of the hash.
+        """
+        root = problem.root
+        parts = [CACHE_VERSION, openmdao.__version__, problem._impl.__name__,
+                 self.comm.size, self.comm.rank]
+
+        for sub in root.subsystems(recurse=True, include_self=True):
+            parts.append((sub.pathname, type(sub).__module__,
+                          type(sub).__name__))
+            if isinstance(sub, Group):
+                parts.append((sub._order_set, sub.list_order()))
+                for tgt, srcs in sorted(iteritems(sub._src)):
+                    parts.append((tgt, _plain(srcs)))
+
+        ln_solver = root.ln_solver
+        parts.append((type(ln_solver).__name__, ln_solver.options.get('mode')))
+
+        for vdict in (params_dict, unknowns_dict):
+            for meta in vdict.values():
+                parts.append([_plain(meta.get(name))
+                              for name in _STRUCTURAL_META])
+
+        parts.append((pois, oois))
+
+        sha = hashlib.sha1(repr(parts).encode('utf-8'))
+        return sha.hexdigest()
+
+    def load(self, key):
+        """
+        Loads the cache file if it exists and was written for the given
+        structural hash. The result is agreed on by all processes, so that
+        they either all reuse their state or all recompute it.
+
+        Args
+        ----
+        key : str
+            Structural hash of the model being set up.
+
+        Returns
+        -------
+        bool
+            True if the cached state can be used.
+        """
+        self.key = key
+        data = None
+
+        try:
+            with open(self.filename, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            # Missing, truncated or incompatible files are just a miss.
+            pass
+
+        hit = isinstance(data, dict) and data.get('key') == key
+        if self.comm.size > 1:
+            hit = all(self.comm.allgather(hit))
+
+        if hit:
+            self.connections = data['connections']
+            self.dangling = data['dangling']
+            self.input_inputs = data['input_inputs']
+            self.relevance = data['relevance']
+            self.orders = data['orders']
+            self.xfers = data['xfers']
+
+        self.hit = hit
+        return hit
+
+    def get_relevance(self, group, params_dict, unknowns_dict):
+        """
+        Returns
+        -------
+        `Relevance`
+            The cached `Relevance`, rebound to the current metadata.
+        """
+        rel = Relevance.__new__(Relevance)
+        rel.__dict__.update(self.relevance)
+        rel.params_dict = params_dict
+        rel.unknowns_dict = unknowns_dict
+        rel._sysdata = group._sysdata
+        return rel
+
+    def save(self, problem):
+        """
+        Writes the state computed during setup of the given `Problem`. The
+        file is replaced atomically, so concurrent processes never read a
+        partial file.
+
+        Args
+        ----
+        problem : `Problem`
+            The `Problem` that was just set up.
+        """
+        relevance = problem._probdata.relevance.__dict__.copy()
+        for name in ('params_dict', 'unknowns_dict', '_sysdata'):
+            del relevance[name]
+
+        data = {
+            'key': self.key,
+            'connections': problem._probdata.connections,
+            'dangling': problem._dangling,
+            'input_inputs': problem._input_inputs,
+            'relevance': relevance,
+            'orders': self.orders,
+            'xfers': self.xfers,
+        }
+
+        dirname = os.path.dirname(os.path.abspath(self.filename))
+        fd, tmpname = tempfile.mkstemp(dir=dirname)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            _replace_file(tmpname, self.filename)
+        except Exception:
+            os.remove(tmpname)
+            raise
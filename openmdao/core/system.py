@@ -17,6 +17,7 @@ import numpy as np
 from openmdao.core.mpi_wrap import MPI
 from openmdao.core.vec_wrapper import VecWrapper, _PlaceholderVecWrapper
 from openmdao.units.units import get_conversion_tuple
+from openmdao.util.array_util import color_columns
 from openmdao.util.file_util import DirContext
 from openmdao.util.options import OptionsDictionary, DeprecatedOptionsDictionary
 from openmdao.util.string_util import name_relative_to
@@ -176,6 +177,17 @@ class System(object):
         opt.add_option('linearize', False,
                        desc='Set to True if you want linearize to be called '
                        'even though you are using FD.')
+        opt.add_option('coloring', False,
+                       desc='Set to True to finite difference structurally '
+                       'orthogonal columns together. The sparsity comes from '
+                       'declare_partials when available, and is otherwise '
+                       'probed by the first full finite difference.')
+        opt.add_option('num_fd_procs', 1, lower=1,
+                       desc='Number of processes that finite difference the '
+                       'columns of the jacobian in parallel when not running '
+                       'under MPI. The extra processes are workers forked '
+                       'from the Problem, which keeps them for later finite '
+                       'differences.')
 
         # This will give deprecation warnings, but will convert the old to
         # new options.
@@ -187,12 +199,24 @@ class System(object):
         self._par_fd_id = 0 # for ParallelFDGroup, this will be >= 0 and
                             # <= the number of parallel FDs
 
+        # (keys, SharedSlotBuffer) that the columns are written to when
+        # finite differencing in a process pool
+        self._fd_pool_buf = None
+
+        # True while probing the sparsity at a perturbed point for coloring
+        self._fd_probing = False
+
 
         # This gets set to True when linearize is called. Solvers can set
         # this to false and then monitor it so they know when, for example,
         # to regenerate a Jacobian.
         self._jacobian_changed = False
 
+        # Counts the calls to linearize, for solvers that keep their own
+        # assembled copy of the Jacobian next to another solver that resets
+        # _jacobian_changed.
+        self._linearize_count = 0
+
         # Used to prevent us from multiplying outscope terms on the jacobian
         self.rel_inputs = None
 
@@ -212,6 +236,9 @@ class System(object):
         self._local_subsystems = []
         self._fd_params = None
 
+        # column colorings for finite difference, keyed on the fd variables
+        self._fd_colorings = {}
+
     def _promoted(self, name):
         """Determine if the given variable name is being promoted from this
         `System`.
@@ -557,8 +584,6 @@ class System(object):
         if fd_unknowns is None:
             fd_unknowns = self._get_fd_unknowns()
 
-        abs_pnames = self._sysdata.to_abs_pnames
-
         # Use settings in the system dict unless variables override.
         if use_check:
             step_size = self.deriv_options.get('check_step_size', 1.0e-6)
@@ -597,6 +622,61 @@ class System(object):
 
         cache1 = resultvec.vec.copy()
 
+        # Perturb structurally orthogonal columns together if we know the
+        # sparsity. Otherwise, the full finite difference below probes it.
+        color_key = None
+        if self.deriv_options['coloring'] and not use_check and \
+           not self._fd_probing and \
+           self._num_par_fds == 1 and not (MPI and self.comm.size > 1) and \
+           not (poi_indices or qoi_indices or pass_unknowns):
+            fd_inputs = [self._get_fd_input(p_name, params, unknowns, states,
+                                            step_size, form, step_calc, def_type)
+                         for p_name in chain(fd_params, states)]
+
+            if all(np.size(info[0]._dat[info[1]].val) > 0 for info in fd_inputs) and \
+               all(resultvec._dat[u_name].slice is not None for u_name in fd_unknowns):
+                color_key = (total_derivs, tuple(fd_params), tuple(fd_unknowns),
+                             tuple(states), tuple(info[5:] for info in fd_inputs))
+
+                if color_key not in self._fd_colorings:
+                    sparsity = self._get_fd_sparsity(fd_unknowns, fd_params,
+                                                     states, total_derivs)
+                    if sparsity is not None:
+                        self._fd_colorings[color_key] = \
+                            self._get_fd_coloring(sparsity, fd_inputs)
+
+                if color_key in self._fd_colorings:
+                    return self._fd_jacobian_colored(params, unknowns, resids,
+                                                     run_model, resultvec, cache1,
+                                                     fd_unknowns,
+                                                     list(chain(fd_params, states)),
+                                                     fd_inputs,
+                                                     self._fd_colorings[color_key])
+
+        # Split the columns between this process and a pool of workers.
+        if self.deriv_options['num_fd_procs'] > 1 and self._num_par_fds == 1 \
+           and not MPI and self._probdata.problem is not None:
+            jac = self._fd_jacobian_pool(params, unknowns, resids, resultvec,
+                                         cache1, dict(total_derivs=total_derivs,
+                                                      fd_params=fd_params,
+                                                      fd_unknowns=fd_unknowns,
+                                                      fd_states=fd_states,
+                                                      pass_unknowns=pass_unknowns,
+                                                      poi_indices=poi_indices,
+                                                      qoi_indices=qoi_indices,
+                                                      use_check=use_check,
+                                                      option_overrides=option_overrides))
+            if color_key is not None:
+                self._store_fd_coloring(jac, color_key, params, unknowns,
+                                        resids, run_model, resultvec,
+                                        list(chain(fd_params, states)),
+                                        fd_inputs, total_derivs=total_derivs,
+                                        fd_params=fd_params,
+                                        fd_unknowns=fd_unknowns,
+                                        fd_states=fd_states,
+                                        option_overrides=option_overrides)
+            return jac
+
         gather_jac = False
 
         fd_count = -1
@@ -606,49 +686,18 @@ class System(object):
         # column data keyed by (uname, pname, col_id).
         fd_cols = {}
 
-        to_prom_name = self._sysdata.to_prom_name
+        # columns computed here, for each param, when in a process pool
+        own_cols = OrderedDict()
 
         # Compute gradient for this param or state.
         for p_name in chain(fd_params, states):
 
-            # If our input is connected to a IndepVarComp, then we need to twiddle
-            # the unknowns vector instead of the params vector.
-            src = self.connections.get(p_name)
-            if src is not None:
-                param_src = src[0]  # just the name
-
-                # Have to convert to promoted name to key into unknowns
-                if param_src not in self.unknowns:
-                    param_src = to_prom_name[param_src]
-
-                inputs = unknowns
-                param_key = param_src
-            else:
-                # Cases where the IndepVarComp is somewhere above us.
-                if p_name in states:
-                    inputs = unknowns
-                else:
-                    inputs = params
-
-                param_key = p_name
-                param_src = None
+            inputs, param_key, param_src, fdstep, fdtype, fdform, cs = \
+                self._get_fd_input(p_name, params, unknowns, states, step_size,
+                                   form, step_calc, def_type)
 
             target_input = inputs._dat[param_key].val
 
-            mydict = {}
-            # since p_name is a promoted name, it could refer to multiple
-            # params.  We've checked earlier to make sure that step_size,
-            # step_calc, type, and form are not defined differently for each
-            # matching param.  If they differ, a warning has already been issued.
-            if p_name in abs_pnames:
-                mydict = self._params_dict[abs_pnames[p_name][0]]
-
-            # Local settings for this var trump all
-            fdstep = mydict.get('step_size', step_size)
-            fdtype = mydict.get('step_calc', step_calc)
-            fdform = mydict.get('form', form)
-            cs = mydict.get('type', def_type)
-
             # Size our Inputs
             if poi_indices and param_src in poi_indices:
                 p_idxs = poi_indices[param_src]
@@ -708,11 +757,14 @@ class System(object):
 
                     elif fdform == 'forward':
 
+                        # restore the exact value so later columns don't
+                        # pick up round-off from this one
+                        orig = target_input[idx]
                         target_input[idx] += step
 
                         run_model(params, unknowns, resids)
 
-                        target_input[idx] -= step
+                        target_input[idx] = orig
 
                         # delta resid is delta unknown
                         resultvec.vec[:] -= cache1
@@ -721,11 +773,12 @@ class System(object):
 
                     elif fdform == 'backward':
 
+                        orig = target_input[idx]
                         target_input[idx] -= step
 
                         run_model(params, unknowns, resids)
 
-                        target_input[idx] += step
+                        target_input[idx] = orig
 
                         # delta resid is delta unknown
                         resultvec.vec[:] -= cache1
@@ -734,12 +787,13 @@ class System(object):
 
                     elif fdform == 'central':
 
+                        orig = target_input[idx]
                         target_input[idx] += step
 
                         run_model(params, unknowns, resids)
                         cache2 = resultvec.vec.copy()
 
-                        target_input[idx] -= step
+                        target_input[idx] = orig
                         resultvec.vec[:] = cache1
 
                         target_input[idx] -= step
@@ -751,7 +805,7 @@ class System(object):
                         resultvec.vec[:] *= (-0.5/step)
                         # Note: vector division is slower than vector mult.
 
-                        target_input[idx] += step
+                        target_input[idx] = orig
 
                     for u_name in fd_unknowns:
                         if qoi_indices and u_name in qoi_indices:
@@ -763,23 +817,23 @@ class System(object):
                             fd_cols[(u_name, p_name, col)] = \
                                                    jac[u_name, p_name][:, col]
 
-                    # When an unknown is a parameter, it isn't calculated, so
-                    # we manually fill in identity by placing a 1 wherever it
-                    # is needed.
-                    for u_name in pass_unknowns:
-                        if u_name == param_src:
-                            if qoi_indices and u_name in qoi_indices:
-                                q_idxs = qoi_indices[u_name]
-                                if idx in q_idxs:
-                                    row = qoi_indices[u_name].index(idx)
-                                    jac[u_name, p_name][row][col] = 1.0
-                            else:
-                                jac[u_name, p_name] = np.array([[1.0]])
+                    self._fill_pass_unknowns(jac, pass_unknowns, qoi_indices,
+                                             p_name, param_src, col, idx)
+
+                    if self._fd_pool_buf is not None:
+                        own_cols.setdefault(p_name, []).append(col)
 
                     # Restore old residual
                     resultvec.vec[:] = cache1
 
-        if self._num_par_fds > 1:
+        if self._fd_pool_buf is not None:
+            # write our columns where the parent process will pick them up
+            keys, buf = self._fd_pool_buf
+            for (u_name, p_name), view in zip(keys, buf.read(0)):
+                if p_name in own_cols and u_name not in pass_unknowns:
+                    cols = own_cols[p_name]
+                    view[:, cols] = jac[u_name, p_name][:, cols]
+        elif self._num_par_fds > 1:
             if trace:  # pragma: no cover
                 debug("%s: allgathering parallel FD columns" % self.pathname)
             jacinfos = self._full_comm.allgather(fd_cols)
@@ -794,6 +848,404 @@ class System(object):
         elif MPI and gather_jac:
             jac = self.get_combined_jac(jac)
 
+        # Keep the probed sparsity for the next finite difference.
+        if color_key is not None:
+            self._store_fd_coloring(jac, color_key, params, unknowns, resids,
+                                    run_model, resultvec,
+                                    list(chain(fd_params, states)), fd_inputs,
+                                    total_derivs=total_derivs,
+                                    fd_params=fd_params, fd_unknowns=fd_unknowns,
+                                    fd_states=fd_states,
+                                    option_overrides=option_overrides)
+
+        return jac
+
+    def _fill_pass_unknowns(self, jac, pass_unknowns, qoi_indices, p_name,
+                            param_src, col, idx):
+        """ When an unknown is a parameter, it isn't calculated, so we
+        manually fill in identity by placing a 1 wherever it is needed."""
+        for u_name in pass_unknowns:
+            if u_name == param_src:
+                if qoi_indices and u_name in qoi_indices:
+                    q_idxs = qoi_indices[u_name]
+                    if idx in q_idxs:
+                        row = qoi_indices[u_name].index(idx)
+                        jac[u_name, p_name][row][col] = 1.0
+                else:
+                    jac[u_name, p_name] = np.array([[1.0]])
+
+    def _store_fd_coloring(self, jac, color_key, params, unknowns, resids,
+                           run_model, resultvec, p_names, fd_inputs, **fd_args):
+        """ Colors the columns using the nonzeros of a full finite difference
+        jacobian, and keeps the coloring for the next finite difference.
+
+        A derivative can happen to be zero at the current point, e.g., dy/dx
+        of y = x*z when z is zero, so the nonzeros of a second finite
+        difference at a randomly perturbed point are added to the ones of
+        `jac`. `fd_args` are the keyword args of `fd_jacobian` for it."""
+        # params can be views into other vectors, so go variable by variable
+        def flat_vals(vecs):
+            return [acc.val for vec in vecs for acc in itervalues(vec._dat)
+                    if not (acc.pbo or acc.aliased or acc.remote)]
+
+        inputs = flat_vals((params, unknowns))
+        vals = inputs + flat_vals((resids,))
+        saved = [val.copy() for val in vals]
+
+        # Perturb every input and output of the system away from zero, by a
+        # small random relative amount, and run the model there.
+        rng = np.random.RandomState(0)
+        for val in inputs:
+            val += (np.abs(val) + 1.0) * rng.uniform(1e-4, 1e-3, val.shape)
+
+        self._fd_probing = True
+        try:
+            run_model(params, unknowns, resids)
+            probe = self.fd_jacobian(params, unknowns, resids, **fd_args)
+        finally:
+            self._fd_probing = False
+            for val, orig in zip(vals, saved):
+                val[...] = orig
+
+        rows, cols = [], []
+        r_start = 0
+        for u_name in fd_args['fd_unknowns']:
+            c_start = 0
+            for p_name in p_names:
+                J = jac[u_name, p_name]
+                nzrows, nzcols = np.nonzero((J != 0.0) |
+                                            (probe[u_name, p_name] != 0.0))
+                rows.append(nzrows + r_start)
+                cols.append(nzcols + c_start)
+                c_start += J.shape[1]
+            r_start += resultvec._dat[u_name].val.size
+
+        sparsity = (np.concatenate(rows), np.concatenate(cols)) if rows \
+                   else (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+        self._fd_colorings[color_key] = self._get_fd_coloring(sparsity,
+                                                              fd_inputs)
+
+    def _fd_jacobian_pool(self, params, unknowns, resids, resultvec, cache1,
+                          fd_args):
+        """ Finite difference in this process and the workers of the
+        Problem's `WorkerPool`, which hold copies of this system. Columns are
+        dealt out to the processes the same way as for `ParallelFDGroup`, and
+        each process writes its columns into a buffer in shared memory that
+        the jacobian is assembled from. `fd_args` are the keyword args of
+        `fd_jacobian`, with the fd variables already filled in.
+
+        Returns
+        -------
+        dict
+            Dictionary whose keys are tuples of the form ('unknown', 'param')
+            and whose values are ndarrays containing the derivative for that
+            tuple pair.
+        """
+        from openmdao.util.shared_buffer import SharedSlotBuffer
+
+        if fd_args['total_derivs']:
+            states = ()
+        elif fd_args['fd_states'] is not None:
+            states = fd_args['fd_states']
+        else:
+            states = self.states
+        poi_indices = fd_args['poi_indices']
+        qoi_indices = fd_args['qoi_indices']
+
+        # shape of each subjacobian
+        keys, shapes = [], []
+        p_idxs = OrderedDict()
+        for p_name in chain(fd_args['fd_params'], states):
+            inputs, param_key, param_src = self._get_fd_input(p_name, params,
+                                                              unknowns, states,
+                                                              0., '', '', '')[:3]
+            if poi_indices and param_src in poi_indices:
+                p_idxs[p_name] = param_src, poi_indices[param_src]
+            else:
+                p_idxs[p_name] = param_src, \
+                                 range(np.size(inputs._dat[param_key].val))
+            p_size = len(p_idxs[p_name][1])
+
+            for u_name in chain(fd_args['fd_unknowns'], fd_args['pass_unknowns']):
+                if qoi_indices and u_name in qoi_indices:
+                    u_size = len(qoi_indices[u_name])
+                else:
+                    u_size = np.size(unknowns[u_name])
+                keys.append((u_name, p_name))
+                shapes.append((u_size, p_size))
+
+        problem = self._probdata.problem
+        path = name_relative_to(problem.root.pathname, self.pathname)
+        num_procs = self.deriv_options['num_fd_procs']
+        pool = problem.get_worker_pool(num_procs - 1)
+        buf = SharedSlotBuffer(shapes, 1)
+
+        try:
+            for worker in range(pool.num_workers):
+                pool.submit(worker, _fd_pool_task, path, worker + 1, num_procs,
+                            cache1, keys, buf, fd_args)
+
+            # do our share while the workers do theirs
+            try:
+                self._fd_share(params, unknowns, resids, 0, num_procs, keys,
+                               buf, fd_args)
+            finally:
+                errors = [pool.receive()[2] for i in range(pool.num_workers)]
+
+            errors = [err for err in errors if err]
+            if errors:
+                raise RuntimeError("Finite difference failed in a worker "
+                                   "process:\n%s" % errors[0])
+
+            resultvec.vec[:] = cache1
+            jac = dict((key, view.copy())
+                       for key, view in zip(keys, buf.read(0)))
+        finally:
+            buf.close()
+
+        pass_unknowns = fd_args['pass_unknowns']
+        if pass_unknowns:
+            for p_name, (param_src, idxs) in iteritems(p_idxs):
+                for col, idx in enumerate(idxs):
+                    self._fill_pass_unknowns(jac, pass_unknowns, qoi_indices,
+                                             p_name, param_src, col, idx)
+
+        return jac
+
+    def _fd_share(self, params, unknowns, resids, fd_id, num_fds, keys, buf,
+                  fd_args):
+        """ Finite difference every `num_fds`th column, starting at column
+        `fd_id`, and write them to the subjacobians `keys` in `buf`."""
+        saved = self._num_par_fds, self._par_fd_id
+        self._num_par_fds, self._par_fd_id = num_fds, fd_id
+        self._fd_pool_buf = (keys, buf)
+        try:
+            self.fd_jacobian(params, unknowns, resids, **fd_args)
+        finally:
+            self._num_par_fds, self._par_fd_id = saved
+            self._fd_pool_buf = None
+
+    def _get_fd_input(self, p_name, params, unknowns, states, step_size, form,
+                      step_calc, def_type):
+        """ Returns the vector and key that are perturbed when finite
+        differencing with respect to `p_name`, along with its local step
+        settings.
+
+        Returns
+        -------
+        tuple
+            (inputs, param_key, param_src, fdstep, fdtype, fdform, cs)
+        """
+        # If our input is connected to a IndepVarComp, then we need to twiddle
+        # the unknowns vector instead of the params vector.
+        src = self.connections.get(p_name)
+        if src is not None:
+            param_src = src[0]  # just the name
+
+            # Have to convert to promoted name to key into unknowns
+            if param_src not in self.unknowns:
+                param_src = self._sysdata.to_prom_name[param_src]
+
+            inputs = unknowns
+            param_key = param_src
+        else:
+            # Cases where the IndepVarComp is somewhere above us.
+            if p_name in states:
+                inputs = unknowns
+            else:
+                inputs = params
+
+            param_key = p_name
+            param_src = None
+
+        mydict = {}
+        # since p_name is a promoted name, it could refer to multiple
+        # params.  We've checked earlier to make sure that step_size,
+        # step_calc, type, and form are not defined differently for each
+        # matching param.  If they differ, a warning has already been issued.
+        abs_pnames = self._sysdata.to_abs_pnames
+        if p_name in abs_pnames:
+            mydict = self._params_dict[abs_pnames[p_name][0]]
+
+        # Local settings for this var trump all
+        fdstep = mydict.get('step_size', step_size)
+        fdtype = mydict.get('step_calc', step_calc)
+        fdform = mydict.get('form', form)
+        cs = mydict.get('type', def_type)
+
+        return inputs, param_key, param_src, fdstep, fdtype, fdform, cs
+
+    def _get_fd_sparsity(self, fd_unknowns, fd_params, states, total_derivs):
+        """ Returns the known sparsity of the finite difference jacobian as
+        a tuple of (rows, cols), with rows ordered by `fd_unknowns` and
+        columns by `fd_params` followed by `states`, or None if it has to be
+        probed. Systems that know their structure can override this."""
+        return None
+
+    def _get_fd_coloring(self, sparsity, fd_inputs):
+        """ Colors the columns of the finite difference jacobian. Columns
+        are only grouped with columns of inputs that use the same
+        difference form and type.
+
+        Args
+        ----
+        sparsity : tuple of ndarray
+            Row and column index of each nonzero of the jacobian.
+
+        fd_inputs : list of tuple
+            Input information from `_get_fd_input`, one per column block.
+
+        Returns
+        -------
+        list of tuple
+            One (parts, rows, cols) per color, where parts is a list of
+            (input number, indices) to perturb, and rows and cols are the
+            nonzeros of the jacobian found in the columns of that color.
+        """
+        rows, cols = sparsity
+        sizes = [np.size(info[0]._dat[info[1]].val) for info in fd_inputs]
+        col_offsets = np.zeros(len(sizes) + 1, dtype=int)
+        col_offsets[1:] = np.cumsum(sizes)
+        ncols = col_offsets[-1]
+        nrows = rows.max() + 1 if len(rows) else 0
+
+        # input block of each column
+        col_block = np.repeat(np.arange(len(sizes)), sizes)
+
+        # sort the nonzeros by column so each color can grab its own
+        order = np.argsort(cols, kind='mergesort')
+        rows, cols = rows[order], cols[order]
+        nz_ptr = np.searchsorted(cols, np.arange(ncols + 1))
+
+        # inputs perturbed with different methods can't share a color
+        groups = OrderedDict()
+        for i, info in enumerate(fd_inputs):
+            groups.setdefault(info[5:], []).append(i)
+
+        coloring = []
+        for blocks in itervalues(groups):
+            gcols = np.concatenate([np.arange(col_offsets[i], col_offsets[i+1])
+                                    for i in blocks])
+            gmap = -np.ones(ncols, dtype=int)
+            gmap[gcols] = np.arange(len(gcols))
+            mask = gmap[cols] >= 0
+
+            for color in color_columns(rows[mask], gmap[cols[mask]],
+                                       (nrows, len(gcols))):
+                ccols = gcols[color]
+                parts = []
+                for i in blocks:
+                    sel = ccols[col_block[ccols] == i]
+                    if len(sel) > 0:
+                        parts.append((i, sel - col_offsets[i]))
+
+                nz = np.concatenate([np.arange(nz_ptr[c], nz_ptr[c+1])
+                                     for c in ccols])
+                coloring.append((parts, rows[nz], cols[nz]))
+
+        return coloring
+
+    def _fd_jacobian_colored(self, params, unknowns, resids, run_model,
+                             resultvec, cache1, fd_unknowns, p_names, fd_inputs,
+                             coloring):
+        """ Finite difference all columns of one color with a single model
+        evaluation (two for central difference) and unpack the result into
+        the jacobian. See `fd_jacobian` for the meaning of the arguments.
+
+        Returns
+        -------
+        dict
+            Dictionary whose keys are tuples of the form ('unknown', 'param')
+            and whose values are ndarrays containing the derivative for that
+            tuple pair.
+        """
+        row_map = np.concatenate([np.arange(*resultvec._dat[u_name].slice)
+                                  for u_name in fd_unknowns])
+        base = cache1[row_map]
+
+        # Step for every column of every input.
+        steps = []
+        for inputs, param_key, _, fdstep, fdtype, fdform, cs in fd_inputs:
+            target_input = inputs._dat[param_key].val
+            if fdtype == 'relative' and cs != 'cs':
+                steps.append(np.maximum(target_input * fdstep, fdstep))
+            else:
+                steps.append(np.ones(np.size(target_input)) * fdstep)
+
+        col_steps = np.concatenate(steps)
+        full_jac = np.zeros((len(row_map), len(col_steps)))
+
+        for parts, rows, cols in coloring:
+            fdform, cs = fd_inputs[parts[0][0]][5:]
+
+            attr = 'imag_val' if cs == 'cs' else 'val'
+            targets = [(getattr(fd_inputs[i][0]._dat[fd_inputs[i][1]], attr),
+                        idxs, steps[i][idxs]) for i, idxs in parts]
+            origs = [target[idxs].copy() for target, idxs, _ in targets]
+
+            def perturb(sign):
+                for target, idxs, step in targets:
+                    target[idxs] += sign*step
+
+            def restore():
+                for (target, idxs, _), orig in zip(targets, origs):
+                    target[idxs] = orig
+
+            if cs == 'cs':
+                probdata = unknowns._probdata
+                probdata.in_complex_step = True
+
+                perturb(1.0)
+                run_model(params, unknowns, resids)
+                restore()
+
+                delta = resultvec.imag_vec[row_map]
+                probdata.in_complex_step = False
+
+            elif fdform == 'forward':
+                perturb(1.0)
+                run_model(params, unknowns, resids)
+                restore()
+
+                delta = resultvec.vec[row_map] - base
+
+            elif fdform == 'backward':
+                perturb(-1.0)
+                run_model(params, unknowns, resids)
+                restore()
+
+                delta = base - resultvec.vec[row_map]
+
+            elif fdform == 'central':
+                perturb(1.0)
+                run_model(params, unknowns, resids)
+                cache2 = resultvec.vec[row_map]
+                restore()
+                resultvec.vec[:] = cache1
+
+                perturb(-1.0)
+                run_model(params, unknowns, resids)
+                restore()
+
+                delta = 0.5*(cache2 - resultvec.vec[row_map])
+
+            full_jac[rows, cols] = delta[rows] / col_steps[cols]
+
+            # Restore old residual
+            resultvec.vec[:] = cache1
+
+        # Split into the usual subjacobians.
+        jac = {}
+        r_start = 0
+        for u_name in fd_unknowns:
+            r_end = r_start + resultvec._dat[u_name].val.size
+            c_start = 0
+            for p_name, step in zip(p_names, steps):
+                c_end = c_start + len(step)
+                jac[u_name, p_name] = full_jac[r_start:r_end, c_start:c_end]
+                c_start = c_end
+            r_start = r_end
+
         return jac
 
     def _sys_apply_linear(self, mode, do_apply, vois=(None,), gs_outputs=None,
@@ -845,7 +1297,6 @@ class System(object):
                     if force_fd:
                         self._apply_linear_jac(self.params, self.unknowns, dparams, dunknowns, dresids, mode)
                     else:
-                        dparams._apply_unit_derivatives(rel_inputs=rel_inputs)
                         dunknowns._scale_derivatives()
 
                         # Limit scope of dparams to local relevant vars if we
@@ -888,7 +1339,6 @@ class System(object):
                         try:
                             self.apply_linear(self.params, self.unknowns, dparams, dunknowns, dresids, mode)
                         finally:
-                            dparams._apply_unit_derivatives(rel_inputs=rel_inputs)
                             dunknowns._scale_derivatives()
 
         self.rel_inputs = None
@@ -956,6 +1406,7 @@ class System(object):
                         jc[key] = jc[key].reshape((shape[0], 1))
 
         self._jacobian_changed = True
+        self._linearize_count += 1
         return self._jacobian_cache
 
     def _apply_linear_jac(self, params, unknowns, dparams, dunknowns, dresids, mode):
@@ -1564,6 +2015,20 @@ class System(object):
         return p_unconn, p_outscope
 
 
+def _fd_pool_task(problem, path, fd_id, num_fds, cache1, keys, buf, fd_args):
+    """ `WorkerPool` task that finite differences a worker's share of the
+    columns of the system at `path` (relative to the root) in its copy of the
+    model. `cache1` is the unperturbed result vector of the parent."""
+    root = problem.root
+    system = root.find_subsystem(path) if path else root
+
+    resultvec = system.unknowns if fd_args['total_derivs'] else system.resids
+    resultvec.vec[:] = cache1
+
+    system._fd_share(system.params, system.unknowns, system.resids, fd_id,
+                     num_fds, keys, buf, fd_args)
+
+
 class _DummyContext(object):
     """Used in place of DirContext for those systems that don't define their
     own directory.
@@ -0,0 +1,125 @@
+""" Tests for params that share storage with their source unknown."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, ScipyGMRES, \
+                         NLGaussSeidel, Component, ExecComp
+from openmdao.test.sellar import SellarDis1withDerivatives, \
+                                 SellarDis2withDerivatives
+from openmdao.test.paraboloid import Paraboloid
+from openmdao.test.util import assert_rel_error
+
+
+class ScaledX(Component):
+    """ Takes x in meters through a unit conversion."""
+
+    def __init__(self):
+        super(ScaledX, self).__init__()
+        self.add_param('x', 0.0, units='m')
+        self.add_output('y', 0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']
+
+    def linearize(self, params, unknowns, resids):
+        return {('y', 'x'): np.array([[1.0]])}
+
+
+def _build(alias_params):
+    root = Group()
+    root.add('px', IndepVarComp('x', 1.0, units='km'), promotes=['x'])
+    root.add('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+    root.add('py', IndepVarComp('y', 3.0))
+
+    mda = root.add('mda', Group(), promotes=['*'])
+    mda.add('d1', SellarDis1withDerivatives(), promotes=['x', 'z', 'y1', 'y2'])
+    mda.add('d2', SellarDis2withDerivatives(), promotes=['z', 'y1', 'y2'])
+    mda.nl_solver = NLGaussSeidel()
+
+    root.add('par', Paraboloid())
+    root.add('sx', ScaledX())
+    root.connect('y1', 'par.x')
+    root.connect('py.y', 'par.y')
+    root.connect('x', 'sx.x')
+    root.ln_solver = ScipyGMRES()
+
+    prob = Problem(root)
+    prob.setup(check=False, alias_params=alias_params)
+    return prob
+
+
+class TestAliasParams(unittest.TestCase):
+
+    def test_aliased(self):
+        prob = _build(True)
+        params = prob.root.params
+
+        # py.y and y2 have a single target, the others have several or
+        # need a unit conversion
+        self.assertTrue(params._dat['par.y'].aliased)
+        self.assertTrue(prob.root.mda.params._dat['d1.y2'].aliased)
+        self.assertFalse(params._dat['par.x'].aliased)
+        self.assertFalse(params._dat['sx.x'].aliased)
+        self.assertFalse(prob.root.mda.params._dat['d2.y1'].aliased)
+
+        plain = _build(False)
+        self.assertEqual(params.vec.size, plain.root.params.vec.size - 1)
+        self.assertEqual(prob.root.mda.params.vec.size,
+                         plain.root.mda.params.vec.size - 1)
+
+        # the param is a view of its source, even before any transfer
+        prob['py.y'] = 7.0
+        self.assertEqual(prob.root.par.params['y'], 7.0)
+
+    def test_run_and_derivs(self):
+        plain = _build(False)
+        plain.run()
+        prob = _build(True)
+        prob.run()
+
+        assert_rel_error(self, prob['par.f_xy'], plain['par.f_xy'], 1e-10)
+        assert_rel_error(self, prob['sx.y'], 1000.0, 1e-10)
+
+        indeps = ['x', 'z', 'py.y']
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(indeps, ['par.f_xy'], mode=mode)
+            Jplain = plain.calc_gradient(indeps, ['par.f_xy'], mode=mode)
+            assert_rel_error(self, J, Jplain, 1e-8)
+
+    def test_write_error(self):
+        prob = _build(True)
+        prob.run()
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.root.par.params['y'] = 3.0
+
+        self.assertEqual(str(cm.exception),
+                         "Cannot set param 'par.y' because it shares storage "
+                         "with the unknown it is connected to. Set the "
+                         "unknown instead.")
+
+    def test_inplace_write_error(self):
+        root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 2.0])))
+        root.add('c', ExecComp('y=3.0*x', x=np.zeros(2), y=np.zeros(2)))
+        root.connect('p.x', 'c.x')
+        root.c.deriv_options['type'] = 'fd'
+        prob = Problem(root)
+        prob.setup(check=False, alias_params=True)
+        prob.run()
+
+        params = root.c.params
+        self.assertTrue(params._dat['x'].aliased)
+        with self.assertRaises(ValueError):
+            params['x'][:] = 5.0
+        assert_rel_error(self, prob['p.x'], np.array([1.0, 2.0]), 1e-15)
+
+        # finite difference still perturbs the shared storage
+        J = prob.calc_gradient(['p.x'], ['c.y'], mode='fwd')
+        assert_rel_error(self, J, 3.0*np.eye(2), 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,7 @@ from numpy.testing import assert_almost_equal
 
 from six import text_type, PY3
 
-from openmdao.api import Problem, Group, IndepVarComp, ExecComp
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, DirectSolver
 from openmdao.test.simple_comps import RosenSuzuki, FanIn
 
 
@@ -248,5 +248,191 @@ class TestCalcGradient(unittest.TestCase):
         assert_almost_equal(J, np.array([[-6., 35.]]))
 
 
+class CountedLinearSolves(DirectSolver):
+    """ Counts the calls to solve and the right-hand sides that are solved. """
+
+    def __init__(self):
+        super(CountedLinearSolves, self).__init__()
+        self.calls = 0
+        self.count = 0
+
+    def solve(self, rhs_mat, system, mode):
+        self.calls += 1
+        for rhs in rhs_mat.values():
+            self.count += rhs.shape[1] if rhs.ndim == 2 else 1
+        return super(CountedLinearSolves, self).solve(rhs_mat, system, mode)
+
+
+class TestCalcGradientMultipleRHS(unittest.TestCase):
+
+    def test_batched_solves(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(1.0, 5.0)))
+        root.add('comp', ExecComp(['y = 2.0*x**2', 'w = sum(x)'],
+                                  x=np.zeros(4), y=np.zeros(4)))
+        root.connect('px.x', 'comp.x')
+        root.ln_solver = CountedLinearSolves()
+        prob.setup(check=False)
+        prob.run()
+
+        expected = np.vstack((np.diag(4.0*np.arange(1.0, 5.0)), np.ones((1, 4))))
+
+        # All indices of a variable of interest go to the solver together.
+        J = prob.calc_gradient(['px.x'], ['comp.y', 'comp.w'], mode='fwd')
+        assert_almost_equal(J, expected)
+        self.assertEqual(root.ln_solver.calls, 1)
+        self.assertEqual(root.ln_solver.count, 4)
+
+        root.ln_solver.calls = root.ln_solver.count = 0
+        J = prob.calc_gradient(['px.x'], ['comp.y', 'comp.w'], mode='rev')
+        assert_almost_equal(J, expected)
+        self.assertEqual(root.ln_solver.calls, 2)
+        self.assertEqual(root.ln_solver.count, 5)
+
+        # Inactive constraint rows are still skipped.
+        root.ln_solver.calls = root.ln_solver.count = 0
+        J = prob.calc_gradient(['px.x'], ['comp.y'], mode='rev',
+                               return_format='dict', inactives={'comp.y': [1, 2]})
+        assert_almost_equal(J['comp.y']['px.x'], np.diag([4.0, 0.0, 0.0, 16.0]))
+        self.assertEqual(root.ln_solver.calls, 1)
+
+
+class TestCalcGradientColoring(unittest.TestCase):
+
+    def setup_model(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(1.0, 7.0)))
+        root.add('pz', IndepVarComp('z', 3.0))
+        root.add('comp', ExecComp(['y = 2.0*x**2', 'w = z*x[0]'],
+                                  x=np.zeros(6), y=np.zeros(6)))
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+        root.ln_solver = CountedLinearSolves()
+        prob.setup(check=False)
+        prob.run()
+        return prob
+
+    def test_coloring_fwd(self):
+        prob = self.setup_model()
+        indep_list = ['px.x', 'pz.z']
+        unknown_list = ['comp.y', 'comp.w']
+
+        expected = prob.calc_gradient(indep_list, unknown_list, mode='fwd')
+        coloring = prob.compute_total_coloring(indep_list, unknown_list,
+                                               mode='fwd')
+
+        self.assertEqual(coloring['mode'], 'fwd')
+        self.assertEqual(coloring['shape'], (7, 7))
+
+        # x[1:] and z are structurally orthogonal, but x[0] touches w too.
+        self.assertEqual(len(coloring['colors']), 2)
+
+        prob.root.ln_solver.count = 0
+        J = prob.calc_gradient(indep_list, unknown_list, mode='fwd',
+                               coloring=coloring)
+        assert_almost_equal(J, expected)
+        self.assertEqual(prob.root.ln_solver.count, 2)
+
+        Jdict = prob.calc_gradient(indep_list, unknown_list, mode='fwd',
+                                   return_format='dict', coloring=coloring)
+        assert_almost_equal(Jdict['comp.y']['px.x'], np.diag(4.0*np.arange(1.0, 7.0)))
+        assert_almost_equal(Jdict['comp.y']['pz.z'], np.zeros((6, 1)))
+        assert_almost_equal(Jdict['comp.w']['px.x'], [[3.0, 0, 0, 0, 0, 0]])
+        assert_almost_equal(Jdict['comp.w']['pz.z'], [[1.0]])
+
+    def test_coloring_rev(self):
+        prob = self.setup_model()
+        indep_list = ['px.x']
+        unknown_list = ['comp.y']
+
+        expected = prob.calc_gradient(indep_list, unknown_list, mode='rev')
+        coloring = prob.compute_total_coloring(indep_list, unknown_list,
+                                               mode='rev')
+        self.assertEqual(len(coloring['colors']), 1)
+
+        prob.root.ln_solver.count = 0
+        J = prob.calc_gradient(indep_list, unknown_list, mode='rev',
+                               coloring=coloring)
+        assert_almost_equal(J, expected)
+        self.assertEqual(prob.root.ln_solver.count, 1)
+
+    def test_coloring_mismatch(self):
+        prob = self.setup_model()
+
+        coloring = prob.compute_total_coloring(['px.x'], ['comp.y'], mode='fwd')
+
+        # A coloring for other derivatives is ignored.
+        prob.root.ln_solver.count = 0
+        J = prob.calc_gradient(['px.x'], ['comp.y'], mode='rev',
+                               coloring=coloring)
+        assert_almost_equal(J, np.diag(4.0*np.arange(1.0, 7.0)))
+        self.assertEqual(prob.root.ln_solver.count, 6)
+
+        prob.root.ln_solver.count = 0
+        J = prob.calc_gradient(['pz.z'], ['comp.w'], mode='fwd',
+                               coloring=coloring)
+        assert_almost_equal(J, [[1.0]])
+        self.assertEqual(prob.root.ln_solver.count, 1)
+
+    def test_coloring_zero_at_point(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.ones(3)))
+        root.add('pz', IndepVarComp('z', np.zeros(3)))
+        root.add('comp', ExecComp('y = x*z', x=np.zeros(3), y=np.zeros(3),
+                                  z=np.zeros(3)))
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+        root.ln_solver = CountedLinearSolves()
+        prob.setup(check=False)
+        prob.run()
+
+        # dy/dx is zero at this point, but not structurally
+        coloring = prob.compute_total_coloring(['px.x', 'pz.z'], ['comp.y'],
+                                               mode='fwd')
+        self.assertEqual(len(coloring['rows']), 6)
+        assert_almost_equal(prob['pz.z'], np.zeros(3))
+        assert_almost_equal(prob['comp.y'], np.zeros(3))
+
+        prob['pz.z'] = np.array([1.0, 2.0, 3.0])
+        prob.run()
+        J = prob.calc_gradient(['px.x', 'pz.z'], ['comp.y'], mode='fwd',
+                               coloring=coloring)
+        assert_almost_equal(J, np.hstack((np.diag([1.0, 2.0, 3.0]),
+                                          np.eye(3))))
+
+    def test_coloring_inactives(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(1.0, 5.0)))
+        root.add('pz', IndepVarComp('z', np.ones(4)))
+        root.add('comp', ExecComp(['y = 2.0*x**2', 'w = z*x'], x=np.zeros(4),
+                                  y=np.zeros(4), z=np.zeros(4), w=np.zeros(4)))
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+        root.ln_solver = CountedLinearSolves()
+        prob.setup(check=False)
+        prob.run()
+
+        indep_list = ['px.x', 'pz.z']
+        unknown_list = ['comp.y', 'comp.w']
+        coloring = prob.compute_total_coloring(indep_list, unknown_list,
+                                               mode='rev')
+        self.assertEqual(len(coloring['colors']), 2)
+
+        # the rows of w are one color, which isn't solved for when inactive
+        prob.root.ln_solver.count = 0
+        J = prob.calc_gradient(indep_list, unknown_list, mode='rev',
+                               return_format='dict', coloring=coloring,
+                               inactives={'comp.w': [0, 1, 2, 3],
+                                          'comp.y': [1]})
+        self.assertEqual(prob.root.ln_solver.count, 1)
+        assert_almost_equal(J['comp.y']['px.x'], np.diag([4.0, 0.0, 12.0, 16.0]))
+        assert_almost_equal(J['comp.w']['px.x'], np.zeros((4, 4)))
+        assert_almost_equal(J['comp.w']['pz.z'], np.zeros((4, 4)))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,8 @@ finite difference."""
 
 from __future__ import print_function
 from collections import OrderedDict
+import os
+import sys
 import unittest
 
 import numpy as np
@@ -11,7 +13,7 @@ from openmdao.api import Component, Group, Problem, System, \
     IndepVarComp, ExecComp, ScipyGMRES
 from openmdao.core.vec_wrapper import SrcVecWrapper
 from openmdao.test.simple_comps import SimpleArrayComp, \
-                                      SimpleImplicitComp
+                                      SimpleImplicitComp, DeclaredSparseArrayComp
 from openmdao.test.paraboloid import Paraboloid
 from openmdao.test.util import assert_equal_jacobian, assert_rel_error
 from openmdao.util.options import OptionsDictionary
@@ -709,6 +711,312 @@ class CompFDinSystemTestCase(unittest.TestCase):
         self.assertLess(J['comp.f_xy']['p12.x2'][0][0], 0.0)
 
 
+class CountedSparseComp(DeclaredSparseArrayComp):
+    """ Counts executions, and finite differences by default."""
+
+    def __init__(self, size=10):
+        super(CountedSparseComp, self).__init__(size)
+        self.deriv_options['type'] = 'fd'
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.count += 1
+        super(CountedSparseComp, self).solve_nonlinear(params, unknowns, resids)
+
+
+class CountedExecComp(ExecComp):
+    """ Counts executions."""
+
+    def __init__(self, *args, **kwargs):
+        super(CountedExecComp, self).__init__(*args, **kwargs)
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.count += 1
+        super(CountedExecComp, self).solve_nonlinear(params, unknowns, resids)
+
+
+class FDColoringTestCase(unittest.TestCase):
+    """ Tests of finite difference with column coloring."""
+
+    def _check_sparse_comp(self, form='forward'):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(10, dtype=float) + 1.0))
+        root.add('pz', IndepVarComp('z', np.array([2.0])))
+        comp = root.add('comp', CountedSparseComp())
+        comp.deriv_options['coloring'] = True
+        comp.deriv_options['form'] = form
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+
+        prob.setup(check=False)
+        prob.run()
+
+        comp.count = 0
+        J = prob.calc_gradient(['px.x', 'pz.z'], ['comp.y'], mode='fwd',
+                               return_format='dict')
+
+        # x is diagonal and z is a dense column: two colors.
+        runs = 4 if form == 'central' else 2
+        self.assertEqual(comp.count, runs)
+
+        Jx = np.diag(6.0*(np.arange(10) + 1.0))
+        assert_rel_error(self, J['comp.y']['px.x'], Jx, 1e-5)
+        assert_rel_error(self, J['comp.y']['pz.z'], np.ones((10, 1)), 1e-5)
+
+    def test_declared_forward(self):
+        self._check_sparse_comp()
+
+    def test_declared_backward(self):
+        self._check_sparse_comp(form='backward')
+
+    def test_declared_central(self):
+        self._check_sparse_comp(form='central')
+
+    def test_probed(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(8, dtype=float) + 1.0))
+        comp = root.add('comp', CountedExecComp(['y = 2.0*x**2', 'z = 3.0*x[0]'],
+                                                x=np.zeros(8), y=np.zeros(8),
+                                                z=0.0))
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['coloring'] = True
+        root.connect('px.x', 'comp.x')
+
+        prob.setup(check=False)
+        prob.run()
+
+        Jy = np.diag(4.0*(np.arange(8) + 1.0))
+        Jz = np.zeros((1, 8))
+        Jz[0, 0] = 3.0
+
+        # First pass probes the sparsity with a full finite difference here
+        # and another one at a perturbed point.
+        for runs in (17, 1):
+            comp.count = 0
+            J = prob.calc_gradient(['px.x'], ['comp.y', 'comp.z'], mode='fwd',
+                                   return_format='dict')
+            self.assertEqual(comp.count, runs)
+            assert_rel_error(self, J['comp.y']['px.x'], Jy, 1e-5)
+            assert_rel_error(self, J['comp.z']['px.x'], Jz, 1e-5)
+
+    def test_group_total_derivs(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(6, dtype=float) + 1.0),
+                 promotes=['x'])
+        sub = root.add('sub', Group(), promotes=['x', 'z'])
+        c1 = sub.add('c1', CountedExecComp('y = 3.0*x', x=np.zeros(6), y=np.zeros(6)),
+                     promotes=['x', 'y'])
+        sub.add('c2', ExecComp('z = y**2', y=np.zeros(6), z=np.zeros(6)),
+                promotes=['y', 'z'])
+        sub.deriv_options['type'] = 'fd'
+        sub.deriv_options['coloring'] = True
+
+        prob.setup(check=False)
+        prob.run()
+
+        Jbase = np.diag(18.0*(np.arange(6) + 1.0))
+        for runs in (13, 1):
+            c1.count = 0
+            J = prob.calc_gradient(['x'], ['z'], mode='rev', return_format='dict')
+            self.assertEqual(c1.count, runs)
+            assert_rel_error(self, J['z']['x'], Jbase, 1e-4)
+
+    def test_probed_zero_at_point(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.ones(4)))
+        root.add('pz', IndepVarComp('z', np.zeros(4)))
+        comp = root.add('comp', ExecComp('y = x*z', x=np.zeros(4),
+                                         y=np.zeros(4), z=np.zeros(4)))
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['coloring'] = True
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+
+        prob.setup(check=False)
+        prob.run()
+
+        # dy/dx is zero here, but not once z changes
+        J = prob.calc_gradient(['px.x'], ['comp.y'], mode='fwd')
+        assert_rel_error(self, J, np.zeros((4, 4)), 1e-8)
+
+        prob['pz.z'] = np.arange(4, dtype=float) + 1.0
+        prob.run()
+        J = prob.calc_gradient(['px.x'], ['comp.y'], mode='fwd')
+        assert_rel_error(self, J, np.diag(np.arange(4) + 1.0), 1e-5)
+
+        # the probe doesn't change the state of the model
+        assert_rel_error(self, prob['comp.y'], np.arange(4) + 1.0, 1e-15)
+
+    def test_setup_clears_coloring(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.ones(3)))
+        comp = root.add('comp', ExecComp('y = 2.0*x', x=np.zeros(3),
+                                         y=np.zeros(3)))
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['coloring'] = True
+        root.connect('px.x', 'comp.x')
+
+        prob.setup(check=False)
+        prob.run()
+        prob.calc_gradient(['px.x'], ['comp.y'], mode='fwd')
+        self.assertEqual(len(comp._fd_colorings), 1)
+
+        prob.setup(check=False)
+        self.assertEqual(comp._fd_colorings, {})
+
+    def test_check_partials_not_colored(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(10, dtype=float) + 1.0))
+        comp = root.add('comp', CountedSparseComp())
+        comp.deriv_options['type'] = 'user'
+        comp.deriv_options['coloring'] = True
+        root.connect('px.x', 'comp.x')
+
+        prob.setup(check=False)
+        prob.run()
+
+        # the check always perturbs one column at a time
+        comp.count = 0
+        prob.check_partial_derivatives(out_stream=None)
+        self.assertEqual(comp.count, 10)
+
+
+class WorkerFailComp(ExecComp):
+    """ Fails when run in any process but the one it was made in."""
+
+    def __init__(self, *args, **kwargs):
+        super(WorkerFailComp, self).__init__(*args, **kwargs)
+        self.pid = os.getpid()
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if os.getpid() != self.pid:
+            raise RuntimeError("failed in worker")
+        super(WorkerFailComp, self).solve_nonlinear(params, unknowns, resids)
+
+
+@unittest.skipIf(sys.platform == 'win32', "relies on fork")
+class FDPoolTestCase(unittest.TestCase):
+    """ Tests of finite difference in a pool of worker processes."""
+
+    def tearDown(self):
+        self.prob.cleanup()
+
+    def _check_partials(self, form):
+        prob = self.prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(10, dtype=float) + 1.0))
+        root.add('pz', IndepVarComp('z', np.array([2.0])))
+        comp = root.add('comp', CountedSparseComp())
+        comp.deriv_options['num_fd_procs'] = 3
+        comp.deriv_options['form'] = form
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+
+        prob.setup(check=False)
+        prob.run()
+
+        for i in range(2):
+            comp.count = 0
+            J = prob.calc_gradient(['px.x', 'pz.z'], ['comp.y'], mode='fwd',
+                                   return_format='dict')
+
+            # this process does every third of the 11 columns
+            self.assertEqual(comp.count, 8 if form == 'central' else 4)
+
+            Jx = np.diag(6.0*(np.arange(10) + 1.0))
+            assert_rel_error(self, J['comp.y']['px.x'], Jx, 1e-5)
+            assert_rel_error(self, J['comp.y']['pz.z'], np.ones((10, 1)), 1e-5)
+
+            if i == 0:
+                pool = prob._worker_pool
+                self.assertEqual(pool.num_workers, 2)
+            else:
+                self.assertTrue(prob._worker_pool is pool)
+
+            # the workers see the new values
+            prob['px.x'] = np.arange(10, dtype=float) + 1.0
+            prob.run()
+
+    def test_partials_forward(self):
+        self._check_partials('forward')
+
+    def test_partials_central(self):
+        self._check_partials('central')
+
+    def test_total_derivs(self):
+        prob = self.prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(6, dtype=float) + 1.0),
+                 promotes=['x'])
+        sub = root.add('sub', Group(), promotes=['x', 'z'])
+        c1 = sub.add('c1', CountedExecComp('y = 3.0*x', x=np.zeros(6), y=np.zeros(6)),
+                     promotes=['x', 'y'])
+        sub.add('c2', ExecComp('z = y**2', y=np.zeros(6), z=np.zeros(6)),
+                promotes=['y', 'z'])
+        sub.deriv_options['type'] = 'fd'
+        sub.deriv_options['num_fd_procs'] = 2
+
+        prob.setup(check=False)
+        prob.run()
+
+        c1.count = 0
+        J = prob.calc_gradient(['x'], ['z'], mode='rev', return_format='dict')
+        self.assertEqual(c1.count, 3)
+        assert_rel_error(self, J['z']['x'],
+                         np.diag(18.0*(np.arange(6) + 1.0)), 1e-4)
+
+    def test_problem_fd(self):
+        prob = self.prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(4, dtype=float) + 1.0),
+                 promotes=['x'])
+        root.add('c1', ExecComp('y = x**2', x=np.zeros(4), y=np.zeros(4)),
+                 promotes=['x', 'y'])
+        root.deriv_options['type'] = 'fd'
+
+        prob.setup(check=False)
+        prob.run()
+
+        # x is also an unknown of interest, which isn't finite differenced
+        Jserial = prob.calc_gradient(['x'], ['y', 'x'], mode='fwd',
+                                     return_format='dict')
+
+        root.deriv_options['num_fd_procs'] = 2
+        J = prob.calc_gradient(['x'], ['y', 'x'], mode='fwd',
+                               return_format='dict')
+        self.assertEqual(prob._worker_pool.num_workers, 1)
+
+        assert_rel_error(self, J['y']['x'],
+                         np.diag(2.0*(np.arange(4) + 1.0)), 1e-5)
+        for of in ('y', 'x'):
+            np.testing.assert_array_equal(J[of]['x'], Jserial[of]['x'])
+
+
+    def test_worker_error(self):
+        prob = self.prob = Problem()
+        root = prob.root = Group()
+        root.add('px', IndepVarComp('x', np.ones(4)))
+        comp = root.add('comp', WorkerFailComp('y = 2.0*x', x=np.zeros(4),
+                                               y=np.zeros(4)))
+        comp.deriv_options['type'] = 'fd'
+        comp.deriv_options['num_fd_procs'] = 2
+        root.connect('px.x', 'comp.x')
+
+        prob.setup(check=False)
+        prob.run()
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.calc_gradient(['px.x'], ['comp.y'], mode='fwd')
+        self.assertTrue('failed in worker' in str(cm.exception))
+
+
 class OptionsDeprecationTestCase(unittest.TestCase):
     """ We replaced fd_options with deriv_options."""
 
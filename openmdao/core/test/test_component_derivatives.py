@@ -7,9 +7,13 @@ import warnings
 
 import numpy as np
 
-from openmdao.api import Problem, Group, Component, ExecComp, IndepVarComp
+from scipy.sparse import issparse
+
+from openmdao.api import Problem, Group, Component, ExecComp, IndepVarComp, \
+                         DirectSolver
 from openmdao.test.simple_comps import SimpleComp, SimpleArrayComp, \
-                                       SimpleImplicitComp, SimpleSparseArrayComp
+                                       SimpleImplicitComp, SimpleSparseArrayComp, \
+                                       DeclaredSparseArrayComp
 
 from openmdao.test.util import assert_rel_error
 
@@ -295,5 +299,113 @@ class TestComponentDerivatives(unittest.TestCase):
         p.run()
 
 
+    def _declared_sparse_prob(self):
+        p = Problem()
+        root = p.root = Group()
+        root.add('px', IndepVarComp('x', np.arange(5, dtype=float) + 1.0))
+        root.add('pz', IndepVarComp('z', np.array([2.0])))
+        root.add('comp', DeclaredSparseArrayComp())
+        root.connect('px.x', 'comp.x')
+        root.connect('pz.z', 'comp.z')
+        return p
+
+    def test_declared_sparse_Jacobian(self):
+
+        Jx = np.diag(6.0*(np.arange(5) + 1.0))
+        Jz = np.ones((5, 1))
+
+        for method in ('MVP', 'assemble', 'sparse'):
+            p = self._declared_sparse_prob()
+            p.root.ln_solver = DirectSolver()
+            p.root.ln_solver.options['jacobian_method'] = method
+            p.setup(check=False)
+            p.run()
+
+            for mode in ('fwd', 'rev'):
+                J = p.calc_gradient(['px.x', 'pz.z'], ['comp.y'], mode=mode,
+                                    return_format='dict')
+                assert_rel_error(self, J['comp.y']['px.x'], Jx, 1e-12)
+                assert_rel_error(self, J['comp.y']['pz.z'], Jz, 1e-12)
+
+            # nonzeros only, never densified
+            subjac = p.root.comp._jacobian_cache['y', 'x']
+            self.assertTrue(issparse(subjac))
+            self.assertEqual(subjac.nnz, 5)
+
+    def test_declared_sparse_check_partials(self):
+        p = self._declared_sparse_prob()
+        p.setup(check=False)
+        p.run()
+
+        data = p.check_partial_derivatives(out_stream=None)
+
+        for key in (('y', 'x'), ('y', 'z')):
+            for err in data['comp'][key]['abs error']:
+                self.assertTrue(err < 1e-5)
+
+    def test_declared_sparse_alloc_jacobian(self):
+        p = self._declared_sparse_prob()
+        p.setup(check=False)
+        p.run()
+
+        comp = p.root.comp
+        comp._jacobian_cache = {}
+        J = comp.alloc_jacobian()
+        self.assertEqual(J['y', 'x'].shape, (5,))
+        self.assertEqual(J['y', 'z'].shape, (5,))
+
+        comp._sys_linearize(comp.params, comp.unknowns, comp.resids)
+        self.assertTrue(issparse(comp._jacobian_cache['y', 'x']))
+
+        # Values come back in declared order for the next linearize.
+        J = comp.alloc_jacobian()
+        assert_rel_error(self, J['y', 'x'], 6.0*(np.arange(5) + 1.0)[::-1], 1e-15)
+
+    def test_declared_sparse_errors(self):
+        comp = Component()
+        with self.assertRaises(ValueError) as cm:
+            comp.declare_partials('y', 'x', rows=[0, 1], cols=[0])
+
+        self.assertEqual(str(cm.exception), ": rows and cols must be the same "
+                         "length, but rows has length 2 and cols has length 1.")
+
+        class BadComp(DeclaredSparseArrayComp):
+            def linearize(self, params, unknowns, resids):
+                J = super(BadComp, self).linearize(params, unknowns, resids)
+                J['y', 'x'] = J['y', 'x'][:3]
+                return J
+
+        p = Problem()
+        p.root = Group()
+        p.root.add('px', IndepVarComp('x', np.ones(5)))
+        p.root.add('comp', BadComp())
+        p.root.connect('px.x', 'comp.x')
+        p.setup(check=False)
+        p.run()
+
+        with self.assertRaises(ValueError) as cm:
+            p.calc_gradient(['px.x'], ['comp.y'])
+
+        self.assertEqual(str(cm.exception), "In component 'comp', the derivative "
+                         "of 'y' wrt 'x' is declared sparse with 5 nonzeros, "
+                         "but 3 values were given.")
+
+        p = Problem()
+        p.root = Group()
+        p.root.add('px', IndepVarComp('x', np.ones(5)))
+        comp = p.root.add('comp', DeclaredSparseArrayComp())
+        comp.declare_partials('y', 'x', rows=[0, 5], cols=[0, 0])
+        p.root.connect('px.x', 'comp.x')
+        p.setup(check=False)
+        p.run()
+
+        with self.assertRaises(ValueError) as cm:
+            p.calc_gradient(['px.x'], ['comp.y'])
+
+        self.assertEqual(str(cm.exception), "In component 'comp', the declared "
+                         "sparsity of 'y' wrt 'x' has indices outside of its "
+                         "shape '(5, 5)'.")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+""" Tests for building the scatters of a DataTransfer."""
+
+import unittest
+
+import numpy as np
+
+from openmdao.core.data_transfer import DataTransfer, MIN_SLICE_SIZE
+from openmdao.util.array_util import idx_ranges, offsets_from_sizes
+
+
+class _ProbData(object):
+    in_complex_step = False
+
+
+class _Vec(object):
+    def __init__(self, vec):
+        self.vec = vec
+        self._probdata = _ProbData()
+
+
+class TestDataTransfer(unittest.TestCase):
+
+    def test_idx_ranges(self):
+        idxs = idx_ranges([10, 3, 7], [2, 0, 3])
+        np.testing.assert_array_equal(idxs, [10, 11, 7, 8, 9])
+        self.assertEqual(idx_ranges([], []).size, 0)
+
+        sizes = np.array([[1, 2], [3, 4]])
+        np.testing.assert_array_equal(offsets_from_sizes(sizes),
+                                      [[0, 1], [3, 6]])
+
+    def test_merge_contiguous(self):
+        n = MIN_SLICE_SIZE
+        # two connections that are adjacent in both vectors, given out of order
+        srcs = [np.arange(n, 2*n), np.arange(0, n)]
+        tgts = [np.arange(n+5, 2*n+5), np.arange(5, n+5)]
+        xfer = DataTransfer(srcs, tgts, [], [], 'fwd', None)
+
+        self.assertEqual(len(xfer.scatters), 1)
+        self.assertEqual(xfer.scatters[0][:2],
+                         (slice(0, 2*n), slice(5, 2*n+5)))
+
+    def test_gather_short_runs(self):
+        n = MIN_SLICE_SIZE
+        srcs = [np.array([7]), np.array([3]), np.arange(100, 100+n),
+                np.array([3])]
+        tgts = [np.array([0]), np.array([2]), np.arange(10, 10+n),
+                np.array([4])]
+
+        xfer = DataTransfer(srcs, tgts, [], [], 'fwd', None)
+        self.assertEqual(len(xfer.scatters), 2)
+        self.assertEqual(xfer.scatters[0][:2],
+                         (slice(100, 100+n), slice(10, 10+n)))
+        np.testing.assert_array_equal(xfer.scatters[1][0], [7, 3, 3])
+        np.testing.assert_array_equal(xfer.scatters[1][1], [0, 2, 4])
+
+        src = _Vec(np.arange(200, dtype=float))
+        tgt = _Vec(np.zeros(10+n))
+        xfer.transfer(src, tgt)
+        expected = np.zeros(10+n)
+        expected[[0, 2, 4]] = [7., 3., 3.]
+        expected[10:] = np.arange(100, 100+n)
+        np.testing.assert_array_equal(tgt.vec, expected)
+
+        # in reverse, the repeated source index must accumulate
+        xfer = DataTransfer(srcs, tgts, [], [], 'rev', None)
+        self.assertFalse(xfer.scatters[1][2])
+        src = _Vec(np.zeros(200))
+        tgt = _Vec(np.ones(10+n))
+        xfer.transfer(src, tgt, mode='rev')
+        self.assertEqual(src.vec[3], 2.0)
+        self.assertEqual(src.vec[7], 1.0)
+        self.assertEqual(np.sum(src.vec), 3.0 + n)
+
+    def test_strided(self):
+        n = MIN_SLICE_SIZE
+        srcs = [np.arange(0, 2*n, 2), np.array([1])]
+        tgts = [np.arange(n), np.array([n])]
+        xfer = DataTransfer(srcs, tgts, [], [], 'fwd', None)
+
+        self.assertEqual(xfer.scatters[0],
+                         (slice(0, 2*n, 2), slice(0, n, 1), True))
+
+        src = _Vec(np.arange(2*n, dtype=float))
+        tgt = _Vec(np.zeros(n+1))
+        xfer.transfer(src, tgt)
+        np.testing.assert_array_equal(tgt.vec[:n], np.arange(0, 2*n, 2))
+        self.assertEqual(tgt.vec[n], 1.0)
+
+        xfer = DataTransfer(srcs, tgts, [], [], 'rev', None)
+        src = _Vec(np.ones(2*n))
+        xfer.transfer(src, tgt, mode='rev')
+        np.testing.assert_array_equal(src.vec[::2], 1.0 + np.arange(0, 2*n, 2))
+        self.assertEqual(src.vec[1], 2.0)
+
+    def test_single_short_run(self):
+        xfer = DataTransfer([np.array([4, 5])], [np.array([0, 1])], [], [],
+                            'fwd', None)
+        self.assertEqual(xfer.scatters, [(slice(4, 6), slice(0, 2), True)])
+
+        xfer = DataTransfer([], [], [], [], 'fwd', None)
+        self.assertEqual(xfer.scatters, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
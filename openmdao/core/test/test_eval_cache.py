@@ -0,0 +1,195 @@
+""" Tests for the memoizing EvalCache on Components."""
+
+import os
+import unittest
+from tempfile import mkdtemp
+from shutil import rmtree
+
+import numpy as np
+
+from openmdao.api import Problem, Group, Component, IndepVarComp, \
+                         ScipyOptimizer, EvalCache
+from openmdao.test.util import assert_rel_error
+
+
+class CountedParaboloid(Component):
+    """ f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3, counting the evaluations."""
+
+    def __init__(self):
+        super(CountedParaboloid, self).__init__()
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        self.add_output('f_xy', shape=1)
+        self.count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.count += 1
+        x = params['x']
+        y = params['y']
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+    def linearize(self, params, unknowns, resids):
+        x = params['x']
+        y = params['y']
+        J = {}
+        J['f_xy', 'x'] = 2.0*x - 6.0 + y
+        J['f_xy', 'y'] = 2.0*y + 8.0 + x
+        return J
+
+
+class Unpicklable(object):
+    """ An object that can't be hashed by pickling."""
+
+    def __reduce__(self):
+        raise TypeError("can't pickle me")
+
+
+class ByObjParaboloid(CountedParaboloid):
+
+    def __init__(self):
+        super(ByObjParaboloid, self).__init__()
+        self.add_param('opt', val=Unpicklable(), pass_by_obj=True)
+
+
+def _build(comp, cache):
+    prob = Problem(root=Group())
+    root = prob.root
+    root.add('px', IndepVarComp('x', 3.0), promotes=['x'])
+    root.add('py', IndepVarComp('y', -4.0), promotes=['y'])
+    root.add('comp', comp, promotes=['x', 'y', 'f_xy'])
+    comp.eval_cache = cache
+    return prob
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        comp = CountedParaboloid()
+        cache = EvalCache()
+        prob = _build(comp, cache)
+        prob.setup(check=False)
+
+        prob.run()
+        self.assertEqual(comp.count, 1)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        assert_rel_error(self, prob['f_xy'], -15.0, 1e-10)
+
+        prob.run()
+        self.assertEqual(comp.count, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        prob['x'] = 5.0
+        prob.run()
+        self.assertEqual(comp.count, 2)
+        assert_rel_error(self, prob['f_xy'], -19.0, 1e-10)
+
+        # Going back restores the old answer.
+        prob['x'] = 3.0
+        prob.run()
+        self.assertEqual(comp.count, 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        assert_rel_error(self, prob['f_xy'], -15.0, 1e-10)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_eviction(self):
+        comp = CountedParaboloid()
+        cache = EvalCache(size=2)
+        prob = _build(comp, cache)
+        prob.setup(check=False)
+
+        for x in (1.0, 2.0, 1.0, 3.0, 1.0, 2.0):
+            prob['x'] = x
+            prob.run()
+
+        # x=1 stays most recently used, so only x=2 gets evicted.
+        self.assertEqual(comp.count, 4)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertEqual(len(cache), 2)
+
+        with self.assertRaises(ValueError) as cm:
+            EvalCache(size=0)
+        self.assertEqual(str(cm.exception),
+                         "EvalCache size must be at least 1, not 0.")
+
+    def test_disk_persistence(self):
+        tempdir = mkdtemp()
+        try:
+            fname = os.path.join(tempdir, 'paraboloid_cache')
+
+            comp = CountedParaboloid()
+            cache = EvalCache(filename=fname)
+            prob = _build(comp, cache)
+            prob.setup(check=False)
+            prob['x'] = 5.0
+            prob.run()
+            cache.close()
+            self.assertEqual(comp.count, 1)
+
+            comp = CountedParaboloid()
+            cache = EvalCache(filename=fname)
+            prob = _build(comp, cache)
+            prob.setup(check=False)
+            prob['x'] = 5.0
+            prob.run()
+            cache.close()
+
+            self.assertEqual(comp.count, 0)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            assert_rel_error(self, prob['f_xy'], -19.0, 1e-10)
+        finally:
+            rmtree(tempdir)
+
+    def test_optimizer_revisits(self):
+        comp = CountedParaboloid()
+        cache = EvalCache()
+        prob = _build(comp, cache)
+
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['disp'] = False
+        prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+        prob.driver.add_desvar('y', lower=-50.0, upper=50.0)
+        prob.driver.add_objective('f_xy')
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['x'], 6.666666667, 1e-6)
+        assert_rel_error(self, prob['y'], -7.333333333, 1e-6)
+        self.assertTrue(cache.hits > 0)
+        self.assertEqual(comp.count, cache.misses)
+
+    def test_complex_step_bypasses_cache(self):
+        comp = CountedParaboloid()
+        comp.deriv_options['type'] = 'cs'
+        cache = EvalCache()
+        prob = _build(comp, cache)
+        prob.setup(check=False)
+        prob['x'] = 1.0
+        prob['y'] = 2.0
+        prob.run()
+
+        J = prob.calc_gradient(['x', 'y'], ['f_xy'], return_format='dict')
+        assert_rel_error(self, J['f_xy']['x'][0][0], -2.0, 1e-10)
+        assert_rel_error(self, J['f_xy']['y'][0][0], 13.0, 1e-10)
+
+        # Only the real evaluation is cached.
+        self.assertEqual(len(cache), 1)
+        self.assertFalse(np.iscomplexobj(cache.get(cache.key(comp.params,
+                                                            comp.unknowns))[0][1]))
+
+    def test_unhashable_pass_by_obj(self):
+        comp = ByObjParaboloid()
+        cache = EvalCache()
+        prob = _build(comp, cache)
+        prob.setup(check=False)
+
+        prob.run()
+        prob.run()
+
+        self.assertEqual(comp.count, 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
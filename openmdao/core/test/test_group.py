@@ -7,8 +7,12 @@ from six.moves import cStringIO
 import numpy as np
 
 from openmdao.api import Problem, Group, Relevance, IndepVarComp, ExecComp, ScipyGMRES, \
-     Component
+     Component, NLGaussSeidel
+from openmdao.core.group import _NL_COMP, _NL_ENTER, _NL_GROUP, _NL_XFER
 from openmdao.test.example_groups import ExampleGroup, ExampleGroupWithPromotes
+from openmdao.test.paraboloid import Paraboloid
+from openmdao.test.sellar import SellarDis1withDerivatives, \
+                                 SellarDis2withDerivatives
 from openmdao.test.simple_comps import SimpleImplicitComp
 from openmdao.test.util import assert_rel_error
 
@@ -770,6 +774,124 @@ class TestGroup(unittest.TestCase):
 
         self.assertTrue(prob.root.find_subsystem('C1') is exec_comp)
 
+    def test_exec_plan(self):
+
+        def build(exec_plan):
+            prob = Problem(root=Group())
+            root = prob.root
+            root.ln_solver = ScipyGMRES()
+            root.add('px', IndepVarComp('x', 1.0), promotes=['x'])
+            root.add('pz', IndepVarComp('z', np.array([5.0, 2.0])),
+                     promotes=['z'])
+
+            mda = root.add('mda', Group(), promotes=['x', 'z', 'y1', 'y2'])
+            mda.add('d1', SellarDis1withDerivatives(),
+                    promotes=['x', 'z', 'y1', 'y2'])
+            mda.add('d2', SellarDis2withDerivatives(),
+                    promotes=['z', 'y1', 'y2'])
+            mda.nl_solver = NLGaussSeidel()
+            mda.ln_solver = ScipyGMRES()
+
+            post = root.add('post', Group())
+            inner = post.add('inner', Group())
+            inner.add('par', Paraboloid())
+            root.connect('x', 'post.inner.par.x')
+            root.connect('y1', 'post.inner.par.y')
+
+            prob.setup(check=False, exec_plan=exec_plan)
+            prob.run()
+            return prob
+
+        plain = build(False)
+        prob = build(True)
+
+        self.assertTrue(plain.root._nl_plan is None)
+        self.assertTrue(plain.root._lin_plan is None)
+
+        # RunOnce subgroups are flattened, others are run as a whole
+        ops = [(op, system.pathname) for op, system, arg in prob.root._nl_plan
+               if op != _NL_XFER]
+        self.assertEqual(sorted(ops[:2]), [(_NL_COMP, 'px'), (_NL_COMP, 'pz')])
+        self.assertEqual(ops[2:], [(_NL_GROUP, 'mda'), (_NL_ENTER, 'post'),
+                                   (_NL_ENTER, 'post.inner'),
+                                   (_NL_COMP, 'post.inner.par')])
+
+        assert_rel_error(self, prob['post.inner.par.f_xy'],
+                         plain['post.inner.par.f_xy'], 1e-10)
+        self.assertEqual(prob.root.post.inner.nl_solver.iter_count, 1)
+        self.assertEqual(prob.root.post.inner.ln_solver.local_meta['coord'],
+                         plain.root.post.inner.ln_solver.local_meta['coord'])
+
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['x', 'z'], ['post.inner.par.f_xy'],
+                                   mode=mode)
+            Jplain = plain.calc_gradient(['x', 'z'], ['post.inner.par.f_xy'],
+                                         mode=mode)
+            assert_rel_error(self, J, Jplain, 1e-8)
+
+    def test_exec_plan_errors_and_overrides(self):
+
+        class InfComp(Component):
+            def __init__(self):
+                super(InfComp, self).__init__()
+                self.add_param('x', np.ones(1))
+                self.add_output('y', np.ones(1))
+
+            def solve_nonlinear(self, params, unknowns, resids):
+                unknowns['y'] = np.array([np.inf])
+                raise FloatingPointError("overflow")
+
+        class RunTwice(Group):
+            def solve_nonlinear(self, params=None, unknowns=None, resids=None,
+                                metadata=None):
+                for i in range(2):
+                    super(RunTwice, self).solve_nonlinear(params, unknowns,
+                                                          resids, metadata)
+
+        def build(exec_plan, comp):
+            prob = Problem(root=Group())
+            root = prob.root
+            root.add('p', IndepVarComp('x', np.ones(1)))
+            sub = root.add('sub', Group())
+            sub.add('c', comp)
+            root.connect('p.x', 'sub.c.x')
+            prob.setup(check=False, exec_plan=exec_plan)
+            return prob
+
+        # errors in a flattened RunOnce name the nonfinite variables
+        # relative to that group, as its solver does
+        msgs = []
+        for exec_plan in (False, True):
+            prob = build(exec_plan, InfComp())
+            with self.assertRaises(FloatingPointError) as cm:
+                prob.run()
+            msgs.append(str(cm.exception))
+        self.assertEqual(msgs[0], msgs[1])
+        self.assertTrue("unknowns are nonfinite: ['c.y']" in msgs[1])
+
+        # groups that override solve_nonlinear, in their class or on the
+        # instance, aren't flattened
+        prob = Problem(root=Group())
+        root = prob.root
+        root.add('p', IndepVarComp('x', np.ones(1)))
+        twice = root.add('twice', RunTwice())
+        twice.add('c', ExecComp('y=2.0*x', x=np.ones(1), y=np.ones(1)))
+        patched = root.add('patched', Group())
+        patched.add('c', ExecComp('y=2.0*x', x=np.ones(1), y=np.ones(1)))
+        calls = []
+        patched.solve_nonlinear = lambda *args: calls.append(args)
+        root.connect('p.x', ['twice.c.x', 'patched.c.x'])
+        prob.setup(check=False, exec_plan=True)
+        prob.run()
+
+        ops = [(op, system.pathname) for op, system, arg in root._nl_plan
+               if op != _NL_XFER]
+        self.assertEqual(sorted(ops), [(_NL_COMP, 'p'),
+                                       (_NL_GROUP, 'patched'),
+                                       (_NL_GROUP, 'twice')])
+        self.assertEqual(root.twice.nl_solver.iter_count, 2)
+        self.assertEqual(len(calls), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
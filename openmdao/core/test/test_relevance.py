@@ -1,7 +1,7 @@
 import unittest
 from six import itervalues
 
-from openmdao.api import ExecComp, IndepVarComp, Problem, Group
+from openmdao.api import ExecComp, IndepVarComp, Problem, Group, ScipyGMRES
 
 
 class TestLinearGaussSeidel(unittest.TestCase):
@@ -81,3 +81,54 @@ class TestLinearGaussSeidel(unittest.TestCase):
                                  msg="%s should be irrelevant" % s.pathname)
                 self.assertFalse(root._probdata.relevance.is_relevant_system('C8.y', s),
                                  msg="%s should be irrelevant" % s.pathname)
+
+    def test_relevant_sets(self):
+        p = self.p
+        root = p.root
+
+        p.driver.add_desvar('P1.x')
+        p.driver.add_desvar('P2.x')
+        p.driver.add_objective('C8.y')
+        p.driver.add_constraint('C6.y', upper=0.0)
+
+        p.setup(check=False)
+
+        relevant = root._probdata.relevance.relevant
+        self.assertEqual(set(relevant['C6.y']),
+                         set(['P1.x', 'C3.x', 'C3.y', 'C6.x', 'C6.y']))
+        self.assertEqual(len(relevant['C6.y']), 5)
+        self.assertEqual(relevant['P2.x'].intersection(['P1.x', 'P2.x', 'C7.y']),
+                         set(['P2.x']))
+        self.assertFalse('C5.x' in relevant['P1.x'])
+        self.assertFalse('not.a.var' in relevant['P1.x'])
+        self.assertEqual(len(relevant[None]), 17)
+
+    def test_relevant_cycle(self):
+        p = Problem(Group())
+        root = p.root
+        root.ln_solver = ScipyGMRES()
+
+        root.add('P1', IndepVarComp('x', 2.0))
+        root.add('C1', ExecComp('y = 2.0*x1 + x2'))
+        root.add('C2', ExecComp('y = 2.0*x'))
+        root.add('C3', ExecComp('y = 2.0*x'))
+        root.add('C4', ExecComp('y = 2.0*x'))
+
+        root.connect('P1.x', 'C1.x1')
+        root.connect('C1.y', 'C2.x')
+        root.connect('C2.y', 'C1.x2')
+        root.connect('C2.y', 'C3.x')
+        root.connect('C3.y', 'C4.x')
+
+        p.driver.add_desvar('P1.x')
+        p.driver.add_objective('C3.y')
+
+        p.setup(check=False)
+
+        relevance = root._probdata.relevance
+        self.assertEqual(set(relevance.relevant['P1.x']),
+                         set(['P1.x', 'C1.x1', 'C1.x2', 'C1.y', 'C2.x',
+                              'C2.y', 'C3.x', 'C3.y']))
+        for s in itervalues(root._subsystems):
+            self.assertEqual(relevance.is_relevant_system('C3.y', s),
+                             s.pathname != 'C4')
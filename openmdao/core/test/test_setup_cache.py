@@ -0,0 +1,130 @@
+""" Tests for reusing the structural state of Problem.setup."""
+
+import os
+import pickle
+import unittest
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from openmdao.api import Problem, LinearGaussSeidel
+from openmdao.test.sellar import SellarDerivativesGrouped
+from openmdao.test.util import assert_rel_error
+
+
+class CountedProblem(Problem):
+    """ Problem that counts how often connections get computed."""
+
+    def __init__(self, *args, **kwargs):
+        super(CountedProblem, self).__init__(*args, **kwargs)
+        self.conn_count = 0
+
+    def _setup_connections(self, params_dict, unknowns_dict):
+        self.conn_count += 1
+        return super(CountedProblem, self)._setup_connections(params_dict,
+                                                              unknowns_dict)
+
+
+def _build(con2=False):
+    prob = CountedProblem(root=SellarDerivativesGrouped())
+    prob.root.ln_solver = LinearGaussSeidel()
+    prob.driver.add_desvar('x', lower=0.0, upper=10.0)
+    prob.driver.add_desvar('z', lower=-10.0, upper=10.0)
+    prob.driver.add_objective('obj')
+    prob.driver.add_constraint('con1', upper=0.0)
+    if con2:
+        prob.driver.add_constraint('con2', upper=0.0)
+    return prob
+
+
+class TestSetupCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = mkdtemp()
+        self.fname = os.path.join(self.tempdir, 'sellar.setup')
+
+    def tearDown(self):
+        rmtree(self.tempdir)
+
+    def _check(self, prob, expected):
+        prob.run()
+        assert_rel_error(self, prob['obj'], 28.58830817, 1e-6)
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['x', 'z'], ['obj', 'con1'], mode=mode,
+                                   return_format='dict')
+            for of in ('obj', 'con1'):
+                for wrt in ('x', 'z'):
+                    assert_rel_error(self, J[of][wrt], expected[of][wrt], 1e-6)
+
+    def test_reuse(self):
+        prob = _build()
+        prob.setup(check=False)
+        prob.run()
+        expected = prob.calc_gradient(['x', 'z'], ['obj', 'con1'],
+                                      return_format='dict')
+
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 1)
+        self.assertTrue(os.path.isfile(self.fname))
+        self._check(prob, expected)
+
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 0)
+        self.assertEqual(prob.root.mda.list_order(), ['d1', 'd2'])
+        self._check(prob, expected)
+
+    def test_structure_changed(self):
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 1)
+
+        # A new constraint changes the relevance, so nothing is reused.
+        prob = _build(con2=True)
+        prob.setup(check=False)
+        prob.run()
+        expected = prob.calc_gradient(['z'], ['con2'], mode='rev')
+
+        prob = _build(con2=True)
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 1)
+        prob.run()
+        J = prob.calc_gradient(['z'], ['con2'], mode='rev')
+        assert_rel_error(self, J, expected, 1e-10)
+
+        prob = _build(con2=True)
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 0)
+
+    def test_bad_file(self):
+        with open(self.fname, 'w') as f:
+            f.write("not a setup cache")
+
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 1)
+        prob.run()
+        assert_rel_error(self, prob['obj'], 28.58830817, 1e-6)
+
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 0)
+
+    def test_replace_stale_file(self):
+        prob = _build()
+        prob.setup(check=False, setup_cache=self.fname)
+        with open(self.fname, 'rb') as f:
+            old_key = pickle.load(f)['key']
+
+        # a stale cache file is replaced rather than raising
+        prob = _build(con2=True)
+        prob.setup(check=False, setup_cache=self.fname)
+        self.assertEqual(prob.conn_count, 1)
+        with open(self.fname, 'rb') as f:
+            new_key = pickle.load(f)['key']
+        self.assertNotEqual(new_key, old_key)
+        self.assertEqual(os.listdir(self.tempdir), ['sellar.setup'])
+
+
+if __name__ == "__main__":
+    unittest.main()
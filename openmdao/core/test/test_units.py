@@ -1018,6 +1018,56 @@ class TestUnitConversion(unittest.TestCase):
         self.assertTrue(iter_count < 20)
         self.assertTrue(not np.isnan(prob['sub.cc2.y']))
 
+    def test_converted_storage(self):
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([0.0, 100.0]), units='degC'))
+        sub = root.add('sub', Group())
+        sub.add('tF', ExecComp('y=2.0*x', x=np.zeros(2), y=np.zeros(2),
+                               units={'x': 'degF'}))
+        sub.add('tK', ExecComp('y=3.0*x', x=np.zeros(2), y=np.zeros(2),
+                               units={'x': 'degK'}))
+        sub.add('tC', ExecComp('y=x', x=np.zeros(2), y=np.zeros(2),
+                               units={'x': 'degC'}))
+        root.connect('p.x', ['sub.tF.x', 'sub.tK.x', 'sub.tC.x'])
+        sub.tK.deriv_options['type'] = 'fd'
+        root.ln_solver = ScipyGMRES()
+
+        prob.setup(check=False)
+        prob.run()
+
+        # converted params are stored in their own units, so reading them
+        # gives a view of the vector rather than a converted copy
+        params = sub.tF.params
+        assert_rel_error(self, params._dat['x'].val, np.array([32.0, 212.0]),
+                         1e-10)
+        self.assertTrue(params['x'] is params._dat['x'].val)
+        assert_rel_error(self, sub.tK.params['x'], np.array([273.15, 373.15]),
+                         1e-10)
+        assert_rel_error(self, prob['sub.tF.y'], np.array([64.0, 424.0]),
+                         1e-10)
+
+        # a second transfer doesn't convert the values again
+        prob.run()
+        assert_rel_error(self, params['x'], np.array([32.0, 212.0]), 1e-10)
+
+        outs = ['sub.tF.y', 'sub.tK.y', 'sub.tC.y']
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['p.x'], outs, mode=mode,
+                                   return_format='dict')
+            assert_rel_error(self, J['sub.tF.y']['p.x'], 3.6*np.eye(2), 1e-6)
+            assert_rel_error(self, J['sub.tK.y']['p.x'], 3.0*np.eye(2), 1e-6)
+            assert_rel_error(self, J['sub.tC.y']['p.x'], np.eye(2), 1e-6)
+
+        # check partials works in the units of the params
+        data = prob.check_partial_derivatives(out_stream=None)
+        for key, val in iteritems(data['sub.tF']):
+            assert_rel_error(self, val['J_fwd'], 2.0*np.eye(2), 1e-6)
+            assert_rel_error(self, val['J_rev'], 2.0*np.eye(2), 1e-6)
+            assert_rel_error(self, val['J_fd'], 2.0*np.eye(2), 1e-6)
+
+
 class PBOSrcComp(Component):
 
     def __init__(self):
@@ -1,5 +1,6 @@
 """ Tests for the OpenmDAO vecwrappers."""
 
+import sys
 import unittest
 import numpy as np
 from six import iteritems
@@ -8,6 +9,7 @@ from collections import OrderedDict
 from openmdao.core.vec_wrapper import SrcVecWrapper, TgtVecWrapper
 from openmdao.core.system import System, _SysData
 from openmdao.core.problem import _ProbData
+from openmdao.test.util import assert_rel_error
 
 pbd = _ProbData()
 
@@ -140,6 +142,46 @@ class TestVecWrapper(unittest.TestCase):
         uview2 = u.get_view(s, None, {})
         self.assertEqual(list(uview2.keys()), [])
 
+    def test_view_shares_accessors(self):
+        unknowns_dict = OrderedDict()
+
+        unknowns_dict['C1.y1'] = { 'shape': 1, 'size': 1, 'val': 1.0 }
+        unknowns_dict['C1.y2'] = { 'size': 0, 'val': "foo", 'pass_by_obj': True }
+        unknowns_dict['C2.y3'] = { 'shape': (2,), 'size': 2, 'val': np.zeros(2) }
+
+        sd = _SysData('')
+        for u, meta in unknowns_dict.items():
+            meta['pathname'] = u
+            meta['top_promoted_name'] = u
+            sd.to_prom_name[u] = u
+
+        u = SrcVecWrapper(sd, pbd)
+        u.setup(unknowns_dict, store_byobjs=True)
+
+        self.assertFalse(hasattr(u._dat['C1.y1'], '__dict__'))
+
+        s = System()
+        s._sysdata = _SysData('')
+        s._probdata = pbd
+        view1 = u.get_view(s, None, OrderedDict([('C1.y1', 'y1'),
+                                                 ('C1.y2', 'y2')]))
+        view2 = u.get_view(s, None, OrderedDict([('C2.y3', 'y3')]))
+
+        # the slice of y1 is the same in the view, y3 starts at 0 in its view
+        self.assertTrue(view1._dat['y1'] is u._dat['C1.y1'])
+        self.assertTrue(view1._dat['y2'] is u._dat['C1.y2'])
+        self.assertFalse(view2._dat['y3'] is u._dat['C2.y3'])
+        self.assertEqual(view2._dat['y3'].slice, (0, 2))
+
+        seen = set()
+        usage = u.memory_usage(seen)
+        self.assertEqual(usage['vec'], 24)
+        self.assertTrue(usage['accessors'] > 0)
+
+        # only the dict holding them is counted for shared accessors
+        self.assertEqual(view1.memory_usage(seen)['accessors'],
+                         sys.getsizeof(view1._dat))
+
     def test_flat(self):
         unknowns_dict = OrderedDict()
 
@@ -179,6 +221,33 @@ class TestVecWrapper(unittest.TestCase):
         unorm = u.norm()
         self.assertAlmostEqual(unorm, np.linalg.norm(np.array([2.0, 3.0, -4.0])))
 
+    def test_distance_to_limit_flat_step(self):
+        unknowns_dict = OrderedDict()
+
+        unknowns_dict['y1'] = { 'shape': (2,1), 'size': 2, 'val' : np.array([[2.0], [3.0]]),
+                                'upper': 4.0, 'lower': 0.0 }
+        unknowns_dict['y2'] = { 'shape': 1, 'size': 1, 'val' : -4.0, 'lower': -5.0 }
+
+        sd = _SysData('')
+        for u, meta in unknowns_dict.items():
+            meta['pathname'] = u
+            meta['top_promoted_name'] = u
+            sd.to_prom_name[u] = u
+
+        u = SrcVecWrapper(sd, pbd)
+        u.setup(unknowns_dict, store_byobjs=True)
+        du = SrcVecWrapper(sd, pbd)
+        du.setup(unknowns_dict, store_byobjs=True)
+
+        step = np.array([4.0, -6.0, -2.0])
+        du.vec[:] = step
+
+        # a flat step gives the same result as a step in a VecWrapper
+        alpha = u.distance_along_vector_to_limit(np.ones(3), step)
+        assert_rel_error(self, alpha, [0.5, 0.5, 0.5], 1e-15)
+        alpha = u.distance_along_vector_to_limit(np.ones(3), du)
+        assert_rel_error(self, alpha, [0.5, 0.5, 0.5], 1e-15)
+
     def test_bad_get_unknown(self):
         unknowns_dict = OrderedDict()
 
@@ -0,0 +1,175 @@
+""" Tests for the WorkerPool attached to a Problem."""
+
+import os
+import sys
+import time
+import unittest
+import subprocess
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, \
+                         UniformDriver
+from openmdao.core.problem import _get_root_var
+from openmdao.core.worker_pool import get_worker_data
+from openmdao.util.concurrent import concurrent_eval_lb
+
+
+_EXIT_SCRIPT = """
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp
+prob = Problem(root=Group())
+prob.root.add('p', IndepVarComp('x', 1.0))
+prob.root.add('c', ExecComp('y=2*x'))
+prob.root.connect('p.x', 'c.x')
+prob.setup(check=False)
+prob.get_worker_pool(2)
+"""
+
+
+def _run_model(problem, x):
+    problem['p.x'] = x
+    problem.run_once()
+    return os.getpid(), problem['c.y']
+
+
+def _get_vals(problem, names):
+    return [_get_root_var(problem.root, n) for n in names]
+
+
+def _get_shared(problem, key):
+    return get_worker_data(key)
+
+
+def _fail(problem):
+    raise RuntimeError("task failed")
+
+
+def _square(x):
+    return x*x
+
+
+def _build():
+    prob = Problem(root=Group())
+    prob.root.add('p', IndepVarComp('x', np.ones(2)))
+    prob.root.add('q', IndepVarComp('a', 1.0))
+    prob.root.add('c', ExecComp('y=a*x', x=np.ones(2), y=np.ones(2)))
+    prob.root.connect('p.x', 'c.x')
+    prob.root.connect('q.a', 'c.a')
+    prob.setup(check=False)
+    return prob
+
+
+@unittest.skipIf(sys.platform == 'win32', "relies on fork")
+class TestWorkerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.prob = _build()
+
+    def tearDown(self):
+        self.prob.cleanup()
+
+    def test_reuse_and_sync(self):
+        prob = self.prob
+        pool = prob.get_worker_pool(2)
+
+        pids = set(pool.broadcast(_run_model, np.array([1., 2.]))[i][0]
+                   for i in range(2))
+        self.assertEqual(len(pids), 2)
+        self.assertFalse(os.getpid() in pids)
+
+        # change a value in the parent, which is copied to the same workers
+        prob['q.a'] = 3.0
+        self.assertTrue(prob.get_worker_pool(2) is pool)
+        for pid, y in pool.broadcast(_run_model, np.array([1., 2.])):
+            self.assertTrue(pid in pids)
+            np.testing.assert_array_equal(y, [3., 6.])
+
+        pool.set_values([('q.a', 2.0)])
+        for vals in pool.broadcast(_get_vals, ['q.a']):
+            self.assertEqual(vals, [2.0])
+
+        # a different size replaces the pool
+        self.assertFalse(prob.get_worker_pool(3) is pool)
+        self.assertEqual(pool._procs, [])
+
+    def test_stop_on_setup(self):
+        prob = self.prob
+        pool = prob.get_worker_pool(2)
+        procs = pool._procs
+        prob.setup(check=False)
+        self.assertTrue(prob._worker_pool is None)
+        self.assertFalse(any(p.is_alive() for p in procs))
+
+    def test_imap_share_and_errors(self):
+        pool = self.prob.get_worker_pool(2)
+
+        results = [r for w, r in pool.imap_unordered(_run_model,
+                                                     [(np.array([i, i]),)
+                                                      for i in range(7)],
+                                                     prefetch=2)]
+        self.assertEqual(sorted(y[0] for pid, y in results), list(range(7)))
+
+        pool.share('stuff', [1, 2])
+        self.assertEqual(pool.broadcast(_get_shared, 'stuff'), [[1, 2]]*2)
+        pool.unshare('stuff')
+
+        with self.assertRaises(RuntimeError) as cm:
+            pool.broadcast(_fail)
+        self.assertTrue('task failed' in str(cm.exception))
+
+        # the pool still works after a failed task
+        self.assertEqual(len(pool.broadcast(_get_vals, ['p.x'])), 2)
+
+    def test_concurrent_eval_lb(self):
+        pool = self.prob.get_worker_pool(2)
+        cases = [([i], None) for i in range(11)]
+        results = concurrent_eval_lb(_square, cases, None, chunk_size=3,
+                                     prefetch=2, pool=pool)
+        self.assertEqual(sorted(r[0] for r in results),
+                         [i*i for i in range(11)])
+
+    def test_doe_keep_workers(self):
+        prob = self.prob
+        prob.driver = UniformDriver(num_samples=10, num_par_doe=2)
+        prob.driver.options['keep_workers'] = True
+        prob.driver.add_desvar('q.a', lower=0., upper=1.)
+        prob.driver.add_response('c.y')
+        prob.setup(check=False)
+
+        prob.run()
+        pool = prob._worker_pool
+        pids = [p.pid for p in pool._procs]
+        self.assertEqual(len(list(prob.driver.get_responses())), 10)
+
+        prob.run()
+        self.assertTrue(prob._worker_pool is pool)
+        self.assertEqual([p.pid for p in pool._procs], pids)
+        self.assertEqual(len(list(prob.driver.get_responses())), 10)
+
+    def test_doe_stops_workers(self):
+        prob = self.prob
+        prob.driver = UniformDriver(num_samples=6, num_par_doe=2)
+        prob.driver.add_desvar('q.a', lower=0., upper=1.)
+        prob.driver.add_response('c.y')
+        prob.setup(check=False)
+        prob.run()
+        self.assertTrue(prob._worker_pool is None)
+
+    def test_exit_with_running_pool(self):
+        # a script that leaves a pool running must still exit
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(sys.path)
+        proc = subprocess.Popen([sys.executable, '-c', _EXIT_SCRIPT], env=env)
+        for i in range(300):
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+        else:
+            proc.kill()
+            proc.wait()
+            self.fail("process with a running WorkerPool didn't exit")
+        self.assertEqual(proc.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ from six.moves import cStringIO
 from collections import OrderedDict
 from openmdao.core.fileref import FileRef
 from openmdao.util.string_util import get_common_ancestor
+from openmdao.util.array_util import to_slice
 
 class _ByObjWrapper(object):
     """
@@ -27,8 +28,13 @@ class _ByObjWrapper(object):
 
 # using a slotted object here to save memory
 class Accessor(object):
+
+    __slots__ = ['owned', 'aliased', 'vectype', 'pbo', 'remote', 'probdata',
+                 'val', 'imag_val', 'ro_val', 'slice', 'meta', 'get', 'flat',
+                 'set']
+
     def __init__(self, vecwrapper, slice, val, meta, probdata, alloc_complex,
-                 owned=True, imag_val=None, dangling=False):
+                 owned=True, imag_val=None, dangling=False, aliased=False):
         """ Initialize this accessor.
 
         Args
@@ -62,8 +68,13 @@ class Accessor(object):
 
         dangling : bool, optional
             If True, this variable is an unconnected param.
+
+        aliased : bool, optional
+            If True, this param is a view into the storage of the unknown it
+            is connected to, and has no storage of its own.
         """
         self.owned = owned
+        self.aliased = aliased
         self.vectype = None
 
         self.pbo = bool(dangling or meta.get('pass_by_obj'))
@@ -81,7 +92,7 @@ class Accessor(object):
                     imag_val = val*0.0
                 self.imag_val = imag_val
 
-        if self.remote or self.pbo:
+        if self.remote or self.pbo or aliased:
             self.slice = None
         else:
             self.slice = slice
@@ -92,7 +103,8 @@ class Accessor(object):
 
     def __getstate__(self):
         """ Returns state as a dict. """
-        state = self.__dict__.copy()
+        state = dict((s, getattr(self, s)) for s in self.__slots__
+                     if hasattr(self, s))
         for s in ('get', 'set'):
             state[s] = getattr(self, s).__name__
         if state['flat'] is not None:
@@ -101,12 +113,16 @@ class Accessor(object):
 
     def __setstate__(self, state):
         """ Restore state from `state`. """
-        self.__dict__.update(state)
+        for s, val in iteritems(state):
+            setattr(self, s, val)
         for s in ('get', 'set'):
             setattr(self, s, getattr(self, getattr(self, s)))
         flat = getattr(self, 'flat')
         if flat is not None:
             setattr(self, 'flat', getattr(self, flat))
+        if getattr(self, 'ro_val', None) is not None:
+            self.ro_val = self.val.view()
+            self.ro_val.flags.writeable = False
 
     def _setup_get_funct(self, vecwrapper, meta, alloc_complex):
         """
@@ -121,63 +137,63 @@ class Accessor(object):
         if self.remote:
             return self._remote_access_error, self._remote_access_error
 
-        scale, offset = meta.get('unit_conv', (None, None))
-
         # Pass by Object methods
         if self.pbo:
-            if scale:
+            if 'unit_conv' in meta:
                 return self._get_pbo_units, flatfunc
             else:
                 return self._get_pbo, flatfunc
 
         shape = meta['shape']
-        if vecwrapper.deriv_units:
-            offset = 0.0
         is_scalar = shape == 1
         if is_scalar:
             shapes_same = True
         else:
             shapes_same = (shape == val.size or shape == (val.size,))
 
-        # No unit conversion.
-        # dparams vector does no unit conversion.
-        if scale is None or vecwrapper.deriv_units:
-
+        # An aliased param hands out a read-only view of the unknown it
+        # shares storage with, so in-place writes like params['x'][:] = v
+        # fail rather than changing the unknown.
+        if self.aliased:
+            self.ro_val = self.val.view()
+            self.ro_val.flags.writeable = False
             if alloc_complex:
-                flatfunc = self._get_arr_complex
+                flatfunc = self._get_arr_aliased_complex
                 if is_scalar:
                     func = self._get_scalar_complex
                 elif shapes_same:
                     func = flatfunc
                 else:
-                    func = self._get_arr_diff_shape_complex
+                    func = self._get_arr_diff_shape_aliased_complex
             else:
-                flatfunc = self._get_arr
+                flatfunc = self._get_arr_aliased
                 if is_scalar:
                     func = self._get_scalar
                 elif shapes_same:
                     func = flatfunc
                 else:
-                    func = self._get_arr_diff_shape
+                    func = self._get_arr_diff_shape_aliased
+            return func, flatfunc
 
-        # We have a unit conversion
+        # Unit conversions of vector params are applied to the whole target
+        # vector when data is transferred, so the stored value is already
+        # in the units of the param.
+        if alloc_complex:
+            flatfunc = self._get_arr_complex
+            if is_scalar:
+                func = self._get_scalar_complex
+            elif shapes_same:
+                func = flatfunc
+            else:
+                func = self._get_arr_diff_shape_complex
         else:
-            if alloc_complex:
-                flatfunc = self._get_arr_units_complex
-                if is_scalar:
-                    func = self._get_scalar_units_complex
-                elif shapes_same:
-                    func = flatfunc
-                else:
-                    func = self._get_arr_units_diff_shape_complex
+            flatfunc = self._get_arr
+            if is_scalar:
+                func = self._get_scalar
+            elif shapes_same:
+                func = flatfunc
             else:
-                flatfunc = self._get_arr_units
-                if is_scalar:
-                    func = self._get_scalar_units
-                elif shapes_same:
-                    func = flatfunc
-                else:
-                    func = self._get_arr_units_diff_shape
+                func = self._get_arr_diff_shape
 
         return func, flatfunc
 
@@ -188,6 +204,8 @@ class Accessor(object):
             return self._remote_access_error
         elif self.pbo:
             return self._set_pbo
+        elif self.aliased:
+            return self._aliased_write_error
 
         if meta['shape'] == 1:
             if alloc_complex:
@@ -235,66 +253,39 @@ class Accessor(object):
             val = self.val
         return val.reshape(self.meta['shape'])
 
-    def _get_scalar(self):
-        """Fast scalar."""
-        return self.val[0]
+    def _get_arr_aliased(self):
+        """Read-only array with same shape."""
+        return self.ro_val
 
-    def _get_scalar_complex(self):
-        """Fast scalar, complex support."""
+    def _get_arr_aliased_complex(self):
+        """Read-only array with same shape, complex support."""
         if self.probdata.in_complex_step:
-            return self.val[0] + self.imag_val[0]*1j
-        else:
-            return self.val[0]
-
-    def _get_arr_units(self):
-        """Array with same shape and unit conversion."""
-        scale, offset = self.meta['unit_conv']
-        vec = self.val + offset
-        vec *= scale
-        return vec
-
-    def _get_arr_units_complex(self):
-        """Array with same shape and unit conversion, complex support."""
-        if self.probdata.in_complex_step:
-            val = self.val + self.imag_val*1j
+            return self.val + self.imag_val*1j
         else:
-            val = self.val
-        scale, offset = self.meta['unit_conv']
-        vec = val + offset
-        vec *= scale
-        return vec
+            return self.ro_val
 
-    def _get_arr_units_diff_shape(self):
-        """Array with diff shape and unit conversion."""
-        scale, offset = self.meta['unit_conv']
-        vec = self.val + offset
-        vec *= scale
-        return vec.reshape(self.meta['shape'])
+    def _get_arr_diff_shape_aliased(self):
+        """Read-only array with different shape."""
+        return self.ro_val.reshape(self.meta['shape'])
 
-    def _get_arr_units_diff_shape_complex(self):
-        """Array with diff shape and unit conversion, complex support."""
+    def _get_arr_diff_shape_aliased_complex(self):
+        """Read-only array with different shape, complex support."""
         if self.probdata.in_complex_step:
             val = self.val + self.imag_val*1j
         else:
-            val = self.val
-        scale, offset = self.meta['unit_conv']
-        vec = val + offset
-        vec *= scale
-        return vec.reshape(self.meta['shape'])
+            val = self.ro_val
+        return val.reshape(self.meta['shape'])
 
-    def _get_scalar_units(self):
-        """Scalar with unit conversion."""
-        scale, offset = self.meta['unit_conv']
-        return scale*(self.val[0] + offset)
+    def _get_scalar(self):
+        """Fast scalar."""
+        return self.val[0]
 
-    def _get_scalar_units_complex(self):
-        """Scalar with unit conversion, complex support."""
+    def _get_scalar_complex(self):
+        """Fast scalar, complex support."""
         if self.probdata.in_complex_step:
-            val = self.val[0] + self.imag_val[0]*1j
+            return self.val[0] + self.imag_val[0]*1j
         else:
-            val = self.val[0]
-        scale, offset = self.meta['unit_conv']
-        return scale*(val + offset)
+            return self.val[0]
 
     def _set_arr(self, value):
         """Set an array value."""
@@ -327,6 +318,11 @@ class Accessor(object):
         msg = "Cannot access remote Variable '{name}' in this process."
         raise RuntimeError(msg.format(name=self.meta['pathname']))
 
+    def _aliased_write_error(self, value):
+        msg = ("Cannot set param '{name}' because it shares storage with the "
+               "unknown it is connected to. Set the unknown instead.")
+        raise RuntimeError(msg.format(name=self.meta['pathname']))
+
 class VecWrapper(object):
     """
     A dict-like container of a collection of variables.
@@ -360,9 +356,6 @@ class VecWrapper(object):
         self.vec = None
         self._dat = OrderedDict()
 
-        # Automatic unit conversion in target vectors
-        self.deriv_units = False
-
         # Scaling support in source vectors
         self.vectype = None
 
@@ -373,7 +366,6 @@ class VecWrapper(object):
         self._probdata = probdata
 
         self.scale_cache = None
-        self.units_cache = None
 
     def _flat(self, name):
         """
@@ -566,6 +558,43 @@ class VecWrapper(object):
                 return slice(start, end)
             return self.make_idx_array(start, end)
 
+    def memory_usage(self, seen=None):
+        """
+        Estimates the memory used by this vector.
+
+        Args
+        ----
+        seen : set, optional
+            Ids of objects that have already been counted. Accessors found
+            in it are skipped, and the ids of the ones counted are added, so
+            that accessors shared between views are counted only once.
+
+        Returns
+        -------
+        dict
+            Bytes used by the vector's array data ('vec') and by its
+            `Accessor` objects, their access functions and the dict that
+            holds them ('accessors').
+        """
+        if seen is None:
+            seen = set()
+
+        nbytes = self.vec.nbytes
+        if self.alloc_complex and hasattr(self, 'imag_vec'):
+            nbytes += self.imag_vec.nbytes
+
+        accbytes = sys.getsizeof(self._dat)
+        for acc in itervalues(self._dat):
+            if id(acc) in seen:
+                continue
+            seen.add(id(acc))
+            accbytes += sys.getsizeof(acc)
+            for func in (acc.get, acc.flat, acc.set):
+                if func is not None:
+                    accbytes += sys.getsizeof(func)
+
+        return { 'vec': nbytes, 'accessors': accbytes }
+
     def norm(self):
         """
         Calculates the norm of this vector.
@@ -612,9 +641,8 @@ class VecWrapper(object):
             if name in self._dat:
                 acc = self._dat[name]
                 if acc.pbo or acc.remote:
-                    view._dat[pname] = Accessor(view, None, acc.val, acc.meta,
-                                                self._probdata,
-                                                alloc_complex)
+                    # nothing about these depends on the view, so share them
+                    view._dat[pname] = acc
                 else:
                     pstart, pend = acc.slice
                     if start == -1:
@@ -627,15 +655,19 @@ class VecWrapper(object):
                     end = pend
                     meta = acc.meta
 
-                    if alloc_complex:
-                        imag_val = acc.imag_val
+                    if pstart == view_size:
+                        # same slice in the view, so share the accessor
+                        view._dat[pname] = acc
                     else:
-                        imag_val = None
+                        if alloc_complex:
+                            imag_val = acc.imag_val
+                        else:
+                            imag_val = None
 
-                    view._dat[pname] = Accessor(view,
-                                                (view_size, view_size + meta['size']),
-                                                acc.val, meta, self._probdata,
-                                                alloc_complex, imag_val=imag_val)
+                        view._dat[pname] = Accessor(view,
+                                                    (view_size, view_size + meta['size']),
+                                                    acc.val, meta, self._probdata,
+                                                    alloc_complex, imag_val=imag_val)
                     view_size += meta['size']
 
         if start == -1: # no items found
@@ -876,8 +908,9 @@ class SrcVecWrapper(VecWrapper):
         -----
         alpha: ndarray
             Initial value for step in gradient direction.
-        duvec: `Vecwrapper`
-            Direction to apply step. generally the gradient.
+        duvec: `Vecwrapper` or ndarray
+            Direction to apply step. generally the gradient. An ndarray is
+            laid out like self.vec.
 
         Returns
         --------
@@ -889,6 +922,8 @@ class SrcVecWrapper(VecWrapper):
         old_warn = numpy.geterr()
         numpy.seterr(divide='ignore', invalid='ignore')
 
+        flat = isinstance(duvec, numpy.ndarray)
+
         try:
             for name, meta in iteritems(self):
 
@@ -899,12 +934,20 @@ class SrcVecWrapper(VecWrapper):
                     continue
 
                 val = self[name]
-                idx = duvec._dat[name].slice[0]
+                if flat:
+                    idx, end = self._dat[name].slice
+                    if isinstance(val, float):
+                        step = duvec[idx]
+                    else:
+                        step = duvec[idx:end].reshape(val.shape)
+                else:
+                    idx = duvec._dat[name].slice[0]
+                    step = duvec[name]
 
                 upper = meta.get('upper')
                 if upper is not None:
                     diff = upper - val
-                    alpha_bound = diff/duvec[name]
+                    alpha_bound = diff/step
                     if isinstance(alpha_bound, float):
 
                         # If we are already violated for any reason,
@@ -934,7 +977,7 @@ class SrcVecWrapper(VecWrapper):
                 lower = meta.get('lower')
                 if lower is not None:
                     diff = lower - val
-                    alpha_bound = diff/duvec[name]
+                    alpha_bound = diff/step
                     if isinstance(alpha_bound, float):
 
                         # If we are already violated for any reason,
@@ -1075,12 +1118,9 @@ class TgtVecWrapper(VecWrapper):
             If True, allocate space for the imaginary part of the vector and
             configure all functions to support complex computation.
         """
-        # dparams vector has some additional behavior
-        if not store_byobjs:
-            self.deriv_units = True
-
         src_to_prom_name = srcvec._sysdata.to_prom_name
         scoped_name = self._sysdata._scoped_abs_name
+        aliased = self._probdata.aliased_params if store_byobjs else ()
         vec_size = 0
         missing = []  # names of our params that we don't 'own'
         syspath = self._sysdata.pathname + '.'
@@ -1102,6 +1142,22 @@ class TgtVecWrapper(VecWrapper):
                     slc, val = self._setup_var_meta(pathname, meta, vec_size,
                                                     src_acc, store_byobjs)
 
+                    if pathname in aliased and slc is not None and \
+                            not src_acc.remote:
+                        # view the source value rather than storing a copy
+                        if alloc_complex:
+                            imag_val = src_acc.imag_val
+                        else:
+                            imag_val = None
+                        self._dat[scoped_name(pathname)] = Accessor(self, None,
+                                                                    src_acc.val,
+                                                                    meta,
+                                                                    self._probdata,
+                                                                    alloc_complex,
+                                                                    imag_val=imag_val,
+                                                                    aliased=True)
+                        continue
+
                     if 'remote' not in meta or not meta['remote']:
                         vec_size += meta['size']
 
@@ -1127,7 +1183,7 @@ class TgtVecWrapper(VecWrapper):
 
         # map slices to the array
         for acc in itervalues(self._dat):
-            if not (acc.pbo or acc.remote):
+            if not (acc.pbo or acc.remote or acc.aliased):
                 start, end = acc.slice
                 acc.val = self.vec[start:end]
                 if alloc_complex:
@@ -1153,10 +1209,8 @@ class TgtVecWrapper(VecWrapper):
                                                             newmeta, self._probdata,
                                                             alloc_complex,
                                                             owned=False,
-                                                            imag_val=imag_val)
-
-        if self.deriv_units:
-            self._cache_units()
+                                                            imag_val=imag_val,
+                                                            aliased=parent_acc.aliased)
 
 
     def _setup_var_meta(self, pathname, meta, index, src_acc, store_byobjs):
@@ -1229,33 +1283,107 @@ class TgtVecWrapper(VecWrapper):
             of owned, local params in this `VecWrapper`.
         """
         return [[(n, acc.meta['size']) for n, acc in iteritems(self._dat)
-                        if acc.owned and not acc.pbo]]
+                        if acc.owned and not (acc.pbo or acc.aliased)]]
 
-    def _apply_unit_derivatives(self, rel_inputs=None):
-        """ Applies derivative of the unit conversion factor to params
-        sitting in vector.
+    def _get_unit_conv(self, names):
+        """
+        Collects the unit conversions of the named params into arrays with
+        one entry for each converted entry of this vector, so that they can
+        be applied to all of the params at once.
+
+        Args
+        ----
+        names : iter of str
+            Names of params in this vector. Params that are not stored in
+            this vector or that have no unit conversion are skipped.
+
+        Returns
+        -------
+        tuple
+            (idxs, scale, offset, buf), where idxs is a slice or an index
+            array into the vector, offset is None if all offsets are zero
+            and buf is a work array the size of scale. The tuple is empty
+            if none of the params has a unit conversion.
+        """
+        idxs = []
+        scale = []
+        offset = []
+        for name in names:
+            acc = self._dat[name]
+            if acc.slice is None or 'unit_conv' not in acc.meta:
+                continue
+            start, end = acc.slice
+            sc, off = acc.meta['unit_conv']
+            idxs.append(self.make_idx_array(start, end))
+            scale.append(numpy.full(end - start, sc))
+            offset.append(numpy.full(end - start, off))
+
+        if not idxs:
+            return ()
+
+        idxs = numpy.concatenate(idxs)
+        order = numpy.argsort(idxs, kind='mergesort')
+        idxs = idxs[order]
+        scale = numpy.concatenate(scale)[order]
+        offset = numpy.concatenate(offset)[order]
+        if not offset.any():
+            offset = None
+
+        slc = to_slice(idxs)
+        if isinstance(slc, slice):
+            idxs = slc
+
+        return (idxs, scale, offset, numpy.empty(scale.size))
 
-        rel_inputs : list or None (optional)
-            List of inputs that are relevant for linear solve in a subsystem.
-            This list only includes interior connections and states.
+    def _apply_unit_conv(self, conv):
         """
+        Converts params that were just transferred from the units of their
+        sources to their own units.
 
-        if self.deriv_units:
-            for name, val in self.units_cache:
-                if rel_inputs and name not in rel_inputs:
-                    continue
-                self._dat[name].val *= val
+        Args
+        ----
+        conv : tuple
+            Unit conversion arrays from `_get_unit_conv`.
+        """
+        idxs, scale, offset, buf = conv
+        if isinstance(idxs, slice):
+            vals = self.vec[idxs]
+            if offset is not None:
+                vals += offset
+            vals *= scale
+        else:
+            numpy.take(self.vec, idxs, out=buf)
+            if offset is not None:
+                buf += offset
+            buf *= scale
+            numpy.put(self.vec, idxs, buf)
 
-    def _cache_units(self):
-        """ Caches the scalers so we don't have to do a lot of looping."""
+        # the offset doesn't apply to the imaginary part
+        if self._probdata.in_complex_step:
+            self._apply_unit_derivatives(conv, self.imag_vec)
 
-        units_cache = []
-        for name, acc in iteritems(self._dat):
-            meta = acc.meta
-            if 'unit_conv' in meta:
-                units_cache.append((name, meta['unit_conv'][0]))
+    def _apply_unit_derivatives(self, conv, vec=None):
+        """
+        Applies the derivative of the unit conversion factor to params
+        sitting in the vector.
+
+        Args
+        ----
+        conv : tuple
+            Unit conversion arrays from `_get_unit_conv`.
 
-        self.units_cache = units_cache
+        vec : ndarray, optional
+            Array to scale, if not our vec.
+        """
+        idxs, scale, _, buf = conv
+        if vec is None:
+            vec = self.vec
+        if isinstance(idxs, slice):
+            vec[idxs] *= scale
+        else:
+            numpy.take(vec, idxs, out=buf)
+            buf *= scale
+            numpy.put(vec, idxs, buf)
 
 
 class _PlaceholderVecWrapper(object):
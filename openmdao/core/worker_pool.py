@@ -0,0 +1,405 @@
+"""
+A pool of worker processes that each hold a copy of a `Problem`, so the
+model only has to be shipped to the workers once and can then be run many
+times by drivers, finite difference and `concurrent_eval_lb`.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import atexit
+import pickle
+import logging
+import traceback
+import multiprocessing
+import multiprocessing.util
+from six.moves import range, zip
+
+from openmdao.core.problem import _set_root_var
+
+# pools that are still running in this process, so they can be stopped at
+# exit. Their workers aren't daemons (so they can start pools of their own),
+# and multiprocessing would otherwise wait on them forever when we exit.
+_live_pools = set()
+
+# objects sent to this process by WorkerPool.share, when it's a worker
+_worker_data = {}
+
+
+def _stop_live_pools():
+    for pool in list(_live_pools):
+        pool.stop()
+
+# atexit functions run in reverse order, and multiprocessing.util registers
+# one that waits for all child processes, so it must be imported first.
+atexit.register(_stop_live_pools)
+
+
+def _pool_worker(problem, task_queue, result_queue, worker_id): # pragma: no cover
+    """
+    Runs in each worker process. Tasks are pickled tuples of the form
+    (func, args) and are run as func(problem, *args). Each task puts a tuple
+    of the form (worker_id, pickled_result, err) on the result_queue, where
+    err is a traceback string if the task raised an exception.
+
+    Queues pickle their items in a background thread, so tasks and results
+    are pickled before they're queued. Otherwise a result that is a view of
+    the model's vectors could be changed by the next task before it is sent.
+    """
+    try:
+        # on windows all of our args are pickled, which causes us to lose the
+        # connections between our numpy views and their parent arrays, so force
+        # the problem to setup() again.
+        if sys.platform == 'win32':
+            problem.setup(check=False)
+
+        for task in iter(task_queue.get, None):
+            try:
+                func, args = pickle.loads(task)
+                result = pickle.dumps(func(problem, *args),
+                                      pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                result_queue.put((worker_id, None, traceback.format_exc()))
+            else:
+                result_queue.put((worker_id, result, None))
+    except:
+        logging.error(traceback.format_exc())
+        raise
+    finally:
+        # multiprocessing waits for our children before we exit, so stop any
+        # pools that were started in this worker, e.g., to finite difference.
+        _stop_live_pools()
+
+
+def _set_state(problem, unknowns, params, u_pbos, p_pbos):
+    """
+    Task that copies the state of the parent's model into a worker.
+    """
+    root = problem.root
+    root.unknowns.vec[:] = unknowns
+    root.params.vec[:] = params
+    for name, val in u_pbos:
+        root.unknowns[name] = val
+    for name, val in p_pbos:
+        root.params[name] = val
+
+
+def _store_data(problem, key, obj):
+    """
+    Task that keeps an object in a worker for later tasks to use.
+    """
+    _worker_data[key] = obj
+
+
+def _drop_data(problem, key):
+    """
+    Task that removes an object stored by `_store_data`.
+    """
+    _worker_data.pop(key, None)
+
+
+def get_worker_data(key):
+    """
+    Returns an object that was sent to the current worker process with
+    `WorkerPool.share`.
+
+    Args
+    ----
+    key : str
+        The key the object was shared under.
+    """
+    return _worker_data[key]
+
+
+def _set_values(problem, values):
+    """
+    Task that sets the values of the named variables in a worker.
+    """
+    for name, val in values:
+        _set_root_var(problem.root, name, val)
+
+
+class WorkerPool(object):
+    """
+    A fixed number of worker processes, forked from the process that holds
+    a `Problem` after it has been set up. Each worker keeps its copy of the
+    model for as long as the pool is running, and runs the tasks it is sent
+    on that copy.
+
+    The state of the model in the workers isn't updated automatically when
+    the model changes in the parent. Call `sync` to copy the current values
+    of the variables to the workers, and make a new pool if the structure
+    of the model changes. `Problem.setup` stops any pool attached to the
+    `Problem`.
+
+    Args
+    ----
+    problem : `Problem`
+        The problem that is copied to the workers.
+
+    num_workers : int
+        Number of worker processes.
+    """
+
+    def __init__(self, problem, num_workers):
+        self.problem = problem
+        self.num_workers = num_workers
+        self._pid = os.getpid()
+        self._procs = []
+        self._task_queues = []
+        self._result_queue = None
+        self._outstanding = 0
+
+    def __getstate__(self):
+        """ Processes and queues can't be pickled, so a pickled pool is one
+        that was never started."""
+        state = self.__dict__.copy()
+        state['_procs'] = []
+        state['_task_queues'] = []
+        state['_result_queue'] = None
+        state['_outstanding'] = 0
+        return state
+
+    def start(self):
+        """
+        Start the worker processes.
+        """
+        if sys.platform == 'win32':
+            manager = multiprocessing.Manager()
+            make_queue = manager.Queue
+        else:
+            make_queue = multiprocessing.Queue
+
+        self._result_queue = make_queue()
+        self._task_queues = [make_queue() for i in range(self.num_workers)]
+
+        for i in range(self.num_workers):
+            self._procs.append(multiprocessing.Process(target=_pool_worker,
+                                                args=(self.problem,
+                                                      self._task_queues[i],
+                                                      self._result_queue, i)))
+        for proc in self._procs:
+            proc.start()
+
+        _live_pools.add(self)
+
+    def stop(self):
+        """
+        Tell the worker processes to exit and wait for them to finish.
+        """
+        if self._pid == os.getpid():
+            for queue, proc in zip(self._task_queues, self._procs):
+                if proc.is_alive():
+                    queue.put(None)
+            for proc in self._procs:
+                proc.join()
+
+        self._procs = []
+        self._task_queues = []
+        self._outstanding = 0
+        _live_pools.discard(self)
+
+    def owned(self):
+        """
+        Returns
+        -------
+        bool
+            True if the pool was started by the current process and its
+            workers are all running. A pool that is inherited by a forked
+            process can't be used by that process.
+        """
+        return self._pid == os.getpid() and len(self._procs) > 0 and \
+               all(p.is_alive() for p in self._procs)
+
+    def submit(self, worker, func, *args):
+        """
+        Send a task to a worker. Tasks sent to the same worker are run in
+        the order they were sent.
+
+        Args
+        ----
+        worker : int
+            Index of the worker.
+
+        func : function
+            Function to run, as func(problem, *args), where problem is the
+            worker's copy of the `Problem`. The function and args must be
+            picklable.
+        """
+        self._task_queues[worker].put(pickle.dumps((func, args),
+                                                   pickle.HIGHEST_PROTOCOL))
+        self._outstanding += 1
+
+    def results_ready(self):
+        """
+        Returns
+        -------
+        bool
+            True if the result of a task is waiting to be received.
+        """
+        return not self._result_queue.empty()
+
+    def receive(self):
+        """
+        Wait for a task to finish.
+
+        Returns
+        -------
+        tuple
+            A tuple of the form (worker, result, err), where err is the
+            traceback if the task raised an exception, and None otherwise.
+        """
+        worker, result, err = self._result_queue.get()
+        self._outstanding -= 1
+        if result is not None:
+            result = pickle.loads(result)
+        return worker, result, err
+
+    def broadcast(self, func, *args):
+        """
+        Run a task on every worker and wait for them all to finish.
+
+        Returns
+        -------
+        list
+            The result of the task in each worker.
+
+        Raises
+        ------
+        RuntimeError
+            If the task raised an exception in any of the workers.
+        """
+        if self._outstanding:
+            raise RuntimeError("can't broadcast to a WorkerPool with tasks "
+                               "in progress.")
+
+        for worker in range(self.num_workers):
+            self.submit(worker, func, *args)
+
+        results = [None]*self.num_workers
+        errors = []
+        for i in range(self.num_workers):
+            worker, result, err = self.receive()
+            results[worker] = result
+            if err:
+                errors.append(err)
+
+        if errors:
+            raise RuntimeError("A task failed in a worker process:\n%s" %
+                               errors[0])
+
+        return results
+
+    def imap_unordered(self, func, args_iter, prefetch=1):
+        """
+        Run a task for each set of args, keeping up to `prefetch` tasks
+        queued at each worker.
+
+        Args
+        ----
+        func : function
+            Function to run, as func(problem, *args).
+
+        args_iter : iter of tuples
+            Args for each task. Args are only pulled from the iterator when
+            a worker has room for another task.
+
+        prefetch : int, optional
+            Number of tasks kept queued at each worker.
+
+        Yields
+        ------
+        tuple
+            (worker, result) for each task, in the order they finish.
+
+        Raises
+        ------
+        RuntimeError
+            If a task raised an exception. The tasks still in progress are
+            finished first.
+        """
+        args_iter = iter(args_iter)
+        queued = [0]*self.num_workers
+        more = True
+        errors = []
+
+        while True:
+            # keep the workers busy
+            for i in range(prefetch):
+                for worker in range(self.num_workers):
+                    if more and not errors and queued[worker] <= i:
+                        try:
+                            args = next(args_iter)
+                        except StopIteration:
+                            more = False
+                        else:
+                            self.submit(worker, func, *args)
+                            queued[worker] += 1
+
+            if not any(queued):
+                break
+
+            worker, result, err = self.receive()
+            queued[worker] -= 1
+            if err:
+                errors.append(err)
+            elif not errors:
+                yield worker, result
+
+        if errors:
+            raise RuntimeError("A task failed in a worker process:\n%s" %
+                               errors[0])
+
+    def sync(self):
+        """
+        Copy the current values of the variables in the parent's model to
+        the workers.
+        """
+        root = self.problem.root
+        u_pbos = [(name, root.unknowns[name])
+                  for name, meta in root.unknowns.items()
+                  if meta.get('pass_by_obj')]
+        p_pbos = [(name, root.params[name])
+                  for name, meta in root.params.items()
+                  if meta.get('pass_by_obj')]
+        self.broadcast(_set_state, root.unknowns.vec.copy(),
+                       root.params.vec.copy(), u_pbos, p_pbos)
+
+    def share(self, key, obj):
+        """
+        Send an object to every worker once, rather than with every task
+        that needs it. Tasks get it with `get_worker_data(key)`.
+
+        Args
+        ----
+        key : str
+            Key to store the object under.
+
+        obj : object
+            The object, which must be picklable.
+        """
+        self.broadcast(_store_data, key, obj)
+
+    def unshare(self, key):
+        """
+        Remove an object sent to the workers by `share`.
+
+        Args
+        ----
+        key : str
+            Key the object was stored under.
+        """
+        self.broadcast(_drop_data, key)
+
+    def set_values(self, values):
+        """
+        Set the values of variables, e.g., design variables, in all of the
+        workers.
+
+        Args
+        ----
+        values : iter of (name, value)
+            Names (as seen from the root of the model) and values to set.
+        """
+        self.broadcast(_set_values, list(values))
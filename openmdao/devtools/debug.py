@@ -1,7 +1,7 @@
 """functions useful for debugging openmdao"""
 from __future__ import print_function
 
-from six import itervalues
+from six import itervalues, iteritems
 
 import os
 import sys
@@ -199,3 +199,49 @@ def stats(problem):
 
     print("\nMax mem usage: %s MB" % max_mem_usage())
     print("Current mem usage: %s MB" % mem_usage())
+
+def dump_vec_memory(root, out_stream=sys.stdout):
+    """
+    Writes the estimated memory used by each `VecWrapper` of each `System`
+    in the tree starting at root, and the total. Accessors shared between a
+    vector and its views are counted only once, for the first vector that
+    holds them.
+
+    Args
+    ----
+    root : `System`
+        The node in the `System` tree where the report begins.
+
+    out_stream : file-like, optional
+        Where output is written.  Defaults to sys.stdout.
+
+    Returns
+    -------
+    int
+        Total number of bytes used by the accessors.
+    """
+    seen = set()
+    total = 0
+    template = "%-40s %-14s %12s %12s\n"
+    out_stream.write(template % ('system', 'vector', 'vec bytes', 'acc bytes'))
+
+    for s in root.subsystems(recurse=True, include_self=True):
+        if not s.is_active():
+            continue
+
+        vecs = [('unknowns', s.unknowns), ('resids', s.resids),
+                ('params', s.params)]
+        for prefix, mat in (('dunknowns', s.dumat), ('dresids', s.drmat),
+                            ('dparams', s.dpmat)):
+            for voi, vec in iteritems(mat):
+                name = prefix if voi is None else "%s[%s]" % (prefix, voi)
+                vecs.append((name, vec))
+
+        for name, vec in vecs:
+            usage = vec.memory_usage(seen)
+            total += usage['accessors']
+            out_stream.write(template % (s.pathname or '<root>', name,
+                                         usage['vec'], usage['accessors']))
+
+    out_stream.write("Total accessor bytes: %d\n" % total)
+    return total
@@ -6,6 +6,7 @@ from __future__ import print_function
 
 import sys
 import os
+import time
 import traceback
 import logging
 from itertools import chain
@@ -16,66 +17,76 @@ import multiprocessing
 
 import numpy
 
-from openmdao.core.problem import _get_root_var
+from openmdao.core.problem import _get_root_var, _get_root_var_meta
 from openmdao.core.driver import Driver
 from openmdao.util.record_util import create_local_meta, update_local_meta
 from openmdao.util.array_util import evenly_distrib_idxs
+from openmdao.util.shared_buffer import SharedSlotBuffer
+from openmdao.util.concurrent import ChunkSizer, MAX_CHUNK_SIZE
+from openmdao.core.worker_pool import get_worker_data
 from openmdao.core.mpi_wrap import MPI, debug, any_proc_is_true
 from openmdao.core.system import AnalysisError
 from openmdao.recorders.inmem_recorder import InMemoryRecorder
 
 trace = os.environ.get('OPENMDAO_TRACE')
 
-def worker(problem, response_vars, case_queue, response_queue, worker_id): # pragma: no cover
-    """This is used to run parallel DOEs using multprocessing. It takes a case
-    off of the case_queue, runs it, then puts responses on the response_queue.
+def _run_doe_chunk(problem, worker_id, chunk, shared_vars,
+                   pickled_vars): # pragma: no cover
+    """This is used to run parallel DOEs on the workers of a `WorkerPool`.
+    It runs a chunk of cases, writing the numeric responses of each case
+    into the slot of the shared response buffer that came with it. It
+    returns the metadata and any remaining responses of the cases, along
+    with the time it took to run the chunk.
     """
     # set env var so comps/recorders know they're running in a worker proc
     os.environ['OPENMDAO_WORKER_ID'] = str(worker_id)
 
-    try:
-        # on windows all of our args are pickled, which causes us to lose the
-        # connections between our numpy views and their parent arrays, so force
-        # the problem to setup() again.
-        if sys.platform == 'win32':
-            problem.setup(check=False)
+    resp_buf = get_worker_data('doe_responses')
 
-        driver = problem.driver
-        root = driver.root
+    driver = problem.driver
+    root = driver.root
 
-        terminate = 0
-        for case_id, case in iter(case_queue.get, 'STOP'):
-            #logging.info("worker %d, case id %d, case %s" % (worker_id, case_id, case))
+    start = time.time()
+    completed = []
+    terminate = 0
 
+    for case_id, slot, case in chunk:
+        #logging.info("worker %d, case id %d, case %s" % (worker_id, case_id, case))
+
+        if terminate:
+            # skip the case, but give its slot back
+            completed.append((None, slot, []))
+            continue
+
+        metadata = driver._prep_case(case, case_id)
+
+        try:
+            terminate, exc = driver._try_case(root, metadata)
             if terminate:
-                continue
+                complete_case = (metadata, slot, [])
+            else:
+                resp_buf.write(slot, [_get_root_var(root, n)
+                                      for n in shared_vars])
+                complete_case = (metadata, slot,
+                         [_get_root_var(root, n) for n in pickled_vars])
+        except:
+            # we generally shouldn't get here, but just in case,
+            # handle it so that the main process doesn't wait forever on
+            # the rest of the chunk.
+            if metadata.get('msg'):
+                metadata['msg'] += "\n\n%s" % traceback.format_exc()
+            else:
+                metadata['msg'] = traceback.format_exc()
+            metadata['success'] = 0
+            metadata['terminate'] = 1
+            complete_case = (metadata, slot, [])
 
-            metadata = driver._prep_case(case, case_id)
+        metadata['id'] = case_id
+        terminate = terminate or metadata['terminate']
+        completed.append(complete_case)
 
-            try:
-                terminate, exc = driver._try_case(root, metadata)
-                if terminate:
-                    complete_case = (metadata, [])
-                else:
-                    complete_case = (metadata,
-                             [_get_root_var(root, n) for n in response_vars])
-            except:
-                # we generally shouldn't get here, but just in case,
-                # handle it so that the main process doesn't hang at the
-                # end when it tries to join all of the concurrent processes.
-                if metadata.get('msg'):
-                    metadata['msg'] += "\n\n%s" % traceback.format_exc()
-                else:
-                    metadata['msg'] = traceback.format_exc()
-                metadata['success'] = 0
-                metadata['terminate'] = 1
-                complete_case = (metadata, [])
+    return completed, time.time() - start
 
-            metadata['id'] = case_id
-            response_queue.put(complete_case)
-    except:
-        logging.error(traceback.format_exc())
-        raise
 
 class PredeterminedRunsDriver(Driver):
     """
@@ -89,9 +100,25 @@ class PredeterminedRunsDriver(Driver):
 
     load_balance : bool, Optional
         If True and running under MPI, use rank 0 as master and load balance
-        cases among all of the other ranks. Default is False.  If
-        multiprocessing is being used instead of MPI, then cases are always
-        load balanced.
+        cases among all of the other ranks (or among all ranks, including
+        the master, if options['master_runs'] is True). Default is False.
+        If multiprocessing is being used instead of MPI, then cases are
+        always load balanced.
+
+    Options
+    -------
+    options['auto_add_response'] :  bool(False)
+        If True, all design vars, objectives and constraints are automatically added as responses.
+    options['chunk_size'] :  int(1)
+        Number of cases sent to a worker process at a time when load balancing with multiprocessing. If 0, the number is adapted to the measured run time of the cases.
+    options['keep_workers'] :  bool(False)
+        If True, the worker processes used with multiprocessing are kept running after the run and reused by later runs, until Problem.setup or Problem.cleanup is called or the program exits.
+    options['master_runs'] :  bool(False)
+        If True, the master process also runs cases when load balancing, instead of only handing cases out to the other processes.
+    options['max_chunk_size'] :  int(32)
+        Upper bound on the number of cases in a chunk when chunk_size is 0.
+    options['prefetch'] :  int(1)
+        Number of chunks of cases queued for each worker process when load balancing with multiprocessing.
     """
 
     def __init__(self, num_par_doe=1, load_balance=False):
@@ -102,6 +129,27 @@ class PredeterminedRunsDriver(Driver):
         self.options.add_option('auto_add_response', False,
                        desc="If True, all design vars, objectives and "
                             "constraints are automatically added as responses.")
+        self.options.add_option('chunk_size', 1, lower=0,
+                       desc="Number of cases sent to a worker process at a "
+                            "time when load balancing with multiprocessing. "
+                            "If 0, the number is adapted to the measured run "
+                            "time of the cases.")
+        self.options.add_option('keep_workers', False,
+                       desc="If True, the worker processes used with "
+                            "multiprocessing are kept running after the run "
+                            "and reused by later runs, until Problem.setup or "
+                            "Problem.cleanup is called or the program exits.")
+        self.options.add_option('max_chunk_size', MAX_CHUNK_SIZE, lower=1,
+                       desc="Upper bound on the number of cases in a chunk "
+                            "when chunk_size is 0.")
+        self.options.add_option('master_runs', False,
+                       desc="If True, the master process also runs cases "
+                            "when load balancing, instead of only handing "
+                            "cases out to the other processes.")
+        self.options.add_option('prefetch', 1, lower=1,
+                       desc="Number of chunks of cases queued for each "
+                            "worker process when load balancing with "
+                            "multiprocessing.")
 
         self._num_par_doe = int(num_par_doe)
         self._par_doe_id = 0
@@ -132,7 +180,8 @@ class PredeterminedRunsDriver(Driver):
         # figure out which parallel DOE we are associated with
         if MPI and self._num_par_doe > 1:
             minprocs, maxprocs = root.get_req_procs()
-            if self._load_balance:
+            if self._load_balance and not self.options['master_runs']:
+                # reserve rank 0 for the master
                 sizes, offsets = evenly_distrib_idxs(self._num_par_doe-1,
                                                      comm.size-1)
                 sizes = [1]+list(sizes)
@@ -526,9 +575,10 @@ class PredeterminedRunsDriver(Driver):
     def _run_lb(self, root):
         """This runs the DOE in parallel with load balancing via MPI.  A new case
         is distributed to a worker process as soon as it finishes its
-        previous case.  The rank 0 process is the 'master' process and does
-        not run cases itself.  The master does nothing but distribute the
-        cases to the workers and collect the results.
+        previous case.  The rank 0 process is the 'master' process and
+        distributes the cases to the workers and collects the results.
+        Unless options['master_runs'] is True, the master does not run
+        cases itself.
         """
 
         for case in self._distrib_lb_build_runlist():
@@ -545,6 +595,18 @@ class PredeterminedRunsDriver(Driver):
 
             self.iter_count += 1
 
+    def _run_lb_master_case(self, case):
+        """Runs a case on the master rank, and returns the local vars and
+        metadata in the same form that a worker sends them to the master.
+        """
+        root = self.root
+        metadata = self._prep_case(case, self.iter_count)
+
+        self._try_case(root, metadata)
+
+        params, unknowns, resids = self.recorders._get_local_case_data(root)
+        return (self._full_comm.rank, params, unknowns, resids, metadata)
+
     def _build_case(self, meta, uvars, pvars, numuvars, values):
         """
         Given values returned from a multiproc run, construct
@@ -563,10 +625,93 @@ class PredeterminedRunsDriver(Driver):
                   'meta': meta
                }
 
+    def _get_shared_responses(self, root, names):
+        """
+        Returns a list of the shapes of the named responses as stored in a
+        `SharedSlotBuffer` (None for floats), with False for responses that
+        aren't numeric and have to be pickled instead.
+        """
+        shapes = []
+        for name in names:
+            val = _get_root_var(root, name)
+            if _get_root_var_meta(root, name).get('pass_by_obj'):
+                shapes.append(False)
+            elif isinstance(val, float):
+                shapes.append(None)
+            elif isinstance(val, numpy.ndarray) and val.dtype == float:
+                shapes.append(val.shape)
+            else:
+                shapes.append(False)
+        return shapes
+
+    def _record_worker_case(self, root, completed, resp_buf, shapes, uvars,
+                            pvars, numuvars):
+        """
+        Records a case completed by a multiprocessing worker and frees its
+        slot in the response buffer. Returns the recorded case, or None if
+        the worker had a fatal error or skipped the case.
+        """
+        meta, slot, pickled = completed
+
+        if meta is None:
+            # skipped by a worker that was terminating
+            resp_buf.release(slot)
+            return None
+
+        #logging.info("RECEIVED: %d" % meta['id'])
+        if meta['terminate']:
+            values = []
+        else:
+            shared = iter(resp_buf.read(slot))
+            pickled = iter(pickled)
+            values = [next(pickled) if s is False else next(shared)
+                      for s in shapes]
+
+        complete_case = self._build_case(meta, uvars, pvars, numuvars, values)
+        if complete_case is not None:
+            # recorders get views of the buffer, so they have to be done
+            # with the values before the slot is reused
+            self.recorders.record_completed_case(root, complete_case)
+
+        resp_buf.release(slot)
+
+        return complete_case
+
+    def _run_local_case(self, root, case, case_id, response_vars, uvars,
+                        pvars, numuvars):
+        """
+        Runs a case in the main process of a multiprocessing DOE and records
+        it. Returns the recorded case, or None if the case had a fatal error.
+        """
+        metadata = self._prep_case(case, case_id)
+        self._try_case(root, metadata)
+        metadata['id'] = case_id
+
+        if metadata['terminate']:
+            values = []
+        else:
+            values = [_get_root_var(root, n) for n in response_vars]
+
+        complete_case = self._build_case(metadata, uvars, pvars, numuvars,
+                                         values)
+        if complete_case is not None:
+            self.recorders.record_completed_case(root, complete_case)
+
+        return complete_case
+
     def _run_lb_multiproc(self, problem):
         """This runs the DOE in parallel with load balancing via
-        multiprocessing.  A new case is distributed to a worker process as
-        soon as it finishes its previous case.
+        multiprocessing.  The cases run on the workers of the Problem's
+        `WorkerPool`, which are only kept running for later runs if
+        options['keep_workers'] is True. Cases are sent to the workers in chunks, and up to
+        options['prefetch'] chunks are queued for each worker, so a worker
+        can start on a new chunk as soon as it finishes its last one. If
+        options['master_runs'] is True, the pool has one less worker and the
+        main process runs cases whenever no results are waiting.
+
+        Numeric responses are passed back from the workers through slots of
+        a buffer in shared memory, one for each case in progress, so only
+        the case metadata and any pass_by_obj responses are pickled.
         """
         root = problem.root
 
@@ -575,78 +720,107 @@ class PredeterminedRunsDriver(Driver):
         response_vars = uvars + pvars
         numuvars = len(uvars)
 
-        runiter = self._build_runlist()
+        chunk_size = self.options['chunk_size']
+        max_chunk_size = self.options['max_chunk_size']
+        prefetch = self.options['prefetch']
+        master_runs = self.options['master_runs']
+        sizer = ChunkSizer(chunk_size, max_size=max_chunk_size)
 
-        # Create queues
-        if sys.platform == 'win32':
-            manager = multiprocessing.Manager()
-            task_queue = manager.Queue()
-            done_queue = manager.Queue()
-        else:
-            task_queue = multiprocessing.Queue()
-            done_queue = multiprocessing.Queue()
+        # with master_runs, the main process takes the place of worker 0
+        first_id = 1 if master_runs else 0
+        num_workers = self._num_par_doe - first_id
+        max_queued = num_workers * prefetch
 
-        procs = []
-        terminating = False
+        shapes = self._get_shared_responses(root, response_vars)
+        shared_vars = [n for n, s in zip(response_vars, shapes) if s is not False]
+        pickled_vars = [n for n, s in zip(response_vars, shapes) if s is False]
+        resp_buf = SharedSlotBuffer([s for s in shapes if s is not False],
+                                    max_queued * (chunk_size or max_chunk_size))
+
+        runiter = self._build_runlist()
 
-        # Start worker processes
-        for i in range(self._num_par_doe):
-            procs.append(multiprocessing.Process(target=worker,
-                                                 args=(problem, response_vars,
-                                                 task_queue, done_queue, i)))
+        pool = problem.get_worker_pool(num_workers)
 
-        for proc in procs:
-            proc.start()
+        # the buffer is sent to each worker once, rather than with each chunk
+        pool.share('doe_responses', resp_buf)
 
-        iter_count = 0
-        num_active = 0
-        empty = {}
+        ok = False
         try:
-            for proc in procs:
-                # case is a generator, so must make a list to send
-                case = list(next(runiter))
-                task_queue.put((iter_count, case))
-                iter_count += 1
-                num_active += 1
-        except StopIteration:
-            pass
-        else:
-            try:
-                while num_active > 0:
-                    meta, values = done_queue.get()
-                    #logging.info("RECEIVED: %d, %s" % (meta['id'], values[2]))
-                    complete_case = self._build_case(meta, uvars, pvars,
-                                                     numuvars, values)
-                    num_active -= 1
-                    if complete_case is None:
-                        # there was a fatal error, don't run more cases
-                        break
+            # chunks queued at each worker
+            queued = [0]*num_workers
 
-                    self.recorders.record_completed_case(root, complete_case)
-                    case = list(next(runiter))
-                    task_queue.put((iter_count, case))
-                    iter_count += 1
-                    num_active += 1
-            except StopIteration:
-                pass
-
-        # tell all workers we're done
-        for proc in procs:
-            task_queue.put('STOP')
-
-        for i in range(num_active):
-            meta, values = done_queue.get()
-            #logging.info("RECEIVED: %d, %s" % (meta['id'], values[0]))
-            complete_case = self._build_case(meta, uvars, pvars,
-                                             numuvars, values)
-            if complete_case is None:
-                # had a fatal error, don't record
-                continue
+            iter_count = 0
+            terminating = False
+            sending = True
 
-            self.recorders.record_completed_case(root, complete_case)
+            while True:
+                # keep the workers' queues full
+                while sending and not terminating:
+                    worker = queued.index(min(queued))
+                    if queued[worker] >= prefetch:
+                        break
+                    cases = sizer.next_chunk(runiter,
+                                             limit=resp_buf.num_free())
+                    if not cases:
+                        sending = False
+                        break
+                    chunk = []
+                    for case in cases:
+                        # case is a generator, so must make a list to send
+                        chunk.append((iter_count, resp_buf.acquire(),
+                                      list(case)))
+                        iter_count += 1
+                    pool.submit(worker, _run_doe_chunk, worker + first_id,
+                                chunk, shared_vars, pickled_vars)
+                    queued[worker] += 1
+
+                if master_runs and sending and not terminating and \
+                   not pool.results_ready():
+                    # no results are waiting, so run a case here
+                    case = next(runiter, None)
+                    if case is not None:
+                        if self._run_local_case(root, list(case), iter_count,
+                                                response_vars, uvars, pvars,
+                                                numuvars) is None:
+                            terminating = True
+                        iter_count += 1
+                        continue
+
+                if not any(queued):
+                    break
+
+                worker, result, err = pool.receive()
+                queued[worker] -= 1
+
+                if err:
+                    # we generally shouldn't get here, since the worker
+                    # handles errors in the cases themselves
+                    print("Worker %d has failed. No more new cases will be "
+                          "distributed. Worker traceback was:\n%s" %
+                          (worker + first_id, err))
+                    terminating = True
+                    continue
+
+                completed, elapsed = result
+                sizer.update(len(completed), elapsed)
+
+                for comp in completed:
+                    case = self._record_worker_case(root, comp, resp_buf,
+                                                    shapes, uvars, pvars,
+                                                    numuvars)
+                    if case is None and comp[0] is not None:
+                        # there was a fatal error, don't run more cases
+                        terminating = True
 
-        for proc in procs:
-            proc.join()
+            ok = True
+        finally:
+            if ok and self.options['keep_workers']:
+                pool.unshare('doe_responses')
+            else:
+                # tasks may still be in progress after an error, so the
+                # workers can't be reused
+                problem.close_worker_pool()
+            resp_buf.close()
 
     def _get_case_w_nones(self, it):
         """A wrapper around a case generator that returns None cases if
@@ -717,12 +891,16 @@ class PredeterminedRunsDriver(Driver):
                 for i in range(size):
                     doe_ids[i+offset] = doe_id
 
+            master_runs = self.options['master_runs']
+            more_cases = True
+
             # seed the workers
             for i in range(1, self._num_par_doe):
                 try:
                     # case is a generator, so must make a list to send
                     case = list(next(runiter))
                 except StopIteration:
+                    more_cases = False
                     break
                 size, offset = self._id_map[i]
                 # send the case to all of the subprocs that will work on it
@@ -735,78 +913,95 @@ class PredeterminedRunsDriver(Driver):
                     cases[i]['count'] += 1
                     sent += 1
 
-            # send the rest of the cases
-            if sent > 0:
-                more_cases = True
-                while True:
+            # send the rest of the cases, and don't stop until we hear back
+            # from every worker process we sent a case to
+            while received < sent or (master_runs and more_cases):
+                if master_runs and more_cases and cases[0]['count'] == 0 and \
+                   (received == sent or not comm.iprobe(tag=2)):
+                    # no results are waiting, so the master runs a case
+                    try:
+                        case = list(next(runiter))
+                    except StopIteration:
+                        more_cases = False
+                        continue
+
+                    # the rest of the procs in the master's doe work on the
+                    # case along with the master
+                    size, offset = self._id_map[0]
+                    cases[0]['terminate'] = 0
+                    cases[0]['meta'] = {'success': 1, 'msg': ''}
+                    for j in range(1, size):
+                        comm.send(case, j+offset, tag=1)
+                    cases[0]['count'] += size
+                    sent += size
+
+                    worker, p, u, r, meta = self._run_lb_master_case(case)
+                else:
                     if trace: # pragma: no cover
                         debug("Waiting on case")
                     worker, p, u, r, meta = comm.recv(tag=2)
                     if trace:  # pragma: no cover
                         debug("Case Recieved from Worker %d" % worker )
 
-                    received += 1
-
-                    caseinfo = cases[doe_ids[worker]]
-                    caseinfo['count'] -= 1
-                    caseinfo['p'].update(p)
-                    caseinfo['u'].update(u)
-                    caseinfo['r'].update(r)
-
-                    # save certain parts of existing metadata so we don't hide failures
-                    oldmeta = caseinfo['meta']
-                    success = oldmeta['success']
-                    if not success:
-                        msg = oldmeta['msg']
-                        oldmeta.update(meta)
-                        oldmeta['success'] = success
-                        oldmeta['msg'] = msg
-                    else:
-                        oldmeta.update(meta)
+                received += 1
+
+                caseinfo = cases[doe_ids[worker]]
+                caseinfo['count'] -= 1
+                caseinfo['p'].update(p)
+                caseinfo['u'].update(u)
+                caseinfo['r'].update(r)
+
+                # save certain parts of existing metadata so we don't hide failures
+                oldmeta = caseinfo['meta']
+                success = oldmeta['success']
+                if not success:
+                    msg = oldmeta['msg']
+                    oldmeta.update(meta)
+                    oldmeta['success'] = success
+                    oldmeta['msg'] = msg
+                else:
+                    oldmeta.update(meta)
 
-                    caseinfo['terminate'] += meta.get('terminate', 0)
+                caseinfo['terminate'] += meta.get('terminate', 0)
 
-                    if caseinfo['count'] == 0:
-                        # we've received case from all procs with that doe_id
-                        # so the case is complete.
+                if caseinfo['count'] == 0:
+                    # we've received case from all procs with that doe_id
+                    # so the case is complete.
 
-                        # worker has experienced some critical error, so we'll
-                        # stop sending new cases and start to wrap things up
-                        if caseinfo['terminate'] > 0:
-                            more_cases = False
-                            print("Worker %d has requested termination. No more new "
-                                  "cases will be distributed. Worker traceback was:\n%s" %
-                                  (worker, meta['msg']))
-                        else:
+                    # worker has experienced some critical error, so we'll
+                    # stop sending new cases and start to wrap things up
+                    if caseinfo['terminate'] > 0:
+                        more_cases = False
+                        print("Worker %d has requested termination. No more new "
+                              "cases will be distributed. Worker traceback was:\n%s" %
+                              (worker, meta['msg']))
+                    else:
 
-                            # Send case to recorders
-                            yield caseinfo
-
-                            if more_cases:
-                                try:
-                                    case = list(next(runiter))
-                                except StopIteration:
-                                    more_cases = False
-                                else:
-                                    # send a new case to every proc that works on
-                                    # cases with the current worker
-                                    doe = doe_ids[worker]
-                                    size, offset = self._id_map[doe]
-                                    cases[doe]['terminate'] = 0
-                                    cases[doe]['meta'] = {'success': 1, 'msg': ''}
-                                    for j in range(size):
-                                        if trace: # pragma: no cover
-                                            debug("Sending New Case to Worker %d" % worker )
-                                        comm.send(case, j+offset, tag=1)
-                                        if trace: # pragma: no cover
-                                            debug("Case Sent to Worker %d" % worker )
-                                        cases[doe]['count'] += 1
-                                        sent += 1
-
-                    # don't stop until we hear back from every worker process
-                    # we sent a case to
-                    if received == sent:
-                        break
+                        # Send case to recorders
+                        yield caseinfo
+
+                        if more_cases and not (master_runs and
+                                               doe_ids[worker] == 0):
+                            # (the master starts its own cases when it's free)
+                            try:
+                                case = list(next(runiter))
+                            except StopIteration:
+                                more_cases = False
+                            else:
+                                # send a new case to every proc that works on
+                                # cases with the current worker
+                                doe = doe_ids[worker]
+                                size, offset = self._id_map[doe]
+                                cases[doe]['terminate'] = 0
+                                cases[doe]['meta'] = {'success': 1, 'msg': ''}
+                                for j in range(size):
+                                    if trace: # pragma: no cover
+                                        debug("Sending New Case to Worker %d" % worker )
+                                    comm.send(case, j+offset, tag=1)
+                                    if trace: # pragma: no cover
+                                        debug("Case Sent to Worker %d" % worker )
+                                    cases[doe]['count'] += 1
+                                    sent += 1
 
             # tell all workers to stop
             for rank in range(1, self._full_comm.size):
@@ -74,6 +74,10 @@ class pyOptSparseDriver(Driver):
         Finite difference implementation to use ('snopt_fd' may only be used with SNOPT)
     options['title'] :  str('Optimization using pyOpt_sparse')
         Title of this optimization run
+    options['total_coloring'] :  bool(False)
+        Compute a total derivative coloring before optimizing, and use it to
+        combine linear solves and to declare the sparsity of the nonlinear
+        constraint jacobians.
     """
 
     def __init__(self):
@@ -102,6 +106,11 @@ class pyOptSparseDriver(Driver):
         self.options.add_option('gradient method', 'openmdao',
                                 values={'openmdao', 'pyopt_fd', 'snopt_fd'},
                                 desc='Finite difference implementation to use')
+        self.options.add_option('total_coloring', False,
+                                desc='Compute a total derivative coloring before '
+                                'optimizing, and use it to combine linear solves '
+                                'and to declare the sparsity of the nonlinear '
+                                'constraint jacobians.')
 
         # The user places optimizer-specific settings in here.
         self.opt_settings = {}
@@ -123,6 +132,8 @@ class pyOptSparseDriver(Driver):
         self.sparsity = OrderedDict()
         self.sub_sparsity = OrderedDict()
         self.active_tols = {}
+        self.coloring = None
+        self.color_sparsity = OrderedDict()
 
     def _setup(self):
         self.supports['gradients'] = self.options['optimizer'] in grad_drivers
@@ -220,7 +231,16 @@ class pyOptSparseDriver(Driver):
 
         # Add all equality constraints
         econs = self.get_constraints(ctype='eq', lintype='nonlinear')
+        incons = self.get_constraints(ctype='ineq', lintype='nonlinear')
         con_meta = self.get_constraint_metadata()
+
+        self.coloring = None
+        self.color_sparsity = OrderedDict()
+        if self.options['total_coloring'] and \
+           self.options['gradient method'] == 'openmdao':
+            self._setup_coloring(problem, list(econs) + list(incons), param_meta,
+                                 con_meta)
+
         self.quantities += list(econs)
 
         self.active_tols = {}
@@ -240,8 +260,12 @@ class pyOptSparseDriver(Driver):
                                      jac=self.lin_jacs[name])
             else:
 
-                jac = self._build_sparse(name, wrt, size, param_vals,
-                                         sub_param_conns, full_param_conns, rels)
+                if name in self.color_sparsity:
+                    wrt, jac = self._color_jac(name, size, param_vals)
+                    self.sparsity[name] = wrt
+                else:
+                    jac = self._build_sparse(name, wrt, size, param_vals,
+                                             sub_param_conns, full_param_conns, rels)
                 opt_prob.addConGroup(name, size, lower=lower, upper=upper,
                                      wrt=wrt, jac=jac)
 
@@ -250,7 +274,6 @@ class pyOptSparseDriver(Driver):
                 self.active_tols[name] = active_tol
 
         # Add all inequality constraints
-        incons = self.get_constraints(ctype='ineq', lintype='nonlinear')
         self.quantities += list(incons)
 
         for name in self.get_constraints(ctype='ineq'):
@@ -272,8 +295,12 @@ class pyOptSparseDriver(Driver):
                                      jac=self.lin_jacs[name])
             else:
 
-                jac = self._build_sparse(name, wrt, size, param_vals,
-                                         sub_param_conns, full_param_conns, rels)
+                if name in self.color_sparsity:
+                    wrt, jac = self._color_jac(name, size, param_vals)
+                    self.sparsity[name] = wrt
+                else:
+                    jac = self._build_sparse(name, wrt, size, param_vals,
+                                             sub_param_conns, full_param_conns, rels)
                 opt_prob.addConGroup(name, size, upper=upper, lower=lower,
                                      wrt=wrt, jac=jac)
 
@@ -348,6 +375,87 @@ class pyOptSparseDriver(Driver):
         except KeyError: #nothing is here, so something bad happened!
             self.exit_flag = 0
 
+    def _setup_coloring(self, problem, cons, param_meta, con_meta):
+        """ Compute the total derivative coloring for the objectives and
+        nonlinear constraints, and pull out the nonzero structure of every
+        constraint/design variable block.
+
+        Args
+        ----
+        problem : `Problem`
+            Our parent `Problem`.
+        cons : list
+            Names of the nonlinear constraints, in the order they are added.
+        param_meta : dict
+            Design variable metadata.
+        con_meta : dict
+            Constraint metadata.
+        """
+        quantities = self.quantities + cons
+        self.coloring = coloring = problem.compute_total_coloring(self.indep_list,
+                                                                  quantities)
+        rows, cols = coloring['rows'], coloring['cols']
+
+        col_ranges = OrderedDict()
+        start = 0
+        for name in self.indep_list:
+            col_ranges[name] = (start, start + param_meta[name]['size'])
+            start += param_meta[name]['size']
+
+        start = 0
+        obj_meta = self.get_objectives()
+        for name in quantities:
+            if name in con_meta:
+                size = con_meta[name]['size']
+            else:
+                size = np.size(obj_meta[name])
+            end = start + size
+
+            if name in cons:
+                blocks = OrderedDict()
+                in_rows = (rows >= start) & (rows < end)
+                for dv, (c_start, c_end) in iteritems(col_ranges):
+                    mask = in_rows & (cols >= c_start) & (cols < c_end)
+                    if np.any(mask):
+                        blocks[dv] = (rows[mask] - start, cols[mask] - c_start)
+
+                # pyoptsparse needs at least one design variable per
+                # constraint, so one without any nonzeros keeps the sparsity
+                # from relevance.
+                if blocks:
+                    self.color_sparsity[name] = blocks
+
+            start = end
+
+    def _color_jac(self, name, consize, param_vals):
+        """ Build the pyoptsparse coo jacobian structure of a nonlinear
+        constraint from its total derivative coloring.
+
+        Args
+        ----
+        name : str
+            Constraint name.
+        consize : int
+            Width of this constraint.
+        param_vals : dict
+            Dictionary of parameter values; used for sizing.
+
+        Returns
+        -------
+        list
+            Design variables that this constraint depends on.
+        dict
+            pyoptsparse coo matrix for each of those design variables.
+        """
+        jac = {}
+        for param, (row, col) in iteritems(self.color_sparsity[name]):
+            coo = {}
+            coo['shape'] = [consize, len(param_vals[param])]
+            coo['coo'] = [row, col, np.ones(len(row))]
+            jac[param] = coo
+
+        return list(jac), jac
+
     def _build_sparse(self, name, wrt, consize, param_vals, sub_param_conns,
                       full_param_conns, rels):
         """ Build up the data structures that define a sparse Jacobian
@@ -544,10 +652,17 @@ class pyOptSparseDriver(Driver):
                         inactives[name] = inactive_idx
 
             try:
-                sens_dict = self.calc_gradient(dv_dict, self.quantities,
-                                               return_format='dict',
-                                               sparsity=self.sparsity,
-                                               inactives=inactives)
+                if self.coloring is not None:
+                    sens_dict = self.calc_gradient(self.indep_list, self.quantities,
+                                                   return_format='dict',
+                                                   sparsity=self.sparsity,
+                                                   inactives=inactives,
+                                                   coloring=self.coloring)
+                else:
+                    sens_dict = self.calc_gradient(dv_dict, self.quantities,
+                                                   return_format='dict',
+                                                   sparsity=self.sparsity,
+                                                   inactives=inactives)
 
             # Let the optimizer try to handle the error
             except AnalysisError:
@@ -585,6 +700,15 @@ class pyOptSparseDriver(Driver):
                     coo['coo'] = [np.array(row), np.array(col), np.array(data)]
                     sens_dict[con][desvar] = coo
 
+            # Only the colored nonzeros were declared to pyoptsparse.
+            for con, val1 in iteritems(self.color_sparsity):
+                for desvar, (row, col) in iteritems(val1):
+                    jac = sens_dict[con][desvar]
+                    coo = {}
+                    coo['shape'] = list(jac.shape)
+                    coo['coo'] = [row, col, jac[row, col]]
+                    sens_dict[con][desvar] = coo
+
         except Exception as msg:
             tb = traceback.format_exc()
 
@@ -1,12 +1,92 @@
 
 import unittest
 
+import numpy as np
+
 from openmdao.api import IndepVarComp, Component, Group, Problem, \
                          FullFactorialDriver, AnalysisError
 from openmdao.test.exec_comp_for_test import ExecComp4Test
 
+class ArrayOut(Component):
+    def __init__(self):
+        super(ArrayOut, self).__init__()
+        self.add_param('x', 1.0)
+        self.add_output('y', np.zeros((2, 3)))
+        self.add_output('label', '', pass_by_obj=True)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = np.arange(6.0).reshape(2, 3) * params['x']
+        unknowns['label'] = 'x=%g' % params['x']
+
+
 class LBParallelDOETestCase6(unittest.TestCase):
 
+    def test_multiproc_array_responses(self):
+
+        problem = Problem()
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=1.0))
+        root.add('comp', ArrayOut())
+        root.connect('indep_var.x', 'comp.x')
+
+        num_levels = 10
+        problem.driver = FullFactorialDriver(num_levels=num_levels,
+                                             num_par_doe=3,
+                                             load_balance=True)
+        problem.driver.add_desvar('indep_var.x',
+                                  lower=1.0, upper=float(num_levels))
+        problem.driver.add_response(['comp.y', 'comp.label', 'comp.x'])
+
+        problem.setup(check=False)
+        problem.run()
+
+        xs = []
+        for responses, success, msg in problem.driver.get_responses():
+            responses = dict(responses)
+            x = responses['comp.x']
+            xs.append(x)
+            self.assertTrue(success)
+            self.assertEqual(responses['comp.label'], 'x=%g' % x)
+            np.testing.assert_array_equal(responses['comp.y'],
+                                          np.arange(6.0).reshape(2, 3) * x)
+
+        self.assertEqual(sorted(xs), [float(i) for i in range(1, 11)])
+
+    def test_multiproc_chunks(self):
+
+        for chunk_size, prefetch in [(3, 2), (0, 1)]:
+            problem = Problem()
+            root = problem.root = Group()
+            root.add('indep_var', IndepVarComp('x', val=1.0))
+            root.add('comp', ArrayOut())
+            root.connect('indep_var.x', 'comp.x')
+
+            num_levels = 20
+            problem.driver = FullFactorialDriver(num_levels=num_levels,
+                                                 num_par_doe=3,
+                                                 load_balance=True)
+            problem.driver.options['chunk_size'] = chunk_size
+            problem.driver.options['max_chunk_size'] = 4
+            problem.driver.options['prefetch'] = prefetch
+            problem.driver.add_desvar('indep_var.x',
+                                      lower=1.0, upper=float(num_levels))
+            problem.driver.add_response(['comp.y', 'comp.x'])
+
+            problem.setup(check=False)
+            problem.run()
+
+            xs = []
+            for responses, success, msg in problem.driver.get_responses():
+                responses = dict(responses)
+                x = responses['comp.x']
+                xs.append(x)
+                self.assertTrue(success)
+                np.testing.assert_array_equal(responses['comp.y'],
+                                              np.arange(6.0).reshape(2, 3) * x)
+
+            self.assertEqual(sorted(xs),
+                             [float(i) for i in range(1, num_levels+1)])
+
     def test_multiproc_doe(self):
 
         problem = Problem()
@@ -40,6 +120,51 @@ class LBParallelDOETestCase6(unittest.TestCase):
 
         self.assertEqual(num_cases, num_levels)
 
+    def test_multiproc_master_runs(self):
+
+        problem = Problem()
+        root = problem.root = Group()
+        root.add('indep_var', IndepVarComp('x', val=1.0))
+        root.add('const', IndepVarComp('c', val=2.0))
+        root.add('mult', ExecComp4Test("y=c*x", nl_delay=0.05))
+
+        root.connect('indep_var.x', 'mult.x')
+        root.connect('const.c', 'mult.c')
+
+        num_levels = 25
+        num_par_doe = 3
+        problem.driver = FullFactorialDriver(num_levels=num_levels,
+                                             num_par_doe=num_par_doe,
+                                             load_balance=True)
+        problem.driver.options['auto_add_response'] = True
+        problem.driver.options['master_runs'] = True
+        problem.driver.options['prefetch'] = 2
+
+        problem.driver.add_desvar('indep_var.x',
+                                  lower=1.0, upper=float(num_levels))
+        problem.driver.add_objective('mult.y')
+        problem.driver.add_response('mult.case_rank')
+
+        problem.setup(check=False)
+        problem.run()
+
+        xs = []
+        ranks = set()
+        for responses, success, msg in problem.driver.get_responses():
+            responses = dict(responses)
+            self.assertTrue(success)
+            self.assertEqual(responses['indep_var.x']*2.0,
+                             responses['mult.y'])
+            xs.append(responses['indep_var.x'])
+            ranks.add(responses['mult.case_rank'])
+
+        self.assertEqual(sorted(xs), [float(i) for i in range(1, num_levels+1)])
+
+        # the main process (rank 0) runs cases along with the
+        # num_par_doe-1 worker processes
+        self.assertTrue(0 in ranks)
+        self.assertTrue(ranks.issubset(set(range(num_par_doe))))
+
     def test_load_balanced_doe_crit_fail(self):
 
         problem = Problem()
@@ -1765,5 +1765,42 @@ class TestPyoptSparse(unittest.TestCase, ConcurrentTestCaseMixin):
         driver_issues = checks['driver_issues']['active_tol']
         self.assertEqual(driver_issues, ['ci', 'cia'])
 
+    def test_total_coloring(self):
+
+        prob = Problem()
+        root = prob.root = Group()
+
+        root.add('p1', IndepVarComp('x', np.zeros(4)), promotes=['*'])
+        root.add('obj', ExecComp('o = sum((x - 3.0)**2)', x=np.zeros(4)),
+                 promotes=['*'])
+        root.add('con1', ExecComp('c = x**2', c=np.zeros(4), x=np.zeros(4)),
+                 promotes=['*'])
+        root.add('con2', ExecComp('k = 0.0*x + 1.0', k=np.zeros(4), x=np.zeros(4)),
+                 promotes=['*'])
+
+        prob.driver = pyOptSparseDriver()
+        prob.driver.options['optimizer'] = OPTIMIZER
+        prob.driver.options['print_results'] = False
+        prob.driver.options['total_coloring'] = True
+        prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+
+        prob.driver.add_objective('o')
+        prob.driver.add_constraint('c', upper=4.0)
+        prob.driver.add_constraint('k', upper=2.0)
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['x'], 2.0*np.ones(4), 1e-5)
+        assert_rel_error(self, prob['o'], 4.0, 1e-5)
+
+        # dc/dx is zero at the starting point, but still declared
+        rows, cols = prob.driver.color_sparsity['c']['x']
+        self.assertEqual(sorted(zip(rows, cols)), [(i, i) for i in range(4)])
+
+        # k has no nonzeros, so it keeps its sparsity from relevance
+        self.assertFalse('k' in prob.driver.color_sparsity)
+        self.assertEqual(list(prob.driver.sparsity['k']), ['x'])
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,10 +8,18 @@ import sys
 
 from six import string_types, iteritems
 
+from numpy import ndarray
+
 from openmdao.core.mpi_wrap import MPI
 from openmdao.recorders.base_recorder import BaseRecorder
 from openmdao.util.record_util import format_iteration_coordinate
 
+def _copy(val):
+    """Returns a copy of val if it's an array, otherwise val itself."""
+    if isinstance(val, ndarray):
+        return val.copy()
+    return val
+
 class InMemoryRecorder(BaseRecorder):
     """ Recorder that saves cases in memory. Note, this may take up large
     amounts of memory, so it is not recommended for large models or models
@@ -77,18 +85,20 @@ class InMemoryRecorder(BaseRecorder):
         data['success'] = metadata['success']
         data['msg'] = metadata['msg']
 
+        # arrays may be views of vectors (or of shared memory) that are
+        # overwritten later, so keep copies of them
         if self.options['record_params']:
-            data['params'] = {p:v for p,v in
+            data['params'] = {p:_copy(v) for p,v in
                                  iteritems(self._filter_vector(params,'p',
                                                         iteration_coordinate))}
 
         if self.options['record_unknowns']:
-            data['unknowns'] = {u:v for u,v in
+            data['unknowns'] = {u:_copy(v) for u,v in
                                   iteritems(self._filter_vector(unknowns,'u',
                                                         iteration_coordinate))}
 
         if self.options['record_resids']:
-            data['resids'] = {r:v for r,v in
+            data['resids'] = {r:_copy(v) for r,v in
                                   iteritems(self._filter_vector(resids,'r',
                                                          iteration_coordinate))}
 
@@ -1,11 +1,13 @@
 """ OpenMDAO LinearSolver that explicitly solves the linear system using
-linalg.solve or scipy LU factor/solve. Inherits from MultLinearSolver just
-for the mult function."""
+linalg.solve or scipy LU factor/solve, or a sparse LU factorization of the
+assembled Jacobian. Inherits from MultLinearSolver just for the mult
+function."""
 
 from collections import OrderedDict
 
 import numpy as np
 from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu, spsolve
 
 from openmdao.solvers.solver_base import MultLinearSolver
 
@@ -29,9 +31,11 @@ class DirectSolver(MultLinearSolver):
         Jacobian by calling apply_linear with columns of identity. Select
         'assemble' to build the Jacobian by taking the calculated Jacobians in
         each component and placing them directly into a clean identity matrix.
+        Select 'sparse' to do the same, but into a scipy.sparse CSC matrix.
     options['solve_method'] : str('LU')
         Solution method, either 'solve' for linalg.solve, or 'LU' for
-        linalg.lu_factor and linalg.lu_solve.
+        linalg.lu_factor and linalg.lu_solve. When jacobian_method is
+        'sparse', these are sparse.linalg.spsolve and sparse.linalg.splu.
     """
 
     def __init__(self):
@@ -43,16 +47,23 @@ class DirectSolver(MultLinearSolver):
                        "let OpenMDAO determine the best mode.",
                        lock_on_setup=True)
 
-        self.options.add_option('jacobian_method', 'MVP', values=['MVP', 'assemble'],
+        self.options.add_option('jacobian_method', 'MVP',
+                                values=['MVP', 'assemble', 'sparse'],
                                 desc="Method to assemble the jacobian to solve. " +
                                 "Select 'MVP' to build the Jacobian by calling " +
                                 "apply_linear with columns of identity. Select " +
                                 "'assemble' to build the Jacobian by taking the " +
                                 "calculated Jacobians in each component and placing " +
-                                "them directly into a clean identity matrix.")
+                                "them directly into a clean identity matrix. " +
+                                "Select 'sparse' to do the same, but into a " +
+                                "scipy.sparse CSC matrix.")
         self.options.add_option('solve_method', 'LU', values=['LU', 'solve'],
                                 desc="Solution method, either 'solve' for linalg.solve, " +
-                                "or 'LU' for linalg.lu_factor and linalg.lu_solve.")
+                                "or 'LU' for linalg.lu_factor and linalg.lu_solve. " +
+                                "When jacobian_method is 'sparse', these are " +
+                                "sparse.linalg.spsolve and sparse.linalg.splu.")
+
+        self.supports['multiple_rhs'] = True
 
         self.jacobian = None
         self.lup = None
@@ -67,15 +78,22 @@ class DirectSolver(MultLinearSolver):
             System that owns this solver.
         """
 
+        method = self.options['jacobian_method']
+
         # Only need to setup if we are assembling the whole jacobian
-        if self.options['jacobian_method'] == 'MVP':
+        if method == 'MVP':
             return
 
         # Note, we solve a slightly modified version of the unified
         # derivatives equations in OpenMDAO.
         # (dR/du) * (du/dr) = -I
-        u_vec = system.unknowns
-        self.jacobian = -np.eye(u_vec.vec.size)
+        # The sparse Jacobian is built from scratch during assembly.
+        if method == 'assemble':
+            u_vec = system.unknowns
+            self.jacobian = -np.eye(u_vec.vec.size)
+        else:
+            self.jacobian = None
+        self.lup = None
 
         # Clear the index cache
         system._icache = {}
@@ -89,7 +107,8 @@ class DirectSolver(MultLinearSolver):
         rhs_mat : dict of ndarray
             Dictionary containing one ndarry per top level quantity of
             interest. Each array contains the right-hand side for the linear
-            solve.
+            solve, or a 2D array with one right-hand side per column. All
+            columns are solved with the same factorization.
 
         system : `System`
             Parent `System` object.
@@ -112,23 +131,41 @@ class DirectSolver(MultLinearSolver):
         for voi, rhs in rhs_mat.items():
             self.voi = None
 
+            method = self.options['jacobian_method']
+            sparse = method == 'sparse'
+
             if system._jacobian_changed:
-                method = self.options['jacobian_method']
 
                 # Must clear the jacobian if we switch modes
-                if method == 'assemble' and self.mode != mode:
+                if method != 'MVP' and self.mode != mode:
                     self.setup(system)
                 self.mode = mode
 
-                self.jacobian, _ = system.assemble_jacobian(mode=mode, method=method,
-                                                            mult=self.mult)
+                if sparse:
+                    self.jacobian, _ = system.assemble_jacobian(mode=mode,
+                                                                method='assemble',
+                                                                sparse=True)
+                else:
+                    self.jacobian, _ = system.assemble_jacobian(mode=mode,
+                                                                method=method,
+                                                                mult=self.mult)
                 system._jacobian_changed = False
 
+                # The factorization is reused for every rhs until the
+                # jacobian changes again.
                 if self.options['solve_method'] == 'LU':
-                    self.lup = lu_factor(self.jacobian)
+                    if sparse:
+                        self.lup = splu(self.jacobian)
+                    else:
+                        self.lup = lu_factor(self.jacobian)
 
             if self.options['solve_method'] == 'LU':
-                deriv = lu_solve(self.lup, rhs)
+                if sparse:
+                    deriv = self.lup.solve(rhs)
+                else:
+                    deriv = lu_solve(self.lup, rhs)
+            elif sparse:
+                deriv = spsolve(self.jacobian, rhs)
             else:
                 deriv = np.linalg.solve(self.jacobian, rhs)
 
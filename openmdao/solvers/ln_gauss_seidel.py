@@ -28,6 +28,8 @@ class LinearGaussSeidel(LinearSolver):
         Derivative calculation mode, set to 'fwd' for forward mode, 'rev' for reverse mode, or 'auto' to let OpenMDAO determine the best mode.
     options['rtol'] :  float(1e-10)
         Absolute convergence tolerance.
+    options['voi_cache_size'] :  int(0)
+        Maximum number of variables of interest whose derivative vectors are kept allocated when this is the top level solver. The least recently used ones are freed beyond that. Set to 0 for no limit.
 
     """
 
@@ -53,6 +55,12 @@ class LinearGaussSeidel(LinearSolver):
                               "may increase performance but will use "
                               "more memory.",
                         lock_on_setup=True)
+        opt.add_option('voi_cache_size', 0, lower=0,
+                       desc="Maximum number of variables of interest whose "
+                            "derivative vectors are kept allocated when this "
+                            "is the top level solver. The least recently used "
+                            "ones are freed beyond that. Set to 0 for no "
+                            "limit.")
 
         self.print_name = 'LN_GS'
 
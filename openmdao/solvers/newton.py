@@ -23,12 +23,32 @@ class Newton(NonLinearSolver):
         Initial over-relaxation factor.
     options['atol'] :  float(1e-12)
         Absolute convergence tolerance on the residual.
+    options['eisenstat_walker'] :  bool(False)
+        Set to True to loosen the convergence tolerance of the linear solver
+        while the residual is large, using the Eisenstat-Walker forcing term
+        eta = ew_gamma*(norm/prev_norm)**ew_alpha. It sets the linear solver's
+        'rtol' option, or 'atol' if it has no 'rtol'. Linear solvers with
+        neither, like DirectSolver, raise an error at setup.
     options['err_on_maxiter'] : bool(False)
         If True, raise an AnalysisError if not converged at maxiter.
+    options['ew_alpha'] :  float(2.0)
+        Exponent of the Eisenstat-Walker forcing term.
+    options['ew_eta_max'] :  float(0.9)
+        Upper bound on the Eisenstat-Walker forcing term. Also used for the
+        first iteration.
+    options['ew_gamma'] :  float(0.9)
+        Scale factor of the Eisenstat-Walker forcing term.
     options['iprint'] :  int(0)
         Set to 0 to print only failures, set to 1 to print iteration totals to
         stdout, set to 2 to print the residual each iteration to stdout,
         or -1 to suppress all printing.
+    options['jac_reuse_rate'] :  float(0.5)
+        When reusing a linearization, linearize again as soon as the residual
+        norm shrinks by less than this factor in one iteration.
+    options['max_jac_reuse'] :  int(0)
+        Number of iterations that can reuse the previous linearization (and
+        any factorization or preconditioner built from it) before the model
+        is linearized again. Set to 0 to linearize every iteration.
     options['maxiter'] :  int(20)
         Maximum number of iterations.
     options['rtol'] :  float(1e-10)
@@ -58,6 +78,30 @@ class Newton(NonLinearSolver):
                        desc='Initial over-relaxation factor.')
         opt.add_option('solve_subsystems', True,
                        desc='Set to True to solve subsystems. You may need this for solvers nested under Newton.')
+        opt.add_option('max_jac_reuse', 0, lower=0,
+                       desc='Number of iterations that can reuse the previous '
+                       'linearization (and any factorization or preconditioner '
+                       'built from it) before the model is linearized again. '
+                       'Set to 0 to linearize every iteration.')
+        opt.add_option('jac_reuse_rate', 0.5, lower=0.0,
+                       desc='When reusing a linearization, linearize again as '
+                       'soon as the residual norm shrinks by less than this '
+                       'factor in one iteration.')
+        opt.add_option('eisenstat_walker', False,
+                       desc="Set to True to loosen the convergence tolerance of "
+                       "the linear solver while the residual is large, using "
+                       "the Eisenstat-Walker forcing term "
+                       "eta = ew_gamma*(norm/prev_norm)**ew_alpha. It sets the "
+                       "linear solver's 'rtol' option, or 'atol' if it has no "
+                       "'rtol'. Linear solvers with neither, like "
+                       "DirectSolver, raise an error at setup.")
+        opt.add_option('ew_gamma', 0.9, lower=0.0, upper=1.0,
+                       desc='Scale factor of the Eisenstat-Walker forcing term.')
+        opt.add_option('ew_alpha', 2.0, lower=1.0, upper=2.0,
+                       desc='Exponent of the Eisenstat-Walker forcing term.')
+        opt.add_option('ew_eta_max', 0.9, lower=0.0, upper=1.0,
+                       desc='Upper bound on the Eisenstat-Walker forcing term. '
+                       'Also used for the first iteration.')
 
         self.print_name = 'NEWTON'
 
@@ -87,6 +131,9 @@ class Newton(NonLinearSolver):
         if sub.is_active():
             self.unknowns_cache = np.empty(sub.unknowns.vec.shape)
 
+            if self.options['eisenstat_walker']:
+                self._ew_tol_name(sub)
+
             # Determine set of relevant inputs for local Newton solve if we
             # are not root.
             if sub.name is not '':
@@ -98,6 +145,30 @@ class Newton(NonLinearSolver):
                                        if conns[var][0].startswith(sub.pathname) and \
                                        conns[var][0] in rel_src])
 
+    def _ew_tol_name(self, system):
+        """ Returns the name of the linear solver option that the
+        Eisenstat-Walker forcing term is applied to.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        Raises
+        ------
+        RuntimeError
+            If the linear solver has no 'rtol' or 'atol' option.
+        """
+        ln_solver = self.ln_solver if self.ln_solver else system.ln_solver
+        for name in ('rtol', 'atol'):
+            if name in ln_solver.options:
+                return name
+
+        raise RuntimeError("Newton solver in '%s' has eisenstat_walker set, "
+                           "but its linear solver, %s, has no 'rtol' or "
+                           "'atol' option to apply it to." %
+                           (system.pathname, type(ln_solver).__name__))
+
     def print_all_convergence(self, level=2):
         """ Turns on iprint for this solver and all subsolvers. Override if
         your solver has subsolvers.
@@ -177,80 +248,120 @@ class Newton(NonLinearSolver):
         system.deriv_options.locked = False
         system.deriv_options['type'] = 'user'
 
-        while self.iter_count < maxiter and f_norm > atol and \
-                f_norm/f_norm0 > rtol and u_norm > utol:
-
-            # Linearize Model with partial derivatives
-            system._sys_linearize(params, unknowns, resids, total_derivs=False)
-
-            # Calculate direction to take step
-            arg.vec[:] = -resids.vec
-            with system._dircontext:
-                system.solve_linear(system.dumat, system.drmat,
-                                    [None], mode='fwd', solver=self.ln_solver,
-                                    rel_inputs=self.rel_inputs)
-
-            # Keeping this commented-out line here. This was a brute-force
-            # fix to a problem with subsystem linear solvers being corrupted
-            # by values left in out-of-scope dparams. It's mostly fixed, but
-            # there may be corner cases. If you see something weird, you
-            # could try uncommenting and see if this changes anything (which
-            # it should not.)
-            #system.clear_dparams()
-
-            self.iter_count += 1
-
-            # Allow different alphas for each value so we can keep moving when we
-            # hit a bound.
-            alpha = alpha_scalar*np.ones(len(unknowns.vec))
-
-            # If our step will violate any upper or lower bounds, then reduce
-            # alpha in just that direction so that we only step to that
-            # boundary.
-            alpha = unknowns.distance_along_vector_to_limit(alpha, result)
-
-            # Cache the current norm
-            if ls:
-                base_u[:] = unknowns.vec
-                base_norm = f_norm
-
-            # Apply step that doesn't violate bounds
-            unknowns_cache[:] = unknowns.vec
-            unknowns.vec += alpha*result.vec
-
-            # Metadata update
-            update_local_meta(local_meta, (self.iter_count, 0))
-
-            # Just evaluate (and optionally solve) the model with the new
-            # points
-            if self.options['solve_subsystems']:
-                system.children_solve_nonlinear(local_meta)
-            system.apply_nonlinear(params, unknowns, resids, local_meta)
-
-            self.recorders.record_iteration(system, local_meta)
-
-            f_norm = resids.norm()
-            u_norm = np.linalg.norm(unknowns.vec - unknowns_cache)
-            if iprint == 2:
-                self.print_norm(self.print_name, system, self.iter_count,
-                                f_norm, f_norm0, u_norm=u_norm)
-
-            # Line Search to determine how far to step in the Newton direction
-            if ls:
-                f_norm = ls.solve(params, unknowns, resids, system, self,
-                                  alpha_scalar, alpha, base_u, base_norm,
-                                  f_norm, f_norm0, metadata)
-
+        # The forcing term is applied to whichever linear solver we use.
+        ln_solver = self.ln_solver if self.ln_solver else system.ln_solver
+        ew = self.options['eisenstat_walker']
+        if ew:
+            tol_name = self._ew_tol_name(system)
+            save_tol = ln_solver.options[tol_name]
+            eta = self.options['ew_eta_max']
+
+        max_jac_reuse = self.options['max_jac_reuse']
+        jac_reuse_rate = self.options['jac_reuse_rate']
+        jac_reused = 0
+        f_norm_prev = None
+
+        # The linear solver's tolerance and the system's FD status are put
+        # back even if the solve fails.
+        try:
+            while self.iter_count < maxiter and f_norm > atol and \
+                    f_norm/f_norm0 > rtol and u_norm > utol:
+
+                # Linearize Model with partial derivatives, unless the previous
+                # linearization is still converging well enough.
+                if f_norm_prev is None or jac_reused >= max_jac_reuse or \
+                   f_norm > jac_reuse_rate*f_norm_prev:
+                    system._sys_linearize(params, unknowns, resids, total_derivs=False)
+                    jac_reused = 0
+                else:
+                    jac_reused += 1
+
+                # Eisenstat-Walker forcing term (choice 2 with safeguard).
+                if ew:
+                    if f_norm_prev is not None:
+                        gamma = self.options['ew_gamma']
+                        ew_alpha = self.options['ew_alpha']
+                        eta_prev = eta
+                        eta = gamma*(f_norm/f_norm_prev)**ew_alpha
+                        if gamma*eta_prev**ew_alpha > 0.1:
+                            eta = max(eta, gamma*eta_prev**ew_alpha)
+                        eta = min(eta, self.options['ew_eta_max'])
+
+                    # Never solve tighter than the user asked for.
+                    ln_solver.options[tol_name] = float(max(eta, save_tol))
+
+                f_norm_prev = f_norm
+
+                # Calculate direction to take step
+                arg.vec[:] = -resids.vec
+                with system._dircontext:
+                    system.solve_linear(system.dumat, system.drmat,
+                                        [None], mode='fwd', solver=self.ln_solver,
+                                        rel_inputs=self.rel_inputs)
+
+                # Keeping this commented-out line here. This was a brute-force
+                # fix to a problem with subsystem linear solvers being corrupted
+                # by values left in out-of-scope dparams. It's mostly fixed, but
+                # there may be corner cases. If you see something weird, you
+                # could try uncommenting and see if this changes anything (which
+                # it should not.)
+                #system.clear_dparams()
+
+                self.iter_count += 1
+
+                # Allow different alphas for each value so we can keep moving when we
+                # hit a bound.
+                alpha = alpha_scalar*np.ones(len(unknowns.vec))
+
+                # If our step will violate any upper or lower bounds, then reduce
+                # alpha in just that direction so that we only step to that
+                # boundary.
+                alpha = unknowns.distance_along_vector_to_limit(alpha, result)
+
+                # Cache the current norm
+                if ls:
+                    base_u[:] = unknowns.vec
+                    base_norm = f_norm
+
+                # Apply step that doesn't violate bounds
+                unknowns_cache[:] = unknowns.vec
+                unknowns.vec += alpha*result.vec
+
+                # Metadata update
+                update_local_meta(local_meta, (self.iter_count, 0))
+
+                # Just evaluate (and optionally solve) the model with the new
+                # points
+                if self.options['solve_subsystems']:
+                    system.children_solve_nonlinear(local_meta)
+                system.apply_nonlinear(params, unknowns, resids, local_meta)
+
+                self.recorders.record_iteration(system, local_meta)
+
+                f_norm = resids.norm()
+                u_norm = np.linalg.norm(unknowns.vec - unknowns_cache)
+                if iprint == 2:
+                    self.print_norm(self.print_name, system, self.iter_count,
+                                    f_norm, f_norm0, u_norm=u_norm)
+
+                # Line Search to determine how far to step in the Newton direction
+                if ls:
+                    f_norm = ls.solve(params, unknowns, resids, system, self,
+                                      alpha_scalar, alpha, base_u, base_norm,
+                                      f_norm, f_norm0, metadata)
+        finally:
+            # Return system's FD status back to what it was
+            system.deriv_options['type'] = save_type
+            system.deriv_options.locked = True
+
+            if ew:
+                ln_solver.options[tol_name] = save_tol
 
         # Final residual print if you only want the last one
         if iprint == 1:
             self.print_norm(self.print_name, system, self.iter_count,
                             f_norm, f_norm0, u_norm=u_norm)
 
-        # Return system's FD status back to what it was
-        system.deriv_options['type'] = save_type
-        system.deriv_options.locked = True
-
         if self.iter_count >= maxiter or isnan(f_norm):
             msg = 'FAILED to converge after %d iterations' % self.iter_count
             fail = True
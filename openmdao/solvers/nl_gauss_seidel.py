@@ -29,6 +29,9 @@ class NLGaussSeidel(NonLinearSolver):
         Maximum number of iterations.
     options['rtol'] :  float(1e-06)
         Relative convergence tolerance.
+    options['skip_clean'] :  bool(False)
+        Set to True to skip any subsystem whose params and unknowns have not
+        changed since the end of its last run.
     options['utol'] :  float(1e-12)
         Convergence tolerance on the change in the unknowns.
     options['use_aitken'] : bool(False)
@@ -37,6 +40,12 @@ class NLGaussSeidel(NonLinearSolver):
         Lower limit for Aitken relaxation factor.
     options['aitken_alpha_max'] : float(2.0)
         Upper limit for Aitken relaxation factor.
+    options['use_anderson'] : bool(False)
+        Set to True to use Anderson mixing acceleration.
+    options['anderson_depth'] : int(5)
+        Number of previous iterations used by Anderson mixing.
+    options['anderson_beta'] : float(1.0)
+        Mixing parameter for Anderson mixing. Values below 1.0 damp the step.
 
     """
 
@@ -52,17 +61,33 @@ class NLGaussSeidel(NonLinearSolver):
                        desc='Convergence tolerance on the change in the unknowns.')
         opt.add_option('maxiter', 100, lower=0,
                        desc='Maximum number of iterations.')
+        opt.add_option('skip_clean', False,
+                       desc='Set to True to skip any subsystem whose params and '
+                       'unknowns have not changed since the end of its last run.')
         opt.add_option('use_aitken', False,
                        desc='Set to True to use Aitken acceleration.')
         opt.add_option('aitken_alpha_min', 0.25,
                        desc='Lower limit for Aitken relaxation factor.')
         opt.add_option('aitken_alpha_max', 2.0,
                        desc='Upper limit for Aitken relaxation factor.')
+        opt.add_option('use_anderson', False,
+                       desc='Set to True to use Anderson mixing acceleration.')
+        opt.add_option('anderson_depth', 5, lower=1,
+                       desc='Number of previous iterations used by Anderson mixing.')
+        opt.add_option('anderson_beta', 1.0, lower=0.0, upper=1.0,
+                       desc='Mixing parameter for Anderson mixing. Values below '
+                       '1.0 damp the step.')
 
         self.print_name = 'NLN_GS'
         self.delta_u_n_1 = 'None' # delta_u_n-1 for Aitken acc.
         self.aitken_alpha = 1.0 # Initial Aitken relaxation factor 
 
+        # Ring buffers of differences between successive sweep outputs and
+        # fixed point residuals for Anderson mixing.
+        self._anderson_dg = None
+        self._anderson_df = None
+        self._anderson_slot = 0
+
     def setup(self, sub):
         """ Initialize this solver.
 
@@ -74,6 +99,29 @@ class NLGaussSeidel(NonLinearSolver):
         if sub.is_active():
             self.unknowns_cache = np.empty(sub.unknowns.vec.shape)
 
+            if self.options['use_anderson']:
+                self._setup_anderson(sub.unknowns.vec.size)
+
+    def _setup_anderson(self, size):
+        """ Allocate the Anderson mixing history.
+
+        Args
+        ----
+        size : int
+            Size of the unknowns vector.
+        """
+        shape = (self.options['anderson_depth'], size)
+        self._anderson_dg = np.empty(shape)
+        self._anderson_df = np.empty(shape)
+        self._anderson_g = np.empty(size)
+        self._anderson_f = np.empty(size)
+
+        # work arrays for a single update
+        self._anderson_fk = np.empty(size)
+        self._anderson_step = np.empty(size)
+        self._anderson_tmp = np.empty(size)
+        self._anderson_alpha = np.empty(size)
+
     @error_wrap_nl
     def solve(self, params, unknowns, resids, system, metadata=None):
         """ Solves the system using Gauss Seidel.
@@ -112,7 +160,8 @@ class NLGaussSeidel(NonLinearSolver):
         update_local_meta(local_meta, (self.iter_count,))
 
         # Initial Solve
-        system.children_solve_nonlinear(local_meta)
+        system.children_solve_nonlinear(local_meta,
+                                        skip_clean=self.options['skip_clean'])
 
         self.recorders.record_iteration(system, local_meta)
 
@@ -132,6 +181,17 @@ class NLGaussSeidel(NonLinearSolver):
         if iprint == 2:
             self.print_norm(self.print_name, system, 1, normval, basenorm)
 
+        use_anderson = self.options['use_anderson']
+        if use_anderson:
+            depth = self.options['anderson_depth']
+            if self._anderson_dg is None or \
+               self._anderson_dg.shape != (depth, unknowns.vec.size):
+                self._setup_anderson(unknowns.vec.size)
+
+            # -1 until the first sweep has been stored.
+            n_hist = -1
+            self._anderson_slot = 0
+
         while self.iter_count < maxiter and \
                 normval > atol and \
                 normval/basenorm > rtol  and \
@@ -143,7 +203,8 @@ class NLGaussSeidel(NonLinearSolver):
             unknowns_cache[:] = unknowns.vec
 
             # Runs an iteration
-            system.children_solve_nonlinear(local_meta)
+            system.children_solve_nonlinear(local_meta,
+                                        skip_clean=self.options['skip_clean'])
             self.recorders.record_iteration(system, local_meta)
 
             # Evaluate Norm
@@ -191,6 +252,10 @@ class NLGaussSeidel(NonLinearSolver):
                     # by the following vector
                     self.delta_u_n_1 = unknowns.vec - unknowns_cache 
 
+            elif use_anderson and normval > atol and \
+                    normval/basenorm > rtol and u_norm > utol:
+                n_hist = self._anderson(system, unknowns, unknowns_cache, n_hist)
+
             if iprint == 2:
                 self.print_norm(self.print_name, system, self.iter_count, normval,
                                 basenorm, u_norm=u_norm)
@@ -216,3 +281,73 @@ class NLGaussSeidel(NonLinearSolver):
         if fail and self.options['err_on_maxiter']:
             raise AnalysisError("Solve in '%s': NLGaussSeidel %s" %
                                 (system.pathname, msg))
+
+    def _anderson(self, system, unknowns, unknowns_cache, n_hist):
+        """ Replaces the result of the last sweep with the Anderson mixing of
+        it and the previous ones.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        unknowns_cache : ndarray
+            Unknowns before the last sweep.
+
+        n_hist : int
+            Number of iterations currently held in the history, or -1 if no
+            sweep has been stored yet.
+
+        Returns
+        -------
+        int
+            Number of iterations held in the history after this one.
+        """
+        dg = self._anderson_dg
+        df = self._anderson_df
+        g_old = self._anderson_g
+        f_old = self._anderson_f
+        depth = dg.shape[0]
+
+        # g is the output of the sweep and f = g - u its fixed point residual.
+        g = unknowns.vec
+        f = np.subtract(g, unknowns_cache, out=self._anderson_fk)
+
+        # The first sweep only starts the history.
+        if n_hist < 0:
+            g_old[:] = g
+            f_old[:] = f
+            return 0
+
+        slot = self._anderson_slot
+        np.subtract(g, g_old, out=dg[slot])
+        np.subtract(f, f_old, out=df[slot])
+        g_old[:] = g
+        f_old[:] = f
+        self._anderson_slot = (slot + 1) % depth
+        n_hist = min(n_hist + 1, depth)
+
+        gamma = np.linalg.lstsq(df[:n_hist].T, f, rcond=-1)[0]
+
+        beta = self.options['anderson_beta']
+        step = self._anderson_step
+        np.dot(gamma, dg[:n_hist], out=step)
+        step *= -1.0
+        if beta < 1.0:
+            tmp = self._anderson_tmp
+            np.dot(gamma, df[:n_hist], out=tmp)
+            np.subtract(f, tmp, out=tmp)
+            tmp *= 1.0 - beta
+            step -= tmp
+
+        # Keep the mixed point inside any bounds on the unknowns.
+        alpha = self._anderson_alpha
+        alpha[:] = 1.0
+        alpha = unknowns.distance_along_vector_to_limit(alpha, step)
+
+        g += alpha*step
+
+        return n_hist
@@ -15,12 +15,19 @@ class RunOnce(NonLinearSolver):
         Set to 0 to print only failures, set to 1 to print iteration totals to
         stdout, set to 2 to print the residual each iteration to stdout,
         or -1 to suppress all printing.
+    options['skip_clean'] :  bool(False)
+        Set to True to skip any subsystem whose params and unknowns have not
+        changed since the end of its last run.
 
     """
 
     def __init__(self):
         super(RunOnce, self).__init__()
         self.options.remove_option('err_on_maxiter')
+        self.options.add_option('skip_clean', False,
+                                desc='Set to True to skip any subsystem whose params '
+                                'and unknowns have not changed since the end of '
+                                'its last run.')
         self.print_name = 'RUN_ONCE'
 
     @error_wrap_nl
@@ -48,5 +55,6 @@ class RunOnce(NonLinearSolver):
         system.ln_solver.local_meta = local_meta
         update_local_meta(local_meta, (self.iter_count,))
 
-        system.children_solve_nonlinear(local_meta)
+        system.children_solve_nonlinear(local_meta,
+                                        skip_clean=self.options['skip_clean'])
         self.recorders.record_iteration(system, local_meta)
@@ -5,7 +5,7 @@ from __future__ import print_function
 from six import iteritems
 
 import numpy as np
-from scipy.sparse.linalg import gmres, LinearOperator
+from scipy.sparse.linalg import gmres, LinearOperator, splu, spilu
 
 from openmdao.core.system import AnalysisError
 from openmdao.solvers.solver_base import MultLinearSolver
@@ -15,7 +15,8 @@ from collections import OrderedDict
 class ScipyGMRES(MultLinearSolver):
     """ Scipy's GMRES Solver. This is a serial solver, so it should never be
     used in an MPI setting. A preconditioner can be specified by placing
-    another linear solver into `self.preconditioner`.
+    another linear solver into `self.preconditioner`, or built from the
+    assembled Jacobian by setting options['precon_method'].
 
     Options
     -------
@@ -23,6 +24,12 @@ class ScipyGMRES(MultLinearSolver):
         Absolute convergence tolerance.
     options['err_on_maxiter'] : bool(False)
         If True, raise an AnalysisError if not converged at maxiter.
+    options['ilu_drop_tol'] :  float(0.0001)
+        Drop tolerance of the incomplete LU factorization used when
+        precon_method is 'ilu'.
+    options['ilu_fill_factor'] :  float(10.0)
+        Upper bound on the ratio of nonzeros in the incomplete LU factors to
+        nonzeros in the Jacobian, used when precon_method is 'ilu'.
     options['iprint'] :  int(0)
         Set to 0 to print only failures, set to 1 to print iteration totals to
         stdout, set to 2 to print the residual each iteration to stdout,
@@ -32,6 +39,13 @@ class ScipyGMRES(MultLinearSolver):
     options['mode'] :  str('auto')
         Derivative calculation mode, set to 'fwd' for forward mode, 'rev' for reverse
         mode, or 'auto' to let OpenMDAO determine the best mode.
+    options['precon_method'] :  str('user')
+        Preconditioner to use. Select 'user' to call the linear solver in
+        self.preconditioner, if there is one. Select 'lu' or 'ilu' to assemble
+        the calculated Jacobians of each component into a sparse matrix and
+        precondition with its complete or incomplete LU factorization. The
+        factorization is reused for every iteration and right-hand side until
+        the next linearization.
     options['restart'] :  int(20)
         Number of iterations between restarts. Larger values increase iteration cost,
         but may be necessary for convergence
@@ -43,12 +57,28 @@ class ScipyGMRES(MultLinearSolver):
         opt = self.options
         opt.add_option('atol', 1e-12, lower=0.0,
                        desc='Absolute convergence tolerance.')
+        opt.add_option('ilu_drop_tol', 1e-4, lower=0.0,
+                       desc="Drop tolerance of the incomplete LU factorization " +
+                       "used when precon_method is 'ilu'.")
+        opt.add_option('ilu_fill_factor', 10.0, lower=1.0,
+                       desc="Upper bound on the ratio of nonzeros in the " +
+                       "incomplete LU factors to nonzeros in the Jacobian, " +
+                       "used when precon_method is 'ilu'.")
         opt.add_option('maxiter', 1000, lower=0,
                        desc='Maximum number of iterations.')
         opt.add_option('mode', 'auto', values=['fwd', 'rev', 'auto'],
                        desc="Derivative calculation mode, set to 'fwd' for " +
                        "forward mode, 'rev' for reverse mode, or 'auto' to " +
                        "let OpenMDAO determine the best mode.")
+        opt.add_option('precon_method', 'user', values=['user', 'lu', 'ilu'],
+                       desc="Preconditioner to use. Select 'user' to call the " +
+                       "linear solver in self.preconditioner, if there is one. " +
+                       "Select 'lu' or 'ilu' to assemble the calculated " +
+                       "Jacobians of each component into a sparse matrix and " +
+                       "precondition with its complete or incomplete LU " +
+                       "factorization. The factorization is reused for every " +
+                       "iteration and right-hand side until the next " +
+                       "linearization.")
         opt.add_option('restart', 20, lower=0,
                        desc='Number of iterations between restarts. Larger values ' +
                        'increase iteration cost, but may be necessary for convergence',
@@ -67,6 +97,13 @@ class ScipyGMRES(MultLinearSolver):
         # User can specify another linear solver to use as a preconditioner
         self.preconditioner = None
 
+        # Assembled jacobian for the 'lu' and 'ilu' precon_methods, along with
+        # the mode and linearization it belongs to.
+        self.jacobian = None
+        self._jac_mode = None
+        self._jac_count = None
+        self._lup = None
+
     def setup(self, sub):
         """ Initialize sub solvers.
 
@@ -78,6 +115,12 @@ class ScipyGMRES(MultLinearSolver):
         if self.preconditioner:
             self.preconditioner.setup(sub)
 
+        self.jacobian = None
+        self._jac_mode = None
+        self._jac_count = None
+        self._lup = None
+        sub._icache = {}
+
     def print_all_convergence(self, level=2):
         """ Turns on iprint for this solver and all subsolvers. Override if
         your solver has subsolvers.
@@ -114,70 +157,116 @@ class ScipyGMRES(MultLinearSolver):
         dict of ndarray : Solution vectors
         """
 
-        options = self.options
         self.mode = mode
-        iprint = self.options['iprint']
+        options = self.options
+        precon_method = options['precon_method']
+
+        if precon_method != 'user':
+            if self.jacobian is None or self._jac_mode != mode or \
+               self._jac_count != system._linearize_count:
+                self.jacobian, _ = system.assemble_jacobian(mode=mode,
+                                                            method='assemble',
+                                                            sparse=True)
+                self._jac_mode = mode
+                self._jac_count = system._linearize_count
+                self._lup = None
+
+        if precon_method == 'user':
+            precon = self._precon if self.preconditioner else None
+        else:
+            if self._lup is None:
+                if precon_method == 'lu':
+                    self._lup = splu(self.jacobian)
+                else:
+                    self._lup = spilu(self.jacobian,
+                                      drop_tol=options['ilu_drop_tol'],
+                                      fill_factor=options['ilu_fill_factor'])
+            precon = self._lup.solve
 
         unknowns_mat = OrderedDict()
         for voi, rhs in iteritems(rhs_mat):
 
-            # Scipy can only handle one right-hand-side at a time.
             self.voi = voi
 
+            # Scipy can only handle one right-hand-side at a time.
             n_edge = len(rhs)
             A = LinearOperator((n_edge, n_edge),
                                matvec=self.mult,
                                dtype=float)
 
             # Support a preconditioner
-            if self.preconditioner:
+            if precon is not None:
                 M = LinearOperator((n_edge, n_edge),
-                                   matvec=self._precon,
+                                   matvec=precon,
                                    dtype=float)
             else:
                 M = None
 
-            # Call GMRES to solve the linear system
-            self.system = system
-            self.iter_count = 0
-            d_unknowns, info = gmres(A, rhs, M=M,
-                                     tol=options['atol'],
-                                     maxiter=options['maxiter'],
-                                     restart=options['restart'],
-                                     callback=self.monitor)
-            self.system = None
-
-            # Final residual print if you only want the last one
-            if iprint == 1:
-                self.print_norm(self.print_name, system, self.iter_count,
-                                self._norm, self._norm0, indent=1, solver='LN')
-
-            if info > 0:
-                msg = "Solve in '%s': ScipyGMRES failed to converge " \
-                          "after %d iterations" % (system.pathname,
-                                                   self.iter_count)
-                #logger.error(msg, system.name, info)
-                if self.options['err_on_maxiter']:
-                    raise AnalysisError(msg)
-                print(msg)
-                msg = 'FAILED to converge after max iterations'
-                failed = True
-            elif info < 0:
-                msg = "ERROR in solve in '{}': gmres failed with code {}"
-                raise RuntimeError(msg.format(system.pathname, info))
-            else:
-                msg = 'Converged in %d iterations' % self.iter_count
-                failed = False
+            unknowns_mat[voi] = self._gmres(A, rhs, M, system)
 
-            if iprint > 0 or (failed and iprint > -1 ):
-                self.print_norm(self.print_name, system, self.iter_count,
-                                0, 0, msg=msg, indent=1, solver='LN')
+        return unknowns_mat
 
-            unknowns_mat[voi] = d_unknowns
+    def _gmres(self, A, rhs, M, system):
+        """ Calls Scipy's GMRES.
 
-            #print(system.name, 'Linear solution vec', d_unknowns)
+        Args
+        ----
+        A : LinearOperator
+            Jacobian of the system.
 
-        return unknowns_mat
+        rhs : ndarray
+            Right-hand side.
+
+        M : LinearOperator or None
+            Preconditioner.
+
+        system : `System`
+            Parent `System` object.
+
+        Returns
+        -------
+        ndarray : Solution vector
+        """
+        options = self.options
+        iprint = options['iprint']
+
+        # Call GMRES to solve the linear system
+        self.system = system
+        self.iter_count = 0
+        d_unknowns, info = gmres(A, rhs, M=M,
+                                 tol=options['atol'],
+                                 maxiter=options['maxiter'],
+                                 restart=options['restart'],
+                                 callback=self.monitor)
+        self.system = None
+
+        # Final residual print if you only want the last one
+        if iprint == 1:
+            self.print_norm(self.print_name, system, self.iter_count,
+                            self._norm, self._norm0, indent=1, solver='LN')
+
+        if info > 0:
+            msg = "Solve in '%s': ScipyGMRES failed to converge " \
+                      "after %d iterations" % (system.pathname,
+                                               self.iter_count)
+            #logger.error(msg, system.name, info)
+            if options['err_on_maxiter']:
+                raise AnalysisError(msg)
+            print(msg)
+            msg = 'FAILED to converge after max iterations'
+            failed = True
+        elif info < 0:
+            msg = "ERROR in solve in '{}': gmres failed with code {}"
+            raise RuntimeError(msg.format(system.pathname, info))
+        else:
+            msg = 'Converged in %d iterations' % self.iter_count
+            failed = False
+
+        if iprint > 0 or (failed and iprint > -1 ):
+            self.print_norm(self.print_name, system, self.iter_count,
+                            0, 0, msg=msg, indent=1, solver='LN')
+
+        return d_unknowns
 
     def _precon(self, arg):
         """ GMRES Callback: applies a preconditioner by calling
@@ -21,51 +21,57 @@ def error_wrap_nl(fn):
 
         try:
             fn(driver, params, unknowns, resids, system, metadata)
-        except FloatingPointError as err:
-            exc_info = sys.exc_info()
-
-            # So we don't keep re-appending in a solver stack.
-            if hasattr(exc_info[1], 'seen'):
-                reraise(exc_info[0], exc_info[1], exc_info[2])
-
-            # The user may need some help figuring things out, so let them know where
-            x_unknowns = []
-            for var in unknowns:
-                if unknowns.metadata(var).get('pass_by_obj'):
-                    continue
-                if not all(np.isfinite(unknowns._dat[var].val)):
-                    x_unknowns.append(var)
-            x_resids = []
-            for var in resids:
-                if resids.metadata(var).get('pass_by_obj'):
-                    continue
-                if not all(np.isfinite(resids._dat[var].val)):
-                    x_resids.append(var)
-            x_params = []
-            for var in params:
-                if params.metadata(var).get('pass_by_obj'):
-                    continue
-                if not all(np.isfinite(params._dat[var].val)):
-                    x_params.append(var)
-
-            msg = str(err)
-            if x_unknowns:
-                msg += '\nThe following unknowns are nonfinite: %s' % x_unknowns
-            if x_resids:
-                msg += '\nThe following resids are nonfinite: %s' % x_resids
-            if x_params:
-                msg += '\nThe following params are nonfinite: %s' % x_params
-
-            new_err = FloatingPointError(msg)
-
-            # So we don't keep re-appending in a solver stack.
-            new_err.seen = True
-
-            reraise(exc_info[0], new_err, exc_info[2])
+        except FloatingPointError:
+            _reraise_fp_error(params, unknowns, resids)
 
     return wrapper
 
 
+def _reraise_fp_error(params, unknowns, resids):
+    """ Reraises the FloatingPointError being handled, with the names of any
+    nonfinite variables in the given vectors added to its message."""
+    exc_info = sys.exc_info()
+
+    # So we don't keep re-appending in a solver stack.
+    if hasattr(exc_info[1], 'seen'):
+        reraise(exc_info[0], exc_info[1], exc_info[2])
+
+    # The user may need some help figuring things out, so let them know where
+    x_unknowns = []
+    for var in unknowns:
+        if unknowns.metadata(var).get('pass_by_obj'):
+            continue
+        if not all(np.isfinite(unknowns._dat[var].val)):
+            x_unknowns.append(var)
+    x_resids = []
+    for var in resids:
+        if resids.metadata(var).get('pass_by_obj'):
+            continue
+        if not all(np.isfinite(resids._dat[var].val)):
+            x_resids.append(var)
+    x_params = []
+    for var in params:
+        if params.metadata(var).get('pass_by_obj'):
+            continue
+        if not all(np.isfinite(params._dat[var].val)):
+            x_params.append(var)
+
+    msg = str(exc_info[1])
+    if x_unknowns:
+        msg += '\nThe following unknowns are nonfinite: %s' % x_unknowns
+    if x_resids:
+        msg += '\nThe following resids are nonfinite: %s' % x_resids
+    if x_params:
+        msg += '\nThe following params are nonfinite: %s' % x_params
+
+    new_err = FloatingPointError(msg)
+
+    # So we don't keep re-appending in a solver stack.
+    new_err.seen = True
+
+    reraise(exc_info[0], new_err, exc_info[2])
+
+
 class SolverBase(object):
     """ Common base class for Linear and Nonlinear solver. Should not be used
     by users. Always inherit from `LinearSolver` or `NonlinearSolver`."""
@@ -220,6 +226,10 @@ class LinearSolver(SolverBase):
         """ Initialize the default supports for ln solvers."""
         super(LinearSolver, self).__init__()
 
+        # What this solver supports
+        self.supports = OptionsDictionary(read_only=True)
+        self.supports.add_option('multiple_rhs', False)
+
         # Solver needs to communicate local relevancy into calls to sys_apply_linear.
         self.rel_inputs = None
 
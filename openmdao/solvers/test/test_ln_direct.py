@@ -772,5 +772,185 @@ class TestDirectSolverAssemble(unittest.TestCase):
         J = p.calc_gradient(['p.x'], ['comp.y1'], mode='fwd')
         assert_rel_error(self, J[0][0], 1.5, 1e-6)
 
+
+class TestDirectSolverSparse(unittest.TestCase):
+    """ Tests the DirectSolver using a sparse assembled Jacobian."""
+
+    def test_simple_matvec(self):
+        group = Group()
+        group.add('x_param', IndepVarComp('x', 1.0), promotes=['*'])
+        group.add('mycomp', SimpleCompDerivMatVec(), promotes=['x', 'y'])
+
+        prob = Problem()
+        prob.root = group
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'sparse'
+        prob.setup(check=False)
+        prob.run()
+
+        with self.assertRaises(RuntimeError) as cm:
+            J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='dict')
+
+        expected_msg = "The 'assemble' jacobian_method is not supported when " + \
+                       "'apply_linear' is used on a component (mycomp)."
+
+        self.assertEqual(str(cm.exception), expected_msg)
+
+    def test_array2D(self):
+        for solve_method in ('LU', 'solve'):
+            group = Group()
+            group.add('x_param', IndepVarComp('x', np.ones((2, 2))), promotes=['*'])
+            group.add('mycomp', ArrayComp2D(), promotes=['x', 'y'])
+
+            prob = Problem()
+            prob.root = group
+            prob.root.ln_solver = DirectSolver()
+            prob.root.ln_solver.options['jacobian_method'] = 'sparse'
+            prob.root.ln_solver.options['solve_method'] = solve_method
+            prob.setup(check=False)
+            prob.run()
+
+            J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='dict')
+            Jbase = prob.root.mycomp._jacobian_cache
+            diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+            assert_rel_error(self, diff, 0.0, 1e-8)
+
+            J = prob.calc_gradient(['x'], ['y'], mode='rev', return_format='dict')
+            diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+            assert_rel_error(self, diff, 0.0, 1e-8)
+
+    def test_converge_diverge(self):
+
+        prob = Problem()
+        prob.root = ConvergeDiverge()
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'sparse'
+        prob.setup(check=False)
+        prob.run()
+
+        indep_list = ['p.x']
+        unknown_list = ['comp7.y1']
+
+        J = prob.calc_gradient(indep_list, unknown_list, mode='fwd', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+        J = prob.calc_gradient(indep_list, unknown_list, mode='rev', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+    def test_sellar_derivs(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.ln_solver = DirectSolver()
+        prob.root.ln_solver.options['jacobian_method'] = 'sparse'
+
+        prob.root.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        indep_list = ['x', 'z']
+        unknown_list = ['obj', 'con1', 'con2']
+
+        Jbase = {}
+        Jbase['con1'] = {}
+        Jbase['con1']['x'] = -0.98061433
+        Jbase['con1']['z'] = np.array([-9.61002285, -0.78449158])
+        Jbase['con2'] = {}
+        Jbase['con2']['x'] = 0.09692762
+        Jbase['con2']['z'] = np.array([1.94989079, 1.0775421 ])
+        Jbase['obj'] = {}
+        Jbase['obj']['x'] = 2.98061392
+        Jbase['obj']['z'] = np.array([9.61001155, 1.78448534])
+
+        J = prob.calc_gradient(indep_list, unknown_list, mode='fwd', return_format='dict')
+        for key1, val1 in Jbase.items():
+            for key2, val2 in val1.items():
+                assert_rel_error(self, J[key1][key2], val2, .00001)
+
+        J = prob.calc_gradient(indep_list, unknown_list, mode='rev', return_format='dict')
+        for key1, val1 in Jbase.items():
+            for key2, val2 in val1.items():
+                assert_rel_error(self, J[key1][key2], val2, .00001)
+
+    def test_implicit_solve_linear(self):
+
+        p = Problem()
+        p.root = Group()
+
+        dvars = ( ('a', 3.), ('b', 10.))
+        p.root.add('desvars', IndepVarComp(dvars), promotes=['a', 'b'])
+
+        sg = p.root.add('sg', Group(), promotes=["*"])
+        sg.add('si', SimpleImplicitSL(), promotes=['a', 'b', 'x'])
+
+        p.root.add('func', ExecComp('f = 2*x0+a'), promotes=['f', 'x0', 'a'])
+        p.root.connect('x', 'x0', src_indices=[1])
+
+        p.driver.add_objective('f')
+        p.driver.add_desvar('a')
+
+        p.root.nl_solver = Newton()
+        p.root.nl_solver.options['rtol'] = 1e-10
+        p.root.nl_solver.options['atol'] = 1e-10
+        p.root.ln_solver = DirectSolver()
+        p.root.ln_solver.options['jacobian_method'] = 'sparse'
+
+        p.setup(check=False)
+        p['x'] = np.array([1.5, 2.])
+
+        p.run()
+        J = p.calc_gradient(['a'], ['f'], mode='rev')
+        assert_rel_error(self, J[0][0], 1.57735, 1e-6)
+
+    def test_sparse_matches_dense(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        root = prob.root
+        root._sys_linearize(root.params, root.unknowns, root.resids)
+
+        for mode in ('fwd', 'rev'):
+            root._icache = {}
+            dense, _ = root.assemble_jacobian(mode=mode)
+            root._icache = {}
+            sparse, _ = root.assemble_jacobian(mode=mode, sparse=True)
+
+            self.assertEqual(sparse.format, 'csc')
+            diff = np.linalg.norm(sparse.toarray() - dense)
+            assert_rel_error(self, diff, 0.0, 1e-12)
+
+
+class TestDirectSolverMultipleRHS(unittest.TestCase):
+
+    def test_block_rhs(self):
+
+        for method in ('MVP', 'assemble', 'sparse'):
+            for solve_method in ('LU', 'solve'):
+                prob = Problem()
+                prob.root = SellarStateConnection()
+                prob.root.ln_solver = DirectSolver()
+                prob.root.ln_solver.options['jacobian_method'] = method
+                prob.root.ln_solver.options['solve_method'] = solve_method
+                prob.setup(check=False)
+                prob.run()
+
+                root = prob.root
+                n = len(root.dumat[None].vec)
+                rhs = np.random.RandomState(7).rand(n, 4)
+
+                for mode in ('fwd', 'rev'):
+                    root._sys_linearize(root.params, root.unknowns, root.resids)
+                    block = root.ln_solver.solve({None: rhs}, root, mode)[None]
+                    self.assertEqual(block.shape, (n, 4))
+
+                    for j in range(4):
+                        sol = root.ln_solver.solve({None: rhs[:, j]}, root, mode)[None]
+                        assert_rel_error(self, block[:, j], sol, 1e-10)
+
+
 if __name__ == "__main__":
     unittest.main()
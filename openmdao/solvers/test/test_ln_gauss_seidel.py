@@ -574,6 +574,61 @@ class TestLinearGaussSeidel(unittest.TestCase):
         else:
             self.fail("Exception expected")
 
+    def test_lazy_voi_vecs(self):
+        prob = Problem()
+        root = prob.root = Group()
+        one = np.ones(1)
+        root.add('p1', IndepVarComp('a', one), promotes=['*'])
+        root.add('p2', IndepVarComp('b', one), promotes=['*'])
+        root.add('p3', IndepVarComp('c', one), promotes=['*'])
+        root.add('comp', ExecComp('x = 2.0*a + 3.0*b', x=one, a=one, b=one),
+                 promotes=['*'])
+        sub = root.add('sub', Group(), promotes=['*'])
+        sub.add('comp', ExecComp('y = 4.0*c', y=one, c=one), promotes=['*'])
+
+        root.ln_solver = LinearGaussSeidel()
+        root.ln_solver.options['mode'] = 'fwd'
+        root.ln_solver.options['single_voi_relevance_reduction'] = True
+        root.ln_solver.options['voi_cache_size'] = 2
+
+        prob.driver.add_desvar('a')
+        prob.driver.add_desvar('b')
+        prob.driver.add_desvar('c')
+        prob.driver.add_objective('x')
+        prob.driver.add_constraint('y', upper=0.0)
+
+        prob.setup(check=False)
+        prob.run()
+
+        # nothing is allocated for the variables of interest until needed
+        self.assertEqual(list(root.dumat), [None])
+        self.assertEqual(list(sub.comp.dumat), [None])
+
+        J = prob.calc_gradient(['a', 'b'], ['x'], return_format='dict')
+        assert_rel_error(self, J['x']['a'][0][0], 2.0, 1e-6)
+        assert_rel_error(self, J['x']['b'][0][0], 3.0, 1e-6)
+        self.assertEqual(set(root.dumat), set([None, 'a', 'b']))
+        self.assertEqual(set(sub.comp.dumat), set([None, 'a', 'b']))
+
+        # nothing in sub is relevant to a or b, so they share its transfers
+        self.assertTrue(sub._data_xfer[('', 'fwd', 'a')] is
+                        sub._data_xfer[('', 'fwd', 'b')])
+
+        J = prob.calc_gradient(['c'], ['y'], return_format='dict')
+        assert_rel_error(self, J['y']['c'][0][0], 4.0, 1e-6)
+
+        # 'a' was the least recently used
+        self.assertEqual(set(root.dumat), set([None, 'b', 'c']))
+        self.assertEqual(set(sub.comp.dumat), set([None, 'b', 'c']))
+        self.assertFalse(any(key[2] == 'a' for key in sub._data_xfer))
+        self.assertFalse(any(key[1] == 'a' for key in root._do_apply))
+
+        J = prob.calc_gradient(['a', 'b', 'c'], ['x', 'y'], return_format='dict')
+        assert_rel_error(self, J['x']['a'][0][0], 2.0, 1e-6)
+        assert_rel_error(self, J['x']['b'][0][0], 3.0, 1e-6)
+        assert_rel_error(self, J['y']['c'][0][0], 4.0, 1e-6)
+        assert_rel_error(self, J['y']['a'][0][0], 0.0, 1e-6)
+
 
 class SimpleImplicit(Component):
 
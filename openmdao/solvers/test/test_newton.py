@@ -6,7 +6,7 @@ from six import iteritems
 import numpy as np
 
 from openmdao.api import Group, Problem, IndepVarComp, LinearGaussSeidel, \
-    Newton, ExecComp, ScipyGMRES, AnalysisError, Component
+    Newton, ExecComp, ScipyGMRES, AnalysisError, Component, DirectSolver
 from openmdao.test.sellar import SellarDerivativesGrouped, \
                                  SellarNoDerivatives, SellarDerivatives, \
                                  SellarStateConnection
@@ -218,5 +218,150 @@ class TestNewton(unittest.TestCase):
                              msg='Should get there pretty quick because of utol.')
 
 
+class CountedCubic(Component):
+    """ Implicit component z**3 + 2z - x = 0 that counts its linearizations."""
+
+    def __init__(self, size=3):
+        super(CountedCubic, self).__init__()
+        self.add_param('x', np.zeros(size))
+        self.add_state('z', np.ones(size))
+        self.lin_count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        z = unknowns['z']
+        resids['z'] = z**3 + 2.0*z - params['x']
+
+    def linearize(self, params, unknowns, resids):
+        self.lin_count += 1
+        J = {}
+        J[('z', 'z')] = np.diag(3.0*unknowns['z']**2 + 2.0)
+        J[('z', 'x')] = -np.eye(len(unknowns['z']))
+        return J
+
+
+class RecordedGMRES(ScipyGMRES):
+    """ Records the tolerance of every solve. """
+
+    def __init__(self):
+        super(RecordedGMRES, self).__init__()
+        self.tols = []
+
+    def solve(self, rhs_mat, system, mode):
+        self.tols.append(self.options['atol'])
+        return super(RecordedGMRES, self).solve(rhs_mat, system, mode)
+
+
+class TestNewtonInexact(unittest.TestCase):
+
+    def setup_model(self, ln_solver):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([3.0, 12.0, 33.0])))
+        root.add('comp', CountedCubic())
+        root.connect('p.x', 'comp.x')
+        root.nl_solver = Newton()
+        root.nl_solver.options['maxiter'] = 50
+        root.ln_solver = ln_solver
+        prob.setup(check=False)
+        return prob
+
+    def test_jac_reuse(self):
+        prob = self.setup_model(DirectSolver())
+        prob.run()
+        assert_rel_error(self, prob['comp.z'], [1.0, 2.0, 3.0], 1e-8)
+        full_iters = prob.root.nl_solver.iter_count
+        self.assertEqual(prob.root.comp.lin_count, full_iters)
+
+        prob = self.setup_model(DirectSolver())
+        prob.root.nl_solver.options['max_jac_reuse'] = 4
+        prob.root.nl_solver.options['jac_reuse_rate'] = 0.9
+        prob.run()
+        assert_rel_error(self, prob['comp.z'], [1.0, 2.0, 3.0], 1e-8)
+        self.assertLess(prob.root.comp.lin_count, prob.root.nl_solver.iter_count)
+        self.assertLess(prob.root.comp.lin_count, full_iters)
+
+    def test_jac_reuse_rate(self):
+        # Requiring a residual reduction no chord step can reach means we
+        # linearize every iteration.
+        prob = self.setup_model(DirectSolver())
+        prob.root.nl_solver.options['max_jac_reuse'] = 4
+        prob.root.nl_solver.options['jac_reuse_rate'] = 0.0
+        prob.run()
+        assert_rel_error(self, prob['comp.z'], [1.0, 2.0, 3.0], 1e-8)
+        self.assertEqual(prob.root.comp.lin_count, prob.root.nl_solver.iter_count)
+
+    def test_eisenstat_walker(self):
+        prob = self.setup_model(RecordedGMRES())
+        prob.root.nl_solver.options['eisenstat_walker'] = True
+        prob.run()
+        assert_rel_error(self, prob['comp.z'], [1.0, 2.0, 3.0], 1e-8)
+
+        tols = prob.root.ln_solver.tols
+        self.assertEqual(tols[0], 0.9)
+
+        # The forcing term tightens as the residual drops.
+        self.assertLess(tols[-1], 1e-3)
+        self.assertLess(tols[-1], tols[0])
+
+        # The user's tolerance comes back afterward.
+        self.assertEqual(prob.root.ln_solver.options['atol'], 1e-12)
+
+    def test_eisenstat_walker_rtol(self):
+        prob = Problem()
+        prob.root = SellarDerivatives()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['eisenstat_walker'] = True
+        prob.root.ln_solver = LinearGaussSeidel()
+        prob.root.ln_solver.options['maxiter'] = 20
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+        self.assertEqual(prob.root.ln_solver.options['rtol'], 1e-10)
+        self.assertEqual(prob.root.ln_solver.options['atol'], 1e-12)
+
+    def test_eisenstat_walker_no_tolerance(self):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([3.0, 12.0, 33.0])))
+        root.add('comp', CountedCubic())
+        root.connect('p.x', 'comp.x')
+        root.nl_solver = Newton()
+        root.nl_solver.options['eisenstat_walker'] = True
+        root.ln_solver = DirectSolver()
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.setup(check=False)
+
+        self.assertEqual(str(cm.exception),
+                         "Newton solver in '' has eisenstat_walker set, but "
+                         "its linear solver, DirectSolver, has no 'rtol' or "
+                         "'atol' option to apply it to.")
+
+    def test_eisenstat_walker_restore_on_error(self):
+
+        class FailingGMRES(RecordedGMRES):
+            def solve(self, rhs_mat, system, mode):
+                if len(self.tols) == 2:
+                    raise AnalysisError("linear solve failed")
+                return super(FailingGMRES, self).solve(rhs_mat, system, mode)
+
+        prob = self.setup_model(FailingGMRES())
+        prob.root.nl_solver.options['eisenstat_walker'] = True
+        with self.assertRaises(AnalysisError):
+            prob.run()
+
+        # the forcing term was applied, but the user's tolerance and the
+        # FD status of the system come back even though the solve failed
+        self.assertEqual(prob.root.ln_solver.tols[0], 0.9)
+        self.assertEqual(prob.root.ln_solver.options['atol'], 1e-12)
+        self.assertEqual(prob.root.deriv_options['type'], 'user')
+        self.assertTrue(prob.root.deriv_options.locked)
+
 if __name__ == "__main__":
     unittest.main()
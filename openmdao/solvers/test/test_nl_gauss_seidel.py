@@ -3,9 +3,12 @@
 import sys
 import unittest
 
+import numpy as np
+
 from six.moves import cStringIO
 
-from openmdao.api import Problem, NLGaussSeidel, AnalysisError, Group, ScipyGMRES
+from openmdao.api import Problem, NLGaussSeidel, AnalysisError, Group, ScipyGMRES, \
+    ExecComp, IndepVarComp
 from openmdao.test.paraboloid import Paraboloid
 from openmdao.test.sellar import SellarNoDerivatives, SellarDerivativesGrouped
 from openmdao.test.util import assert_rel_error
@@ -150,5 +153,149 @@ class TestNLGaussSeidel(unittest.TestCase):
         self.assertTrue(prob.root.nl_solver.iter_count == 4)
 
 
+class RecordedAnderson(NLGaussSeidel):
+    """ Records the unknowns after every Anderson update. """
+
+    def __init__(self):
+        super(RecordedAnderson, self).__init__()
+        self.mixed = []
+
+    def _anderson(self, system, unknowns, unknowns_cache, n_hist):
+        n_hist = super(RecordedAnderson, self)._anderson(system, unknowns,
+                                                         unknowns_cache, n_hist)
+        self.mixed.append(unknowns.vec.copy())
+        return n_hist
+
+
+class TestNLGaussSeidelAnderson(unittest.TestCase):
+
+    def slow_cycle(self, solver):
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('c1', ExecComp('x = 0.9*y + 1.0'))
+        root.add('c2', ExecComp('y = 0.95*x - 2.0'))
+        root.connect('c1.x', 'c2.x')
+        root.connect('c2.y', 'c1.y')
+        root.nl_solver = solver
+        root.nl_solver.options['maxiter'] = 200
+        root.ln_solver = ScipyGMRES()
+        return prob
+
+    def test_sellar(self):
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.nl_solver.options['use_anderson'] = True
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        # One sweep less than plain Gauss Seidel.
+        self.assertEqual(prob.root.nl_solver.iter_count, 4)
+
+    def test_slow_cycle(self):
+        prob = self.slow_cycle(NLGaussSeidel())
+        prob.setup(check=False)
+        prob.run()
+        plain_iters = prob.root.nl_solver.iter_count
+
+        for depth in (1, 5):
+            for beta in (1.0, 0.5):
+                prob = self.slow_cycle(NLGaussSeidel())
+                prob.root.nl_solver.options['use_anderson'] = True
+                prob.root.nl_solver.options['anderson_depth'] = depth
+                prob.root.nl_solver.options['anderson_beta'] = beta
+                prob.setup(check=False)
+                prob.run()
+
+                assert_rel_error(self, prob['c1.x'], -5.51724138, 1e-6)
+                assert_rel_error(self, prob['c2.y'], -7.24137931, 1e-6)
+                self.assertLess(5*prob.root.nl_solver.iter_count, plain_iters)
+
+    def test_bounds(self):
+        prob = self.slow_cycle(RecordedAnderson())
+        prob.root.c1._init_unknowns_dict['x']['lower'] = -5.0
+        prob.root.nl_solver.options['use_anderson'] = True
+        prob.setup(check=False)
+        prob.run()
+
+        # The mixed step stops at the lower bound of x.
+        x_idx = prob.root.unknowns._dat['c1.x'].slice[0]
+        mixed_x = [u[x_idx] for u in prob.root.nl_solver.mixed]
+        self.assertGreaterEqual(min(mixed_x), -5.0)
+        self.assertTrue(-5.0 in mixed_x)
+
+    def test_keeps_derivative_vectors(self):
+        prob = self.slow_cycle(NLGaussSeidel())
+        prob.root.nl_solver.options['use_anderson'] = True
+        prob.setup(check=False)
+
+        duvec = prob.root.dumat[None].vec
+        duvec[:] = np.arange(len(duvec)) + 1.0
+        expected = duvec.copy()
+        prob.run()
+
+        np.testing.assert_array_equal(prob.root.dumat[None].vec, expected)
+
+
+class TestNLGaussSeidelSkipClean(unittest.TestCase):
+
+    def test_skip_upstream(self):
+        from openmdao.solvers.test.test_run_once import CountedExecComp
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('c0', CountedExecComp('y = 2.0*x'))
+        root.add('c1', CountedExecComp('x = 0.5*y + a'))
+        root.add('c2', CountedExecComp('y = 0.5*x - 2.0'))
+        root.connect('c0.y', 'c1.a')
+        root.connect('c1.x', 'c2.x')
+        root.connect('c2.y', 'c1.y')
+        root.ln_solver = ScipyGMRES()
+        root.nl_solver = NLGaussSeidel()
+        root.nl_solver.options['skip_clean'] = True
+        root.nl_solver.options['atol'] = 1e-10
+        root.nl_solver.options['rtol'] = 1e-10
+
+        prob.setup(check=False)
+        prob['c0.x'] = 3.0
+        prob.run()
+
+        assert_rel_error(self, prob['c1.x'], 20.0/3.0, 1e-8)
+        assert_rel_error(self, prob['c2.y'], 4.0/3.0, 1e-8)
+
+        # The component upstream of the cycle only runs in the first sweep.
+        self.assertEqual(root.c0.run_count, 1)
+        self.assertGreater(root.c1.run_count, 5)
+
+        # Changing an unconnected param makes its component dirty.
+        prob['c0.x'] = 0.0
+        prob.run()
+
+        assert_rel_error(self, prob['c1.x'], -4.0/3.0, 1e-8)
+        self.assertEqual(root.c0.run_count, 2)
+
+    def test_complex_step(self):
+        from openmdao.solvers.test.test_run_once import CountedExecComp
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([3.0])))
+        root.add('c', CountedExecComp('y=2.0*x**2', x=np.zeros(1),
+                                      y=np.zeros(1)))
+        root.connect('p.x', 'c.x')
+        root.ln_solver = ScipyGMRES()
+        root.nl_solver = NLGaussSeidel()
+        root.nl_solver.options['skip_clean'] = True
+        root.deriv_options['type'] = 'cs'
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['c.y'], mode='fwd')
+        assert_rel_error(self, J, np.array([[12.0]]), 1e-10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,10 @@
 
 import unittest
 
-from openmdao.api import IndepVarComp, Group, Problem, RunOnce, ExecComp
+import numpy as np
+
+from openmdao.api import IndepVarComp, Group, Problem, RunOnce, ExecComp, \
+    Component
 from openmdao.test.util import assert_rel_error
 
 
@@ -28,5 +31,115 @@ class TestNLGaussSeidel(unittest.TestCase):
         self.assertEqual(prob.root.nl_solver.iter_count, 1)
 
 
+class CountedExecComp(ExecComp):
+    """ Counts the calls to solve_nonlinear. """
+
+    def __init__(self, *args, **kwargs):
+        super(CountedExecComp, self).__init__(*args, **kwargs)
+        self.run_count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.run_count += 1
+        super(CountedExecComp, self).solve_nonlinear(params, unknowns, resids)
+
+
+class ByObjComp(Component):
+    """ Has a pass_by_obj param. """
+
+    def __init__(self):
+        super(ByObjComp, self).__init__()
+        self.add_param('opts', {'scale': 2.0}, pass_by_obj=True)
+        self.add_param('x', 1.0)
+        self.add_output('y', 0.0)
+        self.run_count = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.run_count += 1
+        unknowns['y'] = params['opts']['scale']*params['x']
+
+
+class TestRunOnceSkipClean(unittest.TestCase):
+
+    def setup_model(self, skip_clean=True):
+        prob = Problem()
+        root = prob.root = Group()
+        root.nl_solver.options['skip_clean'] = skip_clean
+        root.add('p1', IndepVarComp('x', 3.0))
+        root.add('p2', IndepVarComp('x', 4.0))
+        root.add('c1', CountedExecComp('y=x*2.0'))
+        sub = root.add('sub', Group())
+        sub.nl_solver.options['skip_clean'] = skip_clean
+        sub.add('c2', CountedExecComp('y=x*3.0'))
+        sub.add('c3', ByObjComp())
+        root.add('c4', CountedExecComp('y=a+b'))
+        root.connect('p1.x', 'c1.x')
+        root.connect('p2.x', 'sub.c2.x')
+        root.connect('p2.x', 'sub.c3.x')
+        root.connect('c1.y', 'c4.a')
+        root.connect('sub.c2.y', 'c4.b')
+        prob.setup(check=False)
+        return prob
+
+    def counts(self, prob):
+        root = prob.root
+        return (root.c1.run_count, root.sub.c2.run_count,
+                root.sub.c3.run_count, root.c4.run_count)
+
+    def test_skip_clean(self):
+        prob = self.setup_model()
+
+        prob.run()
+        self.assertEqual(self.counts(prob), (1, 1, 1, 1))
+        assert_rel_error(self, prob['c4.y'], 18.0, 1e-10)
+
+        # Nothing changed, so only the pass_by_obj component runs.
+        prob.run()
+        self.assertEqual(self.counts(prob), (1, 1, 2, 1))
+
+        prob['p1.x'] = 5.0
+        prob.run()
+        self.assertEqual(self.counts(prob), (2, 1, 3, 2))
+        assert_rel_error(self, prob['c4.y'], 22.0, 1e-10)
+
+        prob['p2.x'] = 1.0
+        prob.run()
+        self.assertEqual(self.counts(prob), (2, 2, 4, 3))
+        assert_rel_error(self, prob['c4.y'], 13.0, 1e-10)
+        assert_rel_error(self, prob['sub.c3.y'], 2.0, 1e-10)
+
+    def test_changed_unknowns(self):
+        prob = self.setup_model()
+        prob.run()
+
+        # An output that was changed from outside makes its owner dirty.
+        prob['c1.y'] = 100.0
+        prob.run()
+        self.assertEqual(self.counts(prob), (2, 1, 2, 1))
+        assert_rel_error(self, prob['c1.y'], 6.0, 1e-10)
+
+    def test_default(self):
+        prob = self.setup_model(skip_clean=False)
+        prob.run()
+        prob.run()
+        self.assertEqual(self.counts(prob), (2, 2, 2, 2))
+
+    def test_complex_step(self):
+        # the complex step perturbation is in the imaginary part, which
+        # the clean check can't see
+        prob = Problem()
+        root = prob.root = Group()
+        root.nl_solver.options['skip_clean'] = True
+        root.deriv_options['type'] = 'cs'
+        root.add('p', IndepVarComp('x', np.array([3.0])))
+        root.add('c', CountedExecComp('y=2.0*x**2', x=np.zeros(1),
+                                      y=np.zeros(1)))
+        root.connect('p.x', 'c.x')
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['c.y'], mode='fwd')
+        assert_rel_error(self, J, np.array([[12.0]]), 1e-10)
+
+
 if __name__ == "__main__":
     unittest.main()
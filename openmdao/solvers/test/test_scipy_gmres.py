@@ -502,5 +502,83 @@ class TestScipyGMRESPreconditioner(unittest.TestCase):
         assert_rel_error(self, J['sub3.comp3.y']['p.x'][0][0], 15.0, 1e-6)
 
 
+class TestScipyGMRESAssembledPrecon(unittest.TestCase):
+
+    def run_sellar(self, precon_method):
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+        prob.root.ln_solver.options['precon_method'] = precon_method
+
+        prob.root.mda.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        indep_list = ['x', 'z']
+        unknown_list = ['obj', 'con1', 'con2']
+
+        Jbase = {}
+        Jbase['con1'] = {}
+        Jbase['con1']['x'] = -0.98061433
+        Jbase['con1']['z'] = np.array([-9.61002285, -0.78449158])
+        Jbase['con2'] = {}
+        Jbase['con2']['x'] = 0.09692762
+        Jbase['con2']['z'] = np.array([1.94989079, 1.0775421 ])
+        Jbase['obj'] = {}
+        Jbase['obj']['x'] = 2.98061392
+        Jbase['obj']['z'] = np.array([9.61001155, 1.78448534])
+
+        iters = {}
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(indep_list, unknown_list, mode=mode,
+                                   return_format='dict')
+            for key1, val1 in Jbase.items():
+                for key2, val2 in val1.items():
+                    assert_rel_error(self, J[key1][key2], val2, .00001)
+            iters[mode] = prob.root.ln_solver.iter_count
+
+        return prob, iters
+
+    def test_sellar_lu(self):
+        prob, iters = self.run_sellar('lu')
+
+        # The complete factorization is exact.
+        self.assertEqual(iters, {'fwd': 1, 'rev': 1})
+
+    def test_sellar_ilu(self):
+        prob, iters = self.run_sellar('ilu')
+        base_prob, base_iters = self.run_sellar('user')
+
+        self.assertLessEqual(iters['fwd'], base_iters['fwd'])
+        self.assertLessEqual(iters['rev'], base_iters['rev'])
+
+    def test_refactor_on_linearize(self):
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', IndepVarComp('x', np.array([1.0, 2.0, 3.0])))
+        root.add('comp', ExecComp('y = x**2', x=np.zeros(3), y=np.zeros(3)))
+        root.connect('p.x', 'comp.x')
+        root.ln_solver = ScipyGMRES()
+        root.ln_solver.options['precon_method'] = 'lu'
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['comp.y'], mode='fwd')
+        assert_rel_error(self, J, np.diag([2.0, 4.0, 6.0]), 1e-8)
+        lup = root.ln_solver._lup
+
+        # Solves without a new linearization reuse the factorization.
+        rhs = {None: np.ones(len(root.dumat[None].vec))}
+        root.ln_solver.solve(rhs, root, 'fwd')
+        self.assertIs(root.ln_solver._lup, lup)
+
+        prob['p.x'] = np.array([3.0, 2.0, 1.0])
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['comp.y'], mode='fwd')
+        assert_rel_error(self, J, np.diag([6.0, 4.0, 2.0]), 1e-8)
+        self.assertIsNot(root.ln_solver._lup, lup)
+
+
 if __name__ == "__main__":
     unittest.main()
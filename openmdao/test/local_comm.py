@@ -0,0 +1,144 @@
+"""
+A stand-in for an MPI communicator that runs each rank in a thread of the
+current process, so that message passing code can be tested without MPI.
+"""
+
+import pickle
+import threading
+import traceback
+
+ANY_SOURCE = -2
+ANY_TAG = -1
+
+# tag used internally for collective operations
+_COLL_TAG = -1000
+
+
+class _Request(object):
+    """ A completed nonblocking send."""
+
+    def test(self):
+        return (True, None)
+
+    def wait(self):
+        return None
+
+
+class _Mailbox(object):
+    """ Messages waiting to be received by a rank."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.messages = []
+
+
+class LocalComm(object):
+    """
+    Implements the point to point, probe and broadcast parts of the mpi4py
+    communicator interface for lowercase (pickled object) messages. Objects
+    are pickled when sent, so the receiver gets a copy just like under MPI.
+
+    Args
+    ----
+    rank : int
+        Rank of this communicator.
+
+    mailboxes : list of _Mailbox
+        One mailbox for each rank.
+    """
+
+    def __init__(self, rank, mailboxes):
+        self.rank = rank
+        self.size = len(mailboxes)
+        self._mailboxes = mailboxes
+
+    def send(self, obj, dest, tag=0):
+        box = self._mailboxes[dest]
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        with box.cond:
+            box.messages.append((self.rank, tag, data))
+            box.cond.notify_all()
+
+    def isend(self, obj, dest, tag=0):
+        self.send(obj, dest, tag)
+        return _Request()
+
+    def _find(self, source, tag):
+        """ Returns the index of the first matching message, or None."""
+        for i, (src, mtag, data) in enumerate(self._mailboxes[self.rank].messages):
+            if (source == ANY_SOURCE or source == src) and \
+               (tag == ANY_TAG or tag == mtag):
+                return i
+
+    def recv(self, buf=None, source=ANY_SOURCE, tag=ANY_TAG, status=None):
+        box = self._mailboxes[self.rank]
+        with box.cond:
+            while True:
+                i = self._find(source, tag)
+                if i is not None:
+                    return pickle.loads(box.messages.pop(i)[2])
+                box.cond.wait()
+
+    def iprobe(self, source=ANY_SOURCE, tag=ANY_TAG, status=None):
+        with self._mailboxes[self.rank].cond:
+            return self._find(source, tag) is not None
+
+    def bcast(self, obj, root=0):
+        if self.rank == root:
+            for rank in range(self.size):
+                if rank != root:
+                    self.send(obj, rank, tag=_COLL_TAG)
+            return obj
+        return self.recv(source=root, tag=_COLL_TAG)
+
+    def barrier(self):
+        self.bcast(self.gather(None), root=0)
+
+    def gather(self, obj, root=0):
+        if self.rank == root:
+            objs = [None]*self.size
+            objs[root] = obj
+            for rank in range(self.size):
+                if rank != root:
+                    objs[rank] = self.recv(source=rank, tag=_COLL_TAG)
+            return objs
+        self.send(obj, root, tag=_COLL_TAG)
+
+
+def run_ranks(func, size, *args):
+    """
+    Runs func(comm, *args) for each rank of a `LocalComm` of the given size
+    in its own thread.
+
+    Returns
+    -------
+    list
+        The return value of func for each rank.
+
+    Raises
+    ------
+    RuntimeError
+        If func raised an exception in any of the ranks.
+    """
+    mailboxes = [_Mailbox() for i in range(size)]
+    results = [None]*size
+    errors = []
+
+    def target(rank):
+        try:
+            results[rank] = func(LocalComm(rank, mailboxes), *args)
+        except Exception:
+            errors.append((rank, traceback.format_exc()))
+
+    threads = [threading.Thread(target=target, args=(rank,))
+               for rank in range(size)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise RuntimeError("\n".join("rank %d:\n%s" % e for e in errors))
+
+    return results
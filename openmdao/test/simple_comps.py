@@ -209,6 +209,37 @@ class SimpleSparseArrayComp(Component):
         return J
 
 
+class DeclaredSparseArrayComp(Component):
+    """A vectorized component that declares the sparsity of its partials.
+
+    y[i] = 3*x[i]**2 + z[0]
+    """
+
+    def __init__(self, size=5):
+        super(DeclaredSparseArrayComp, self).__init__()
+
+        self.add_param('x', np.arange(size, dtype=float) + 1.0)
+        self.add_param('z', np.ones(1))
+        self.add_output('y', np.zeros(size))
+
+        # nonzeros don't have to be given in row order
+        self.declare_partials('y', 'x', rows=np.arange(size)[::-1],
+                              cols=np.arange(size)[::-1])
+        self.declare_partials('y', 'z', rows=np.arange(size),
+                              cols=np.zeros(size, dtype=int))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        """ Doesn't do much."""
+        unknowns['y'] = 3.0*params['x']**2 + params['z'][0]
+
+    def linearize(self, params, unknowns, resids):
+        """Analytical derivatives, nonzeros only."""
+        J = {}
+        J['y', 'x'] = 6.0*params['x'][::-1]
+        J['y', 'z'] = np.ones(params['x'].size)
+        return J
+
+
 class SimpleImplicitComp(Component):
     """ A Simple Implicit Component with an additional output equation.
 
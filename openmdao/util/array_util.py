@@ -4,6 +4,7 @@ import sys
 from six.moves import range, zip
 import numpy as np
 from numpy import ndarray
+from scipy.sparse import coo_matrix
 from itertools import product
 
 
@@ -53,6 +54,53 @@ def evenly_distrib_idxs(num_divisions, arr_size):
 
     return sizes, offsets
 
+def offsets_from_sizes(sizes):
+    """
+    Return the starting offset of each entry when the entries of a
+    (rank x var) sizes array are laid out one after another, rank by rank.
+
+    Args
+    ----
+    sizes : ndarray
+        Array of sizes.
+
+    Returns
+    -------
+    ndarray
+        Array of offsets, the same shape as sizes.
+    """
+    flat = sizes.ravel()
+    return (np.cumsum(flat) - flat).reshape(sizes.shape)
+
+
+def idx_ranges(starts, sizes, dtype=int):
+    """
+    Return the concatenation of the index ranges [start, start+size) for
+    each start and size, built without a python loop.
+
+    Args
+    ----
+    starts : ndarray
+        Start of each range.
+
+    sizes : ndarray
+        Size of each range.
+
+    dtype : numpy dtype, optional
+        Type of the returned index array.
+
+    Returns
+    -------
+    ndarray
+        The concatenated ranges.
+    """
+    starts = np.asarray(starts, dtype=dtype)
+    sizes = np.asarray(sizes, dtype=dtype)
+    ends = np.cumsum(sizes)
+    return (np.arange(ends[-1] if ends.size else 0, dtype=dtype) +
+            np.repeat(starts - (ends - sizes), sizes))
+
+
 def to_slice(idxs):
     """Convert an index array to a slice if possible. Otherwise,
     return the index array. Indices are assumed to be sorted in
@@ -69,9 +117,65 @@ def to_slice(idxs):
         return idxs
 
     #make sure stride is consistent throughout the array
-    if any(idxs[1:]-idxs[:-1] != stride):
+    if np.any(idxs[1:]-idxs[:-1] != stride):
         return idxs
 
     # set the upper bound to idxs[-1]+stride instead of idxs[-1]+1 because
     # later, we compare upper and lower bounds when collapsing slices
     return slice(idxs[0], idxs[-1]+stride, stride)
+
+
+def color_columns(rows, cols, shape):
+    """
+    Greedily color the columns of a sparse matrix so that no two columns of
+    the same color have a nonzero in the same row. Columns of one color are
+    structurally orthogonal and can be perturbed or seeded together.
+
+    Args
+    ----
+    rows : ndarray of int
+        Row index of each nonzero entry.
+
+    cols : ndarray of int
+        Column index of each nonzero entry.
+
+    shape : tuple
+        Shape (nrows, ncols) of the matrix.
+
+    Returns
+    -------
+    list of ndarray
+        One sorted array of column indices per color.
+    """
+    ncols = shape[1]
+    if ncols == 0:
+        return []
+
+    pattern = coo_matrix((np.ones(len(rows), dtype=bool), (rows, cols)),
+                         shape=shape)
+    csc = pattern.tocsc()
+    csr = pattern.tocsr()
+    c_ptr, c_idx = csc.indptr, csc.indices
+    r_ptr, r_idx = csr.indptr, csr.indices
+
+    col_color = -np.ones(ncols, dtype=int)
+    ncolors = 0
+
+    # color the densest columns first
+    for col in np.argsort(c_ptr[:-1] - c_ptr[1:], kind='mergesort'):
+        col_rows = c_idx[c_ptr[col]:c_ptr[col+1]]
+        if len(col_rows) == 0:
+            nbrs = col_rows
+        else:
+            nbrs = np.concatenate([r_idx[r_ptr[r]:r_ptr[r+1]] for r in col_rows])
+
+        used = np.zeros(ncolors + 1, dtype=bool)
+        nbr_colors = col_color[nbrs]
+        used[nbr_colors[nbr_colors >= 0]] = True
+        color = np.argmin(used)
+
+        col_color[col] = color
+        if color == ncolors:
+            ncolors += 1
+
+    return [np.nonzero(col_color == c)[0] for c in range(ncolors)]
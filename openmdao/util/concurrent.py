@@ -1,11 +1,117 @@
 
+import time
 import traceback
+from collections import deque
+from itertools import islice
 
-def concurrent_eval_lb(func, cases, comm, broadcast=False):
+# Run time in seconds that adaptively sized chunks of cases aim for.
+CHUNK_TIME = 0.1
+
+# Upper bound on the number of cases in an adaptively sized chunk.
+MAX_CHUNK_SIZE = 32
+
+
+class ChunkSizer(object):
+    """
+    Decides how many cases to send to a worker in one message. Sending
+    several cheap cases at once keeps messaging latency from dominating
+    their run time.
+
+    Args
+    ----
+    chunk_size : int, optional
+        Number of cases in each chunk. If 0, the size is adapted to the
+        measured run time of the cases so that a chunk takes about
+        `target_time` seconds to run. Defaults to 1.
+
+    target_time : float, optional
+        Run time in seconds that adaptively sized chunks aim for.
+
+    max_size : int, optional
+        Upper bound on the size of adaptively sized chunks.
+    """
+
+    def __init__(self, chunk_size=1, target_time=CHUNK_TIME,
+                 max_size=MAX_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.target_time = target_time
+        self.max_size = max_size
+        self.case_time = None
+
+    def size(self):
+        """
+        Returns
+        -------
+        int
+            The number of cases to put in the next chunk.
+        """
+        if self.chunk_size > 0:
+            return self.chunk_size
+        if self.case_time is None:
+            # start small until we know how long a case takes
+            return 1
+        if self.case_time <= 0.0:
+            return self.max_size
+        return max(1, min(self.max_size,
+                          int(self.target_time / self.case_time)))
+
+    def update(self, num_cases, elapsed):
+        """
+        Record the run time of a chunk of cases.
+
+        Args
+        ----
+        num_cases : int
+            Number of cases in the chunk.
+
+        elapsed : float
+            Time in seconds it took to run the chunk.
+        """
+        if num_cases > 0:
+            case_time = elapsed / num_cases
+            if self.case_time is None:
+                self.case_time = case_time
+            else:
+                # smooth out the noise in individual measurements
+                self.case_time = 0.5 * (self.case_time + case_time)
+
+    def next_chunk(self, case_iter, limit=None):
+        """
+        Args
+        ----
+        case_iter : iterator
+            Iterator over the remaining cases.
+
+        limit : int, optional
+            If given, the chunk has at most this many cases.
+
+        Returns
+        -------
+        list
+            The next chunk of cases, which is empty if there are no cases
+            left.
+        """
+        size = self.size()
+        if limit is not None:
+            size = min(size, limit)
+
+        chunk = []
+        if size <= 0:
+            return chunk
+        for case in case_iter:
+            chunk.append(case)
+            if len(chunk) >= size:
+                break
+        return chunk
+
+
+def concurrent_eval_lb(func, cases, comm, broadcast=False, chunk_size=1,
+                       prefetch=1, master_runs=False, group_size=0,
+                       pool=None):
     """
     Runs a load balanced version of the given function, with the master
-    rank (0) sending a new case to each worker rank as soon as it
-    has finished its last case.
+    rank (0) sending new cases to each worker rank as soon as it
+    has finished its previous ones.
 
     Args
     ----
@@ -19,110 +125,351 @@ def concurrent_eval_lb(func, cases, comm, broadcast=False):
 
     com : MPI communicator or None
         The MPI communicator that is shared between the master and workers.
-        If None, the function will be executed serially.
+        If None, the function will be executed on the workers of `pool`, or
+        serially if there is no pool.
 
     broadcast : bool, optional
         If True, the results will be broadcast out to the worker procs so
         that the return value of concurrent_eval_lb will be the full result
         list in every process.
+
+    chunk_size : int, optional
+        Number of cases sent to a worker in each message. If 0, the number
+        is adapted to the measured run time of the cases. Defaults to 1.
+
+    prefetch : int, optional
+        Number of chunks kept queued at each worker, so that a worker can
+        start on its next chunk without waiting to hear from the master.
+        Defaults to 1.
+
+    master_runs : bool, optional
+        If True, masters also run cases themselves whenever no worker is
+        waiting to hear from them. A master with no workers always runs
+        cases. Defaults to False. This works best with a prefetch of 2 or
+        more, so that workers that finish while the master is running a
+        case have another chunk to start on.
+
+    group_size : int, optional
+        If greater than 0 and less than the size of the communicator, the
+        ranks are split into groups of this many ranks. The first rank of
+        each group other than rank 0 is a sub-master that gets batches of
+        cases from rank 0 and sends them out to the workers in its group, so
+        that rank 0 doesn't have to talk to every worker. Rank 0 serves the
+        workers in the first group directly. Defaults to 0.
+
+    pool : `WorkerPool`, optional
+        If given and comm is None, the cases are run on the processes of
+        this pool, e.g., the one returned by `Problem.get_worker_pool`, with
+        up to `prefetch` chunks of `chunk_size` cases queued at each worker.
+        func, args and kwargs must be picklable. An adaptive `chunk_size`
+        of 0 runs one case per chunk.
     """
     if comm is not None:
-        if comm.rank == 0:  # master rank
-            results = _concurrent_eval_lb_master(cases, comm)
+        if group_size <= 0 or group_size > comm.size:
+            group_size = comm.size
+
+        leader = comm.rank - comm.rank % group_size
+        if comm.rank == leader:
+            workers = range(leader+1, min(leader+group_size, comm.size))
+            if comm.rank == 0:  # master rank
+                balancer = _LoadBalancer(func, comm, workers, chunk_size,
+                                         prefetch, master_runs, cases=cases,
+                                         sub_masters=range(group_size,
+                                                           comm.size,
+                                                           group_size))
+            else:
+                balancer = _LoadBalancer(func, comm, workers, chunk_size,
+                                         prefetch, master_runs)
+            results = balancer.run()
         else:
-            results = _concurrent_eval_lb_worker(func, comm)
+            results = _concurrent_eval_lb_worker(func, comm, leader)
 
         if broadcast:
             results = comm.bcast(results, root=0)
 
-    else: # serial execution
+    elif pool is not None:
+        tasks = ((func, chunk)
+                 for chunk in _iter_chunks(cases, max(chunk_size, 1)))
         results = []
-        for args, kwargs in cases:
-            try:
-                if kwargs:
-                    retval = func(*args, **kwargs)
-                else:
-                    retval = func(*args)
-            except:
-                err = traceback.format_exc()
-                retval = None
-            else:
-                err = None
-            results.append((retval, err))
+        for worker, chunk_results in pool.imap_unordered(_eval_chunk, tasks,
+                                                          prefetch):
+            results.extend(chunk_results)
+
+    else: # serial execution
+        results = [_eval_case(func, args, kwargs) for args, kwargs in cases]
 
     return results
 
-def _concurrent_eval_lb_master(cases, comm):
+def _eval_case(func, args, kwargs):
     """
-    This runs only on rank 0.  It sends cases to all of the workers and
-    collects their results.
+    Returns a tuple of the form (retval, err) for a single case.
     """
-    received = 0
-    sent = 0
-
-    results = []
+    try:
+        if kwargs:
+            retval = func(*args, **kwargs)
+        else:
+            retval = func(*args)
+    except:
+        err = traceback.format_exc()
+        retval = None
+    else:
+        err = None
+    return (retval, err)
 
+def _iter_chunks(cases, size):
+    """
+    Iterates over lists of up to size cases.
+    """
     case_iter = iter(cases)
-
-    # seed the workers
-    for i in range(1, comm.size):
-        try:
-            case = next(case_iter)
-        except StopIteration:
+    while True:
+        chunk = list(islice(case_iter, size))
+        if not chunk:
             break
+        yield chunk
 
-        comm.send(case, i, tag=1)
-        sent += 1
+def _eval_chunk(problem, func, chunk):
+    """
+    `WorkerPool` task that returns the (retval, err) tuples for a chunk of
+    cases.
+    """
+    return [_eval_case(func, args, kwargs) for args, kwargs in chunk]
 
-    # send the rest of the cases
-    if sent > 0:
-        while True:
-            # wait for any worker to finish
-            worker, retval, err = comm.recv(tag=2)
+def _popleft_iter(queue):
+    """
+    Iterates over a deque, removing the entries as they are returned.
+    """
+    while queue:
+        yield queue.popleft()
+
+
+class _LoadBalancer(object):
+    """
+    A master rank that sends chunks of cases to its workers and collects
+    their results as they come in.
+
+    Every message to a master is sent with tag 2 and has the form
+    (sender_rank, results, info). Workers send the results of a chunk, with
+    the time it took to run as info. In a hierarchical run, sub-masters
+    send the results they've collected so far to rank 0 along with the
+    number of cases they want next (0 if they're done), and rank 0 replies
+    with a list of cases, which is empty once all cases have been handed
+    out.
+
+    Args
+    ----
+    func : function
+        The function to execute.
+
+    comm : MPI communicator
+        The communicator shared by all masters and workers.
+
+    workers : iter of int
+        Ranks of the workers served by this master.
+
+    chunk_size : int
+        Number of cases sent to a worker in each message, or 0 to adapt it
+        to the measured run time of the cases.
+
+    prefetch : int
+        Number of chunks kept queued at each worker.
+
+    master_runs : bool
+        If True, run cases locally whenever no messages are waiting.
+
+    cases : collection of function args, optional
+        The cases to run. Only given to rank 0. Sub-masters get their cases
+        from rank 0.
+
+    sub_masters : iter of int, optional
+        Ranks of the sub-masters served by rank 0.
+    """
+
+    def __init__(self, func, comm, workers, chunk_size, prefetch, master_runs,
+                 cases=None, sub_masters=()):
+        self.func = func
+        self.comm = comm
+        self.workers = list(workers)
+        self.prefetch = prefetch
+        self.run_local = master_runs or not self.workers
+        self.sizer = ChunkSizer(chunk_size)
+
+        self.outstanding = dict((w, 0) for w in self.workers)
+        self.sub_masters = set(sub_masters)
+        self.active_subs = len(self.sub_masters)
+        self.requests = []
+        self.results = []
+
+        if cases is None:
+            # cases come in batches from rank 0
+            self.case_iter = None
+            self.queue = deque()
+            self.asked = False
+        else:
+            self.case_iter = iter(cases)
+        self.exhausted = False
+
+    def run(self):
+        """
+        Runs all of the cases.
 
-            received += 1
+        Returns
+        -------
+        list or None
+            List of (retval, err) tuples for all of the cases on rank 0, and
+            None on sub-masters.
+        """
+        comm = self.comm
 
-            # store results
-            results.append((retval, err))
+        while True:
+            self._dispatch()
+            if self.case_iter is None:
+                self._request_cases()
+
+            busy = self._busy()
+            if self.run_local and self._has_cases() and \
+               not (busy and comm.iprobe(tag=2)):
+                self._run_case()
+                continue
 
-            # don't stop until we hear back from every worker process
-            # we sent a case to
-            if received == sent:
+            if not busy:
                 break
 
-            try:
-                case = next(case_iter)
-            except StopIteration:
-                pass
+            self._receive(*comm.recv(tag=2))
+
+        for r in self.requests:
+            r.wait()
+
+        # tell all workers to stop
+        for rank in self.workers:
+            comm.send(None, rank, tag=1)
+
+        if self.case_iter is None:
+            # send our last results up to rank 0
+            comm.send((comm.rank, self.results, 0), 0, tag=2)
+            return None
+
+        return self.results
+
+    def _busy(self):
+        """
+        Returns True if we're waiting on a message.
+        """
+        if self.case_iter is None and self.asked:
+            return True
+        return self.active_subs > 0 or any(self.outstanding.values())
+
+    def _has_cases(self):
+        """
+        Returns True if there may be cases left that haven't been handed out.
+        """
+        if self.case_iter is None:
+            return len(self.queue) > 0
+        return not self.exhausted
+
+    def _next_chunk(self, limit=None):
+        """
+        Returns the next chunk of cases, which is empty if we don't have
+        any cases on hand.
+        """
+        if self.case_iter is None:
+            return self.sizer.next_chunk(_popleft_iter(self.queue), limit)
+
+        if self.exhausted:
+            return []
+        chunk = self.sizer.next_chunk(self.case_iter, limit)
+        if not chunk:
+            self.exhausted = True
+        return chunk
+
+    def _send(self, obj, dest, tag):
+        """
+        Sends without blocking, so that chunks queued for a busy worker
+        don't hold up the master.
+        """
+        self.requests = [r for r in self.requests if not r.test()[0]]
+        self.requests.append(self.comm.isend(obj, dest, tag=tag))
+
+    def _dispatch(self):
+        """
+        Fill the queues of our workers with up to prefetch chunks each.
+        """
+        for i in range(self.prefetch):
+            for rank in self.workers:
+                if self.outstanding[rank] <= i:
+                    chunk = self._next_chunk()
+                    if not chunk:
+                        return
+                    self._send(chunk, rank, tag=1)
+                    self.outstanding[rank] += 1
+
+    def _request_cases(self):
+        """
+        On a sub-master, ask rank 0 for more cases when we're running low,
+        passing along the results we have so far.
+        """
+        if self.asked or self.exhausted:
+            return
+
+        want = (len(self.workers) + self.run_local) * self.prefetch * \
+               self.sizer.size()
+        if len(self.queue) <= want // 2:
+            self._send((self.comm.rank, self.results, want), 0, tag=2)
+            self.results = []
+            self.asked = True
+
+    def _run_case(self):
+        """
+        Run a case locally.
+        """
+        chunk = self._next_chunk(limit=1)
+        if chunk:
+            start = time.time()
+            args, kwargs = chunk[0]
+            self.results.append(_eval_case(self.func, args, kwargs))
+            self.sizer.update(1, time.time() - start)
+
+    def _receive(self, rank, results, info):
+        """
+        Handle a message from a worker, a sub-master, or rank 0.
+        """
+        if rank in self.outstanding:
+            # a worker finished a chunk
+            self.outstanding[rank] -= 1
+            self.results.extend(results)
+            self.sizer.update(len(results), info)
+
+        elif rank in self.sub_masters:
+            self.results.extend(results)
+            if info:
+                # send the sub-master the cases it asked for
+                if self.exhausted:
+                    cases = []
+                else:
+                    cases = list(islice(self.case_iter, info))
+                    if len(cases) < info:
+                        self.exhausted = True
+                self._send((self.comm.rank, cases, None), rank, tag=2)
             else:
-                # send new case to the last worker that finished
-                comm.send(case, worker, tag=1)
-                sent += 1
+                self.active_subs -= 1
 
-    # tell all workers to stop
-    for rank in range(1, comm.size):
-        comm.send((None, None), rank, tag=1)
+        else:
+            # a batch of cases from rank 0
+            self.asked = False
+            self.queue.extend(results)
+            if not results:
+                self.exhausted = True
 
-    return results
 
-def _concurrent_eval_lb_worker(func, comm):
+def _concurrent_eval_lb_worker(func, comm, master=0):
     while True:
-        # wait on a case from the master
-        args, kwargs = comm.recv(source=0, tag=1)
+        # wait on a chunk of cases from the master
+        chunk = comm.recv(source=master, tag=1)
 
-        if args is None: # we're done
+        if chunk is None: # we're done
             break
 
-        try:
-            if kwargs:
-                retval = func(*args, **kwargs)
-            else:
-                retval = func(*args)
-        except:
-            err = traceback.format_exc()
-            retval = None
-        else:
-            err = None
+        start = time.time()
+        results = [_eval_case(func, args, kwargs) for args, kwargs in chunk]
 
-        # tell the master we're done with that case
-        comm.send((comm.rank, retval, err), 0, tag=2)
+        # tell the master we're done with that chunk
+        comm.send((comm.rank, results, time.time() - start), master, tag=2)
@@ -0,0 +1,171 @@
+""" Arrays in shared memory for passing results between processes."""
+
+import os
+import mmap
+import tempfile
+from six.moves import range, zip
+
+import numpy
+
+
+def _shm_dir():
+    """ Use a memory backed filesystem for the buffer files if there is one."""
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm'
+    return None
+
+
+class SharedSlotBuffer(object):
+    """
+    A fixed number of slots of float data in memory that is shared between
+    processes. Each slot holds the flattened values of a list of variables
+    laid out back to back, so a process can write a set of results into a
+    slot and another process can read them without any pickling or copying.
+
+    The memory is a mapped file, so the buffer can be pickled and sent to
+    processes that are already running, like the workers of a
+    `WorkerPool`, and they will map the same memory when they unpickle it.
+    The file is removed when the buffer is closed or garbage collected in
+    the process that created it.
+
+    Slots are handed out with `acquire` and returned with `release`. This
+    bookkeeping is only done in the process that created the buffer.
+
+    Args
+    ----
+    shapes : list
+        Shapes of the variables stored in each slot. An entry of None
+        stands for a float.
+
+    num_slots : int
+        Number of slots in the buffer.
+    """
+
+    def __init__(self, shapes, num_slots):
+        self.shapes = list(shapes)
+        self.num_slots = num_slots
+
+        sizes = [1 if s is None else int(numpy.prod(s)) for s in self.shapes]
+        self.slot_size = sum(sizes)
+        self._offsets = numpy.cumsum([0] + sizes)
+
+        self._nbytes = max(num_slots*self.slot_size, 1) * \
+                       numpy.dtype(float).itemsize
+        fd, self._fname = tempfile.mkstemp(prefix='om_buf_', dir=_shm_dir())
+        try:
+            os.write(fd, b'\0' * self._nbytes)
+            self._mmap = mmap.mmap(fd, self._nbytes)
+        finally:
+            os.close(fd)
+        self._owner = os.getpid()
+
+        self._free = list(range(num_slots-1, -1, -1))
+        self._setup_views()
+
+    def _setup_views(self):
+        """ Create the views of the variables in each slot."""
+        data = numpy.frombuffer(self._mmap, dtype=float)
+        self.data = data[:self.num_slots*self.slot_size].reshape(self.num_slots,
+                                                                 self.slot_size)
+        self._views = []
+        for slot in range(self.num_slots):
+            row = self.data[slot]
+            views = []
+            for i, shape in enumerate(self.shapes):
+                view = row[self._offsets[i]:self._offsets[i+1]]
+                if shape is not None:
+                    view = view.reshape(shape)
+                views.append(view)
+            self._views.append(views)
+
+    def __getstate__(self):
+        """ The memory map and numpy views can't be pickled, so they're
+        rebuilt from the file when another process unpickles the buffer."""
+        state = self.__dict__.copy()
+        del state['_mmap']
+        del state['data']
+        del state['_views']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        with open(self._fname, 'r+b') as f:
+            self._mmap = mmap.mmap(f.fileno(), self._nbytes)
+        self._setup_views()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Remove the file behind the buffer if this process created it. The
+        memory stays mapped in processes that are still using it.
+        """
+        if getattr(self, '_fname', None) and self._owner == os.getpid():
+            try:
+                os.remove(self._fname)
+            except OSError:
+                pass
+            self._fname = None
+
+    def acquire(self):
+        """
+        Returns
+        -------
+        int
+            The index of a free slot, or None if all slots are in use.
+        """
+        if self._free:
+            return self._free.pop()
+
+    def num_free(self):
+        """
+        Returns
+        -------
+        int
+            The number of free slots.
+        """
+        return len(self._free)
+
+    def release(self, slot):
+        """
+        Return a slot to the set of free slots.
+
+        Args
+        ----
+        slot : int
+            Index of the slot.
+        """
+        self._free.append(slot)
+
+    def write(self, slot, values):
+        """
+        Copy values into a slot.
+
+        Args
+        ----
+        slot : int
+            Index of the slot.
+
+        values : iter
+            A value for each of the variables in the slot.
+        """
+        for view, val in zip(self._views[slot], values):
+            view[...] = val
+
+    def read(self, slot):
+        """
+        Args
+        ----
+        slot : int
+            Index of the slot.
+
+        Returns
+        -------
+        list
+            The values of the variables in the slot. Arrays are views into
+            the shared memory, so they are only valid until the slot is
+            released and written again.
+        """
+        return [view[0] if shape is None else view
+                for view, shape in zip(self._views[slot], self.shapes)]
@@ -0,0 +1,107 @@
+""" Tests for the load balanced concurrent evaluation utilities."""
+
+import unittest
+
+from openmdao.util.concurrent import ChunkSizer, concurrent_eval_lb
+from openmdao.test.local_comm import run_ranks
+
+
+def _square(x, offset=0):
+    if x == 13:
+        raise RuntimeError("unlucky")
+    return x*x + offset
+
+
+class TestChunkSizer(unittest.TestCase):
+
+    def test_fixed_size(self):
+        sizer = ChunkSizer(3)
+        it = iter(range(7))
+        self.assertEqual(sizer.next_chunk(it), [0, 1, 2])
+        sizer.update(3, 100.)
+        self.assertEqual(sizer.next_chunk(it, limit=2), [3, 4])
+        self.assertEqual(sizer.next_chunk(it), [5, 6])
+        self.assertEqual(sizer.next_chunk(it), [])
+
+    def test_adaptive_size(self):
+        sizer = ChunkSizer(0, target_time=1.0, max_size=8)
+        self.assertEqual(sizer.size(), 1)
+
+        sizer.update(1, 0.25)
+        self.assertEqual(sizer.size(), 4)
+
+        # averaged with the previous case time
+        sizer.update(2, 0.0)
+        self.assertEqual(sizer.size(), 8)
+
+        sizer.update(1, 10.)
+        self.assertEqual(sizer.size(), 1)
+
+        # empty chunks don't change the estimate
+        sizer.update(0, 5.)
+        self.assertEqual(sizer.size(), 1)
+
+
+class TestConcurrentEvalLB(unittest.TestCase):
+
+    def setUp(self):
+        self.cases = [([i], None) for i in range(40)]
+        self.cases[5] = ([5], {'offset': 1})
+
+    def _check(self, results):
+        self.assertEqual(len(results), 40)
+        results = sorted(results, key=lambda r: -1 if r[0] is None else r[0])
+        self.assertEqual(results[0][0], None)
+        self.assertTrue('unlucky' in results[0][1])
+        expected = sorted([i*i for i in range(40) if i != 13] + [26])
+        expected.remove(25)
+        self.assertEqual([r[0] for r in results[1:]], expected)
+        self.assertTrue(all(r[1] is None for r in results[1:]))
+
+    def test_serial(self):
+        self._check(concurrent_eval_lb(_square, self.cases, None))
+
+    def _run(self, **kwargs):
+        def func(comm):
+            return concurrent_eval_lb(_square, self.cases, comm, **kwargs)
+        return run_ranks(func, 4)
+
+    def test_single_cases(self):
+        results = self._run()
+        self._check(results[0])
+        self.assertEqual(results[1:], [None]*3)
+
+    def test_chunks(self):
+        results = self._run(chunk_size=3, prefetch=2, broadcast=True)
+        for res in results:
+            self._check(res)
+
+    def test_adaptive_chunks(self):
+        results = self._run(chunk_size=0, prefetch=3)
+        self._check(results[0])
+
+    def test_master_runs(self):
+        results = self._run(master_runs=True, chunk_size=2)
+        self._check(results[0])
+
+    def test_master_only(self):
+        def func(comm):
+            return concurrent_eval_lb(_square, self.cases, comm)
+        self._check(run_ranks(func, 1)[0])
+
+    def test_hierarchical(self):
+        def func(comm, **kwargs):
+            return concurrent_eval_lb(_square, self.cases, comm, **kwargs)
+
+        for size, group_size in [(7, 3), (6, 3), (4, 1), (5, 2)]:
+            for master_runs in (False, True):
+                results = run_ranks(lambda comm: func(comm, group_size=group_size,
+                                                      master_runs=master_runs,
+                                                      chunk_size=0, prefetch=2),
+                                    size)
+                self._check(results[0])
+                self.assertEqual(results[1:], [None]*(size-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+import multiprocessing
+
+import numpy as np
+
+from openmdao.util.shared_buffer import SharedSlotBuffer
+
+
+def _fill(buf, slot):
+    buf.write(slot, [np.arange(6.0).reshape(2, 3)*slot, float(slot)])
+
+
+def _fill_from_queue(queue, done):
+    buf, slot = queue.get()
+    _fill(buf, slot)
+    done.put(slot)
+
+
+class SharedSlotBufferTestCase(unittest.TestCase):
+
+    def test_slots(self):
+        buf = SharedSlotBuffer([(2, 3), None], 3)
+        self.assertEqual(buf.slot_size, 7)
+        self.assertEqual(buf.data.shape, (3, 7))
+
+        slots = [buf.acquire() for i in range(3)]
+        self.assertEqual(slots, [0, 1, 2])
+        self.assertEqual(buf.acquire(), None)
+
+        buf.release(1)
+        self.assertEqual(buf.acquire(), 1)
+
+        buf.write(2, [np.ones((2, 3)), 5.0])
+        arr, val = buf.read(2)
+        self.assertEqual(val, 5.0)
+        self.assertEqual(arr.shape, (2, 3))
+        np.testing.assert_array_equal(buf.data[2], [1., 1., 1., 1., 1., 1., 5.])
+
+        # reads are views into the buffer
+        buf.data[2, 0] = 9.0
+        self.assertEqual(arr[0, 0], 9.0)
+
+    @unittest.skipIf(sys.platform == 'win32', "relies on fork")
+    def test_write_in_other_process(self):
+        buf = SharedSlotBuffer([(2, 3), None], 2)
+
+        proc = multiprocessing.Process(target=_fill, args=(buf, 1))
+        proc.start()
+        proc.join()
+
+        arr, val = buf.read(1)
+        self.assertEqual(val, 1.0)
+        np.testing.assert_array_equal(arr, np.arange(6.0).reshape(2, 3))
+        np.testing.assert_array_equal(buf.data[0], np.zeros(7))
+
+    def test_send_to_running_process(self):
+        queue = multiprocessing.Queue()
+        done = multiprocessing.Queue()
+        proc = multiprocessing.Process(target=_fill_from_queue,
+                                       args=(queue, done))
+        proc.start()
+
+        # the buffer is created after the process has started
+        buf = SharedSlotBuffer([(2, 3), None], 3)
+        queue.put((buf, 2))
+        self.assertEqual(done.get(), 2)
+        proc.join()
+
+        arr, val = buf.read(2)
+        self.assertEqual(val, 2.0)
+        np.testing.assert_array_equal(arr, np.arange(6.0).reshape(2, 3)*2)
+
+    def test_close(self):
+        buf = SharedSlotBuffer([None], 2)
+        fname = buf._fname
+        self.assertTrue(os.path.exists(fname))
+        buf.close()
+        self.assertFalse(os.path.exists(fname))
+
+        # the memory is still usable
+        buf.write(0, [3.0])
+        self.assertEqual(buf.read(0), [3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()